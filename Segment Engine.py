@@ -1,578 +1,323 @@
+import multiprocessing
+import time
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
 import pygame
 import numpy
-import numba
 
 import pymunk
 import pymunk.pygame_util
 
-#--------------------------------
-#Enumerations
-#--------------------------------
-
-
-PLAYER_POSITION, PLAYER_ANGLE, PLAYER_VISION, PLAYER_DISTANCE, PLAYER_OFFSET = 0, 1, 2, 3, 4
-
-WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT, WALL_TEXTURE, WALL_FLOOR_TEXTURE = 0, 1, 2, 3, 4, 5, 6
-
-INTERSECTED_DISTANCE, INTERSECTED_POSITION, INTERSECTED_WALL = 0, 1, 2
-
+#The Rendering Is Kept In Its Own Module, So It Can Also Be Used Without Opening A Window
+from segment_kernel import *
+from sector_lookup import build_sector_grid
+from telemetry import Telemetry, CachedCounter, STAGE_EVENTS, STAGE_PHYSICS, STAGE_RENDER, STAGE_PRESENT, STAGE_LATENCY, STAGE_SHADE, STAGE_STREAM, STAGE_LEFT_OUT
+from demo_level import load_demo_level, DEMO_LIGHTS
+from point_lights import build_falloff, build_sector_bounds, bin_lights
+from light_baker import load_or_bake_lightmaps
+from level_streaming import ChunkStreamer, partition_level
+from level_editor import LevelEditor, EditorView
+from texture_palette import palettize_level
+from game_logic import World, TICK_RATE
+from entities import EntityStore, FLAG_SEEKING, FLAG_WANDERING
+
+#Without Numba The Whole Frame Is Rendered With NumPy Instead, Which Is Slower But Needs Nothing Else
+if not NUMBA_AVAILABLE:
+	from numpy_kernel import scan_line
 
 #--------------------------------
-#Functions
+#Main Loop
 #--------------------------------
 
 
-#Checks The Intersection Between Two Line Segments3
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def check_intersection(wall_1, wall_2):
-	x1, y1 = wall_1[0]
-	x2, y2 = wall_1[1]
-	x3, y3 = wall_2[0]
-	x4, y4 = wall_2[1]
-
-	denominator = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
-
-	if denominator == 0:
-		return (0, 0)
-	
-	ua = ((x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)) / denominator
-	if ua < 0 or ua > 1:
-		return (0, 0)
-
-	ub = ((x2 - x1) * (y1 - y3) - (y2 - y1) * (x1 - x3)) / denominator
-	if ub < 0 or ub > 1:
-		return (0, 0)
-
-	return (x1 + ua * (x2 - x1), y1 + ua * (y2 - y1))
-
-
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def lerp(a, b, t):
-	return a + (b - a) * t
-
-
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def normalize(direction):
-	magnitude = numpy.sqrt(direction[0] * direction[0] + direction[1] * direction[1])
-	if magnitude > 0:
-		return (direction[0] / magnitude, direction[1] / magnitude)
-
-	return (0, 0)
-
-
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def mix(rgb_1, rgb_2):
-	mixed_r = int(rgb_1[0] * rgb_2[0]) << 16
-	mixed_g = int(rgb_1[1] * rgb_2[1]) << 8
-	mixed_b = int(rgb_1[2] * rgb_2[2])
-
-	return mixed_r + mixed_g + mixed_b
-
-
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def convert_int_rgb(code):
-	converted_r = (code >> 16) & 0xff
-	converted_g = (code >> 8) & 0xff
-	converted_b = code & 0xff
-
-	return converted_r, converted_g, converted_b
-
-
-#This Is Very Useful For Ceiling Casts & Making Functions More Generalized
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def clamp_in_order(value, minimum, maximum):
-	return max(minimum, min(value, maximum))
-
-
-#Gets The Closest Walls That Have Been Intersected With
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def get_closest_wall(position, translated_point, level):
-	all_walls_intersected = []
-
-	#Add All The Walls Found In The Level
-	for wall in level:
-		checked_intersection = check_intersection(translated_point, wall)
-
-		if checked_intersection != (0, 0):
-			distance = numpy.sqrt(
-				numpy.power(position[0] - checked_intersection[0], 2) +
-				numpy.power(position[1] - checked_intersection[1], 2))
-
-			all_walls_intersected.append((distance, checked_intersection, wall))
-
-	#Here The Walls Are Ordered By The Distance
-	for i in range(len(all_walls_intersected)):
-		for j in range(0, len(all_walls_intersected) - i - 1):
-			if all_walls_intersected[j][0] > all_walls_intersected[j + 1][0]:
-				all_walls_intersected[j], all_walls_intersected[j + 1] = all_walls_intersected[j + 1], all_walls_intersected[j]
-
-	segmented_order = []
-
-	#This Will Order By Segments
-	#We Are Going To Loop Backwards Here
-	while len(all_walls_intersected) != 0:
-		walls_obtained = [len(all_walls_intersected) - 1]
-		offset = 0
-
-		segmented_order.insert(0, all_walls_intersected[len(all_walls_intersected) - 1])
-
-		#Find Any Other Wall With The Same Segment
-		for i in range(len(all_walls_intersected) - 2, -1, -1):
-			if all_walls_intersected[i][INTERSECTED_WALL][WALL_SEGMENT] == all_walls_intersected[len(all_walls_intersected) - 1][INTERSECTED_WALL][WALL_SEGMENT]:
-				segmented_order.insert(0, all_walls_intersected[i])
-				walls_obtained.append(i)
-
-		for index in sorted(walls_obtained, reverse=True):
-			del all_walls_intersected[index]
-
-	return segmented_order
-
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def get_closest_sprite(position, sprite_list):
-	ordered_sprites = []
-
-	for s in sprite_list:
-		ordered_sprites.append(s)
-
-	for i in range(len(ordered_sprites)):
-		for j in range(0, len(ordered_sprites) - i - 1):
-			dx = ordered_sprites[j][0][0] - position[0]
-			dy = ordered_sprites[j][0][1] - position[1]
-
-			dist = numpy.sqrt(dx * dx + dy * dy)
-
-			dx2 = ordered_sprites[j + 1][0][0] - position[0]
-			dy2 = ordered_sprites[j + 1][0][1] - position[1]
-
-			dist2 = numpy.sqrt(dx2 * dx2 + dy2 * dy2)
-
-			if dist < dist2:
-				ordered_sprites[j], ordered_sprites[j + 1] = ordered_sprites[j + 1], ordered_sprites[j]
-
-	return ordered_sprites
-
-#Scan The Entire Screen From Left To Right & Render The Walls & Floors
-@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
-def scan_line(player, level, buffer, sprite_list):
-	#Obtain The Interval Angle To Rotate Correctly
-	interval_angle = player[2] / buffer.shape[0]
-	half_height = buffer.shape[1] / 2
-
-	offset = 0
-
-
-	ordered_sprites = get_closest_sprite(player[PLAYER_POSITION], sprite_list)
-
-	for x in range(buffer.shape[0]):
-		final_position = (0, 0, 0, 0)
-
-		#Translate All Points According To Angle
-		translated_angle = numpy.radians((player[PLAYER_ANGLE] - player[PLAYER_VISION] / 2) + interval_angle * x)
-
-		translated_point = (
-			(player[PLAYER_POSITION][0], player[PLAYER_POSITION][1]),
-			(player[PLAYER_POSITION][0] + player[PLAYER_DISTANCE] * numpy.cos(translated_angle), player[PLAYER_POSITION][1] + player[PLAYER_DISTANCE] * numpy.sin(translated_angle)))
-
-		#We Get All The Intersected Walls From Closest To Furthest
-		intersected_walls = get_closest_wall(player[PLAYER_POSITION], translated_point, level)
-		closest_sprites = get_closest_sprite(player[PLAYER_POSITION], sprite_list)
-
-		#Previous Wall Information For Comparision
-		previous_floor_height = (0, 0)
-		previous_ceiling_height = (0, 0)
-
-		sprite_height_list = []
-
-		for i in range(len(ordered_sprites)):
-			sprite_height_list.append((0, 0, 0, 0, 0.0))
-
-		for wall in range(len(intersected_walls)):
-			if intersected_walls[wall][INTERSECTED_DISTANCE] != 0:
-				wall_reference = intersected_walls[wall]
-
-				#Fix The Distance To Remove The Fish-Eye Distortion
-				fixed_distance = wall_reference[INTERSECTED_DISTANCE] * numpy.cos(translated_angle - numpy.radians(player[PLAYER_ANGLE]))
-				segment = wall_reference[INTERSECTED_WALL][WALL_SEGMENT]
-
-				wall_height = (half_height / fixed_distance)
+should_cap = False
 
-				#Get The Repeated Texture Coordinate
-				texture_distance = numpy.sqrt(
-					numpy.power(wall_reference[INTERSECTED_WALL][WALL_POINT_A][0] - wall_reference[INTERSECTED_POSITION][0], 2) +
-					numpy.power(wall_reference[INTERSECTED_WALL][WALL_POINT_A][1] - wall_reference[INTERSECTED_POSITION][1], 2)) % 1
+#Textures Are Stored As 8-Bit Indices Into One Shared Palette, Which Uses A Quarter Of The Memory
+use_palette = True
 
-				#We Get All The Wall Heights To Be Drawn Later
-				floor_height = (
-					clamp_in_order((half_height + wall_height) - 2 * wall_height * (wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT] + player[PLAYER_OFFSET]), 0, buffer.shape[1]),
-					clamp_in_order((half_height + wall_height) - 2 * wall_height * (player[PLAYER_OFFSET]), 0, buffer.shape[1]))
-					
-				
-				ceiling_height = (
-					clamp_in_order((half_height - wall_height) + 2 * wall_height * (-player[PLAYER_OFFSET]), 0, buffer.shape[1]), 
-					clamp_in_order((half_height - wall_height) + 2 * wall_height * (wall_reference[INTERSECTED_WALL][WALL_CEILING_HEIGHT] - player[PLAYER_OFFSET]), 0, buffer.shape[1]))
-				
-				cull_wall = False
+#Walks The Level Into A G-Buffer First & Shades It In A Separate Pass, Which Can Be Timed & Threaded On Its Own
+deferred_shading = False
 
-				#If There Was A Previous Wall Already Rendered, We Clamp The Values To Avoid Overdraw
-				if wall > 0:
-					floor_height = (
-						clamp_in_order(floor_height[0], previous_ceiling_height[1], previous_floor_height[0]),
-						clamp_in_order(floor_height[1], previous_ceiling_height[1], previous_floor_height[0]))
+#The Torches Never Move, So They Can Be Baked Into Lightmaps With The Shade Of Every Step Instead Of Being Gathered Every Frame
+baked_lighting = False
 
-					ceiling_height = (
-						clamp_in_order(ceiling_height[0], previous_ceiling_height[1], previous_floor_height[0]),
-						clamp_in_order(ceiling_height[1], previous_ceiling_height[1], previous_floor_height[0]))
+#Splits The Level Into Chunks On Disk & Streams In Only Those Around The Player, Which Is Meant For Worlds Too Big To Load At Once
+streamed_level = False
 
-					#If The Previous Wall Segment Was The Same, We Are Going To Draw The Floor Instead
-					if wall_reference[INTERSECTED_WALL][WALL_SEGMENT] == intersected_walls[wall - 1][INTERSECTED_WALL][WALL_SEGMENT]:
-						cull_wall = True
+#Opens A Top-Down Map Beside The 3D View Where The Level Can Be Edited While Playing, Tab Switches Between Looking Around & Editing
+level_editor = False
 
-				floor_length = previous_floor_height[0]
-				ceiling_length = previous_ceiling_height[1]
+#Fills The Level With Entities That Look Like The Demo's Sprites, Most Wander Around & A Few Follow The Player
+demo_entities = False
 
-				#This Will Only Apply For The First Wall
-				#Every Segment Requires 3 Or 4 Points, If There Is Not Another Point Detected Then It Is Guranteed That The Player Is Stepping On Top Of The Segment
-				if wall == 0:
-					if wall < len(intersected_walls) - 1:
-						if wall_reference[INTERSECTED_WALL][WALL_SEGMENT] != intersected_walls[wall + 1][INTERSECTED_WALL][WALL_SEGMENT]:
-							cull_wall = True
-							floor_length = buffer.shape[1]
-							ceiling_length = 0
+#Flags That Can't Be Used Together Are Settled Before Anything Is Opened Or Loaded, So The Window Is Sized For What Actually Runs
+#Lightmaps & The G-Buffer Atlas Are Made For One Fixed Level, So Neither Is Used While Streaming Or Editing
+#The Streamer & The Editor Both Own The Level, So Streaming Wins Over Editing
+if streamed_level:
+	level_editor = False
 
-							offset = wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT]
+if streamed_level or level_editor:
+	deferred_shading = False
+	baked_lighting = False
 
-					else:
-						cull_wall = True
-						floor_length = buffer.shape[1]
-						ceiling_length = 0
+#The NumPy Renderer Has No G-Buffer, So Without Numba Everything Is Shaded Straight Away
+if not NUMBA_AVAILABLE:
+	deferred_shading = False
 
-						offset = wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT]
+pygame.init()
+pygame.mixer.init()
 
-				#Here We Will Draw The Walls
-				if cull_wall == False:
-					for y in range(floor_height[0], floor_height[1]):
-						darkness = clamp_in_order(lerp(0, 1, 1 / fixed_distance), 0, 1)
-						color_value = convert_int_rgb(wall_reference[INTERSECTED_WALL][WALL_TEXTURE][int(texture_distance * 64), int((y - ((half_height + wall_height) - 2 * wall_height * player[PLAYER_OFFSET])) / wall_height * 32)])
+pygame.display.set_caption("Segment Engine - ALPHA")
+screen_surface = pygame.display.set_mode((512 if level_editor else 256, 256), pygame.SCALED, vsync=True)
 
-						buffer[x, y] = mix(color_value, (darkness, darkness, darkness))
+pygame.mouse.set_visible(False)
+pygame.event.set_grab(True)
 
-					for y in range(ceiling_height[0], ceiling_height[1]):
-						darkness = clamp_in_order(lerp(0, 1, 1 / fixed_distance), 0, 1)
-						color_value = convert_int_rgb(wall_reference[INTERSECTED_WALL][WALL_TEXTURE][int(texture_distance * 64), int((y - ((half_height + wall_height) - 2 * wall_height * player[PLAYER_OFFSET])) / wall_height * 32)])
+running = True
 
-						buffer[x, y] = mix(color_value, (darkness, darkness, darkness))
+#Create Buffer, The 3D View Always Takes The Left Of The Window & The Editor's Map Sits To Its Right
+view_surface = screen_surface.subsurface((0, 0, 256, 256))
+buffer = numpy.zeros((view_surface.get_width(), view_surface.get_height()), dtype=numpy.int32)
+step_sound = pygame.mixer.Sound("Step.wav")
+step_sound.set_volume(.2)
 
-				else:
-					#We Render The Floor
-					for y in range(floor_height[0], floor_length):
-						interpolation = 2 * y - buffer.shape[1]
+#Create Player
+player = ((66, 69), 0, 75, 128, 0)
 
-						if interpolation != 0:
-							floor_distance = (buffer.shape[1] / interpolation) / numpy.cos(translated_angle - numpy.radians(player[PLAYER_ANGLE]))
+#Create Frame Counter
+#clock = pygame.time.Clock()
+font = pygame.font.SysFont("Monospace" , 16 , bold = False)
 
-							translated_floor_point = (
-								player[PLAYER_POSITION][0] + floor_distance * numpy.cos(translated_angle) * (1 - (wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT] + player[PLAYER_OFFSET]) * 2),
-								player[PLAYER_POSITION][1] + floor_distance * numpy.sin(translated_angle) * (1 - (wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT] + player[PLAYER_OFFSET]) * 2))
+#Timings Of The Last 1024 Frames, Press F2 To Save Them
+telemetry = Telemetry(1024)
+fps_counter = CachedCounter(font, "FPS: ", 4, (255, 255, 255))
 
-							darkness = clamp_in_order(lerp(0, 1, 1 / floor_distance), 0, 1)
-							color_value = convert_int_rgb(wall_reference[INTERSECTED_WALL][WALL_FLOOR_TEXTURE][int((translated_floor_point[0] * 64) % 64), int((translated_floor_point[1] * 64) % 64)])
+#The Demo Level Is Loaded Here Until Levels Come From External Files
+level, sprite_list, sky_texture = load_demo_level()
 
-							buffer[x, y] = mix(color_value, (darkness, darkness, darkness))
+if use_palette:
+	level, sprite_list, palette = palettize_level(level, sprite_list)
 
-					#And We Finally Draw The Ceiling
-					for y in range(ceiling_length, ceiling_height[1]):
-						interpolation = 2 * y - buffer.shape[1]
+else:
+	palette = NO_PALETTE
 
-						if interpolation != 0:
-							#floor_distance = buffer.shape[1] - interpolation
-							floor_distance = (buffer.shape[1] / interpolation) / numpy.cos(translated_angle - numpy.radians(player[PLAYER_ANGLE]))
-
-							translated_floor_point = (
-								player[PLAYER_POSITION][0] + floor_distance * numpy.cos(translated_angle) * -(1 - (wall_reference[INTERSECTED_WALL][WALL_CEILING_HEIGHT] - player[PLAYER_OFFSET]) * 2),
-								player[PLAYER_POSITION][1] + floor_distance * numpy.sin(translated_angle) * -(1 - (wall_reference[INTERSECTED_WALL][WALL_CEILING_HEIGHT] - player[PLAYER_OFFSET]) * 2))
-
-							darkness = clamp_in_order(lerp(0, 1, 1 / -floor_distance), 0, 1)
-							color_value = convert_int_rgb(wall_reference[INTERSECTED_WALL][WALL_FLOOR_TEXTURE][int((translated_floor_point[0] * 64) % 64), int((translated_floor_point[1] * 64) % 64)])
+#The Grids Are Only Built Once, As The Level Doesn't Change
+#A Streamed Level Has Chunks Spliced In & Out Of Them By The Streamer Whenever They Come In Or Go Away
+if streamed_level:
+	partition_level(level, "demo_chunks")
 
-							buffer[x, y] = mix(color_value, (darkness, darkness, darkness))
-				
-				for i in range(len(sprite_height_list)):
-					dx = ordered_sprites[i][0][0] - player[PLAYER_POSITION][0]
-					dy = ordered_sprites[i][0][1] - player[PLAYER_POSITION][1]
+	streamer = ChunkStreamer("demo_chunks")
 
-					dist = numpy.sqrt(dx * dx + dy * dy)
-
-					theta = numpy.degrees(numpy.arctan2(-dy, dx))
-					fixed_rotation = player[PLAYER_ANGLE] % 360
+	#The First Chunks Are Waited For, Like A Loading Screen
+	while streamer.update(player[PLAYER_POSITION]) or len(streamer.pending) > 0:
+		time.sleep(.001)
 
-					y = (-fixed_rotation + (player[PLAYER_VISION] / 2) - theta)
+	level, wall_grid, sector_grid = streamer.level, streamer.wall_grid, streamer.sector_grid
 
-					if y < -180:
-						y += 360
-			
-					x_pos = y * (buffer.shape[0] / player[PLAYER_VISION])
-					sprite_height = (half_height / dist)
-					darkness = clamp_in_order(lerp(0, 1, 1 / dist), 0, 1)
+#The Editor Pads The Level With Free Walls & Patches Its Grids As It Is Edited
+elif level_editor:
+	editor = LevelEditor(level)
+	editor_view = EditorView(editor, screen_surface.subsurface((256, 0, 256, 256)))
 
-					if x > x_pos - sprite_height and x < x_pos + sprite_height:
-						if dist < intersected_walls[wall][INTERSECTED_DISTANCE]:
-							if wall == 0:
-								if sprite_height_list[i] == (0, 0, 0, 0, 0):
-									sprite_height_list[i] = (clamp_in_order((half_height - sprite_height) + 2 * sprite_height * (-player[PLAYER_OFFSET] + ordered_sprites[i][0][2]), 0, buffer.shape[1]), clamp_in_order((half_height + sprite_height) - 2 * sprite_height * (player[PLAYER_OFFSET]+ ordered_sprites[i][0][2]), 0, buffer.shape[1]), sprite_height, x_pos, darkness)
+	level, wall_grid, sector_grid = editor.level, editor.wall_grid, editor.sector_grid
 
-							elif dist > intersected_walls[wall - 1][INTERSECTED_DISTANCE]:
-								if sprite_height_list[i] == (0, 0, 0, 0, 0):
-									sprite_height_list[i] = (clamp_in_order((half_height - sprite_height) + 2 * sprite_height * (-player[PLAYER_OFFSET] + ordered_sprites[i][0][2]), previous_ceiling_height[1], previous_floor_height[0]), clamp_in_order((half_height + sprite_height) - 2 * sprite_height * (player[PLAYER_OFFSET] + ordered_sprites[i][0][2]), previous_ceiling_height[1], previous_floor_height[0]), sprite_height, x_pos, darkness)
+else:
+	wall_grid = build_wall_grid(level, 2.0)
+	sector_grid = build_sector_grid(level, 2.0)
 
-				#These Are Stored For Later Comparisions
-				previous_floor_height = floor_height
-				previous_ceiling_height = ceiling_height
+#The Sky Wraps Around The Player 4 Times
+sky = build_sky(sky_texture, buffer.shape[1], 4)
 
-		#We Will Draw The Sprites Here As Overlays
-		for i in range(len(sprite_height_list)):
-			for y_loop in range(sprite_height_list[i][0], sprite_height_list[i][1]):
-				if ordered_sprites[i][1][int((x - (sprite_height_list[i][3] + sprite_height_list[i][2])) / sprite_height_list[i][2] * 32), int((y_loop - ((half_height + sprite_height_list[i][2]) - 2 * sprite_height_list[i][2] * (player[PLAYER_OFFSET] + ordered_sprites[i][0][2]))) / sprite_height_list[i][2] * 32)] != 9357180:
-					color_value = convert_int_rgb(ordered_sprites[i][1][int((x - (sprite_height_list[i][3] + sprite_height_list[i][2])) / sprite_height_list[i][2] * 32), int((y_loop - ((half_height + sprite_height_list[i][2]) - 2 * sprite_height_list[i][2] * (player[PLAYER_OFFSET] + ordered_sprites[i][0][2])))/ sprite_height_list[i][2] * 32)])
-					buffer[x, y_loop] = mix(color_value, (sprite_height_list[i][4], sprite_height_list[i][4], sprite_height_list[i][4]))		
+#Every Kind Of Entity Looks Like One Of The Demo's Sprites, So They Share Its Palette, The Demo Only Uses The Armor
+#Only The Closest 64 Entities On Screen Are Drawn Besides The Sprites
+entity_store = EntityStore(sprite_list)
+entity_capacity = 0
 
-	return offset
+if demo_entities:
+	entity_positions = numpy.random.default_rng(0).uniform((60, 64), (72, 76), (64, 2))
 
+	entity_store.add(sector_grid, entity_positions[:8], 2, FLAG_SEEKING)
+	entity_store.add(sector_grid, entity_positions[8:], 2, FLAG_WANDERING, 1.0)
 
-#--------------------------------
-#Main Loop
-#--------------------------------
+	#Those That Landed Outside The Level Are Taken Out Again
+	for index in reversed(numpy.flatnonzero(entity_store.sector[:entity_store.count] == -1)):
+		entity_store.remove(index)
 
+	entity_capacity = 64
 
-should_cap = False
+#The Scan Line Works In These Arrays Every Frame Instead Of Allocating Its Own
+scratch = build_scratch(len(level), len(sprite_list) + entity_capacity, buffer.shape)
 
-#Physics
-space = pymunk.Space()
-space.gravity = (0, 0)
+#The Shading Pass Is Split Into Bands Of Rows Over A Few Threads
+if deferred_shading:
+	gbuffer, atlas = build_gbuffer(level, sprite_list, sky, palette, buffer.shape, entity_store.sprites)
+	shade_pool = ThreadPoolExecutor(4)
 
-pygame.init()
-pygame.mixer.init()
+#Lights Are Binned Into Sectors Every Frame, The Bounds Of The Sectors & The Falloff Never Change
+falloff = build_falloff()
+#The Editor & The Streamer Keep Their Own As Segments Come & Go
+if level_editor:
+	sector_bounds = editor.sector_bounds
 
-pygame.display.set_caption("Segment Engine - ALPHA")
-screen_surface = pygame.display.set_mode((256, 256), pygame.SCALED, vsync=True)
+elif streamed_level:
+	sector_bounds = streamer.sector_bounds
 
-pygame.mouse.set_visible(False)
-pygame.event.set_grab(True)
+else:
+	sector_bounds = build_sector_bounds(level)
 
-running = True
+#The Lightmaps Are Saved Next To The Game & Only Baked Again When The Level Or Its Lights Change
+if baked_lighting:
+	#Baking Is Spread Over Every Core, Workers Are Forked As The Game Has Nothing Guarding Its Main Loop For Them To Start From
+	#The Workers Only Start Once Something Has To Be Baked, Without Fork It Is Baked Here Instead
+	bake_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("fork")) if "fork" in multiprocessing.get_all_start_methods() else None
 
-#Create Buffer
-buffer = numpy.zeros((screen_surface.get_width(), screen_surface.get_height()), dtype=numpy.int32)
-step_sound = pygame.mixer.Sound("Step.wav")
-step_sound.set_volume(.2)
+	lightmaps = load_or_bake_lightmaps("demo_lightmaps.npz", level, sprite_list, DEMO_LIGHTS, bake_pool)
 
-#Create Textures
-#We Convert These To Arrays To Access The Texture Data Faster During The Rendering Process
-basic_wall_1 = pygame.surfarray.array2d(pygame.image.load("texture.png").convert())
-basic_wall_2 = pygame.surfarray.array2d(pygame.image.load("texture2.png").convert())
-basic_wall_3 = pygame.surfarray.array2d(pygame.image.load("texture3.png").convert())
-basic_wall_4 = pygame.surfarray.array2d(pygame.image.load("texture4.png").convert())
-basic_wall_5 = pygame.surfarray.array2d(pygame.image.load("texture5.png").convert())
+	if bake_pool is not None:
+		bake_pool.shutdown()
 
-tree_thing = pygame.surfarray.array2d(pygame.image.load("tree.png").convert())
-table_thing = pygame.surfarray.array2d(pygame.image.load("table.png").convert())
-armor_thing = pygame.surfarray.array2d(pygame.image.load("armor.png").convert())
+	dynamic_lights = ()
 
-#Create Player
-player = ((66, 69), 0, 75, 128, 0)
+else:
+	lightmaps = NO_LIGHTMAPS
+	dynamic_lights = DEMO_LIGHTS
 
-#Create Frame Counter
-#clock = pygame.time.Clock()
-font = pygame.font.SysFont("Monospace" , 16 , bold = False)
+#How Many Ticks The Muzzle Flash Has Left, Clicking Fires It
+flash_ticks = 0
 
-offset = .5
-offset2 = 1
-
-#Level Data, This Is Temporary And Will Instead Load Through External Files In A Later Version
-level = (
-	((64.0, 71.0), (70.0, 71.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
-	((70.0, 71.0), (70.0, 77.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
-	((64.0, 71.0), (70.0, 77.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
-
-	((64.0, 64.0), (70.0, 64.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
-	((70.0, 64.0), (70.0, 70.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
-	((64.0, 64.0), (70.0, 70.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
-
-	((64.0, 64.0), (64.0, 71.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
-	((64.0, 71.0), (70.0, 71.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
-	((70.0, 71.0), (70.0, 70.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
-	((70.0, 70.0), (64.0, 64.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
-
-	((70.0, 71.0), (70.0, 70.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
-	((70.0, 70.0), (70.5, 70.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
-	((70.5, 70.0), (70.5, 71.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
-	((70.5, 71.0), (70.0, 71.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
-
-	((70.0 + offset, 71.0), (70.0 + offset, 70.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
-	((70.0 + offset, 70.0), (70.5 + offset, 70.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
-	((70.5 + offset, 70.0), (70.5 + offset, 71.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
-	((70.5 + offset, 71.0), (70.0 + offset, 71.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
-
-	((70.0 + offset2, 71.0), (70.0 + offset2, 70.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
-	((70.0 + offset2, 70.0), (70.5 + offset2, 70.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
-	((70.5 + offset2, 70.0), (70.5 + offset2, 71.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
-	((70.5 + offset2, 71.0), (70.0 + offset2, 71.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
-
-	((71.5, 71.0), (70.0, 71.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
-	((70.0, 71.0), (70.0, 74.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
-	((70.0, 74.0), (71.5, 72.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
-	((71.5, 72.0), (71.5, 71.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
-)
-
-sprite_list = (
-	((66, 70, 0.0), tree_thing),
-	((69, 70, 0.2), table_thing),
-	((67, 68, 0.0), armor_thing),
-)
-
-walls_physics_shape_information = []
-walls_physics_body_information = []
-
-offset = 0
-
-#Adding The Walls To The Physics Engine
-for wall in level:
-	if wall[WALL_FLOOR_HEIGHT] > offset + .1:
-		physics_geometry = pymunk.Body(body_type=pymunk.Body.STATIC)
-		physics_segment = pymunk.Segment(physics_geometry, wall[WALL_POINT_A], wall[WALL_POINT_B], .2)
-
-		space.add(physics_geometry, physics_segment)
-		walls_physics_body_information.append(physics_geometry)
-		walls_physics_shape_information.append(physics_segment)
+#The Physics & Game Logic Run In Their Own World, So They Can Also Be Tested Without A Window
+world = World(level, sector_grid)
 
 draw_options = pymunk.pygame_util.DrawOptions(screen_surface)
 
-mouse_velocity = 0
+#Create The Player Rigidbody
+player_mover = world.add_mover(player[PLAYER_POSITION])
 
-bobbing = 0
-bobbing_strength = 0
-
-#Create The Player Rigidbody,
-#Friction Won't Matter Here As The Game's Logic Is Handled "Top-Down",
-#Instead We Multiply The Velocity And Can Be Seen In The Physics Logic
-player_body = pymunk.Body()
-player_body.position = player[PLAYER_POSITION]
-player_shape = pymunk.Circle(player_body, .2)
-player_shape.mass = 1
-player_shape.friction = 0
-
-fps = 0
-
-space.add(player_body, player_shape)
 dt = 0
 old_time = 0
 time_between_physics = 0
 
 interpolated_position = (0.0, 0.0)
-interpolated_rotation = 0
 rotation = player[PLAYER_ANGLE]
 
+#When The Oldest Mouse Movement That Isn't On Screen Yet Was Read, To Measure How Long It Takes To Be Shown
+input_time = None
+
 update_rate = 0
 
 previous_time = 0
-final_bobbing = 0
-current_offset = 0
 gravity_velocity = 0
 should_jump = False
 
+#While Editing The Mouse Is Let Go & Edits The Map Instead Of Looking Around, The Walls Edited Are Taken In Before Rendering
+editing = False
+edited_walls = []
+
 while running:
+	telemetry.begin_stage()
 	keys = pygame.key.get_pressed()
 
-	for event in pygame.event.get():
+	#Mouse Movement Is Left In The Queue, It Is Only Read Right Before Rendering
+	for event in pygame.event.get(exclude=pygame.MOUSEMOTION):
 		if event.type == pygame.QUIT:
 			running = False
 
-		if event.type == pygame.MOUSEMOTION:
-			mouse_velocity += event.rel[0] * .1
-
 		if event.type == pygame.KEYDOWN:
 			if pygame.key.get_pressed()[pygame.K_SPACE]:
 				should_jump = True
 
-	#print(player_body.position)
-
-	#This Is So That Game Logic Will Not Be Tied To The Rendering Speed, We Can Also Now Do Interpolation
-	while update_rate >= 1000 / 30:
-		old_position = player_body.position
-		old_rotation = rotation
-		old_bobbing = final_bobbing
+			if event.key == pygame.K_F2:
+				telemetry.dump_csv("telemetry.csv")
 
-		current_offset = offset
+			if event.key == pygame.K_TAB and level_editor:
+				editing = not editing
 
-		#Direction Here Is Normalized For Diagonal Movement,
-		#Without It Diagonal Movement Will Be Faster
-		direction = normalize((
-			(keys[pygame.K_w] - keys[pygame.K_s]),
-			(keys[pygame.K_d] - keys[pygame.K_a])))
+				pygame.event.set_grab(not editing)
+				pygame.mouse.set_visible(editing)
 
-		#We Use Pymunk Here To Move The Player, This Will Allow Us To Collide With Any Obstacles
-		player_shape.body.apply_impulse_at_local_point(
-			((numpy.cos(numpy.radians(player[PLAYER_ANGLE])) * direction[0] + numpy.cos(numpy.radians(player[PLAYER_ANGLE] + 90)) * direction[1]) * .4,
-			(numpy.sin(numpy.radians(player[PLAYER_ANGLE])) * direction[0] + numpy.sin(numpy.radians(player[PLAYER_ANGLE] + 90)) * direction[1]) * .4))
-		player_shape.body.velocity *= .8
-			
-		rotation += mouse_velocity
+		if editing:
+			edited_walls.extend(editor_view.handle(event) or ())
 
-		#The Smaller The Value, The Smaller The Bobbing. So If The Value Is 0, The Y-Offset Will Stay At Rest
-		bobbing_strength = lerp(bobbing_strength, ((keys[pygame.K_w] - keys[pygame.K_s]) != 0 or (keys[pygame.K_d] - keys[pygame.K_a]) != 0), .4)
+		elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+			flash_ticks = 3
 
-		bobbing += .8
+	#The Latency Is Measured From The First Frame That Sees A Mouse Movement
+	if input_time is None and pygame.event.peek(pygame.MOUSEMOTION):
+		input_time = time.perf_counter_ns()
 
-		if bobbing > numpy.radians(360):
-			bobbing -= numpy.radians(360)
+	telemetry.end_stage(STAGE_EVENTS)
 
-			if ((keys[pygame.K_w] - keys[pygame.K_s]) != 0 or (keys[pygame.K_d] - keys[pygame.K_a]) != 0):
-				step_sound.play()
+	#print(player_mover.body.position)
 
-		final_bobbing = -current_offset + (numpy.sin(bobbing) / 64) * bobbing_strength
+	#This Is So That Game Logic Will Not Be Tied To The Rendering Speed, We Can Also Now Do Interpolation
+	telemetry.begin_stage()
 
-		#We Step 16 Times For Better Collisions, In My Opinion Pymunk Should Not Be Restricted
-		#To Discrete Collisions, And Continous Collisions Would Be Faster Than This Solution,
-		#But It Is What It Is...
-		for i in range(16):
-			space.step(.01)
+	while update_rate >= 1000 / TICK_RATE:
+		old_position = player_mover.body.position
+		old_bobbing = player_mover.final_bobbing
 
-		if len(walls_physics_body_information) > 0:
-			for i in range(len(walls_physics_body_information)):
-				space.remove(walls_physics_body_information[i], walls_physics_shape_information[i])
+		#Movement Follows The Direction The Player Was Looking At When Last Rendered
+		stepped = world.tick(((
+			keys[pygame.K_w] - keys[pygame.K_s],
+			keys[pygame.K_d] - keys[pygame.K_a],
+			player[PLAYER_ANGLE]),))
 
-			walls_physics_body_information.clear()
-			walls_physics_shape_information.clear()
+		if player_mover in stepped:
+			step_sound.play()
 
-		for wall in level:
-			if wall[WALL_FLOOR_HEIGHT] > current_offset + .2 or wall[WALL_CEILING_HEIGHT] > .2:
-				physics_geometry = pymunk.Body(body_type=pymunk.Body.STATIC)
-				physics_segment = pymunk.Segment(physics_geometry, wall[WALL_POINT_A], wall[WALL_POINT_B], .2)
+		if demo_entities:
+			entity_store.tick(sector_grid, player_mover.body.position)
 
-				space.add(physics_geometry, physics_segment)
-				walls_physics_body_information.append(physics_geometry)
-				walls_physics_shape_information.append(physics_segment)
+		flash_ticks = max(flash_ticks - 1, 0)
 
 		#We Don't Reset To Zero In Case The Game Is Running Slow, This Is A Sort Of "Catch-Up"
 		#Where If The Framerate Is 10, Then The Game Logic Will Run 3 More Times
-		update_rate -= (1000 / 30)
-		mouse_velocity = 0
+		update_rate -= (1000 / TICK_RATE)
 
 		current_time = pygame.time.get_ticks()
 		time_between_physics = current_time - old_time
 		old_time = current_time
 
+	telemetry.end_stage(STAGE_PHYSICS)
+
+	#Chunks The Loader Has Finished Are Taken In Here, Splicing Them Into The Resident Level Is The Hitch This Stage Shows
+	#Only The Wall Slots That Changed Get New Physics Shapes, Chunks Left Out For Room Are Recorded Too
+	if streamed_level:
+		telemetry.begin_stage()
+
+		if streamer.update(player_mover.body.position):
+			level, wall_grid, sector_grid = streamer.level, streamer.wall_grid, streamer.sector_grid
+
+			world.edit_level(level, sector_grid, streamer.changed_walls)
+
+		telemetry.end_stage(STAGE_STREAM)
+		telemetry.record(STAGE_LEFT_OUT, streamer.left_out_chunks)
+
 	if time_between_physics != 0:
-		interpolated_position = (lerp(old_position[0], player_body.position[0], update_rate / time_between_physics), lerp(old_position[1], player_body.position[1], update_rate / time_between_physics))
-		interpolated_rotation = lerp(old_rotation, rotation, update_rate / time_between_physics)
-		interpolated_bobbing = lerp(old_bobbing, final_bobbing, update_rate / time_between_physics)
+		interpolated_position = (lerp(old_position[0], player_mover.body.position[0], update_rate / time_between_physics), lerp(old_position[1], player_mover.body.position[1], update_rate / time_between_physics))
+		interpolated_bobbing = lerp(old_bobbing, player_mover.final_bobbing, update_rate / time_between_physics)
+		entities = entity_store.view(update_rate / time_between_physics) if demo_entities else NO_ENTITIES
 	else:
-		interpolated_position = player_body.position
-		interpolated_rotation = rotation
-		interpolated_bobbing = final_bobbing
+		interpolated_position = player_mover.body.position
+		interpolated_bobbing = player_mover.final_bobbing
+		entities = entity_store.view() if demo_entities else NO_ENTITIES
+
+	#The Rotation Isn't Tied To The Physics, So It Is Taken From The Latest Mouse Movement Just Before Rendering
+	#Waiting For The Next Physics Step Would Add Up To 33 Milliseconds Before Looking Around Shows On Screen
+	for event in pygame.event.get(pygame.MOUSEMOTION):
+		if editing:
+			edited_walls.extend(editor_view.handle(event) or ())
+			continue
+
+		rotation += event.rel[0] * .1
+
+		if input_time is None:
+			input_time = time.perf_counter_ns()
 
 	player = (
 		interpolated_position,
-		interpolated_rotation,
+		rotation,
 
 		player[PLAYER_VISION],
 		player[PLAYER_DISTANCE],
@@ -580,16 +325,48 @@ while running:
 		interpolated_bobbing,
 	)
 
-	#This Is Where The Magic Happens! We Will Also Get The Current Offset Of The Segment That The Player Is On, So That They Will Be Raised Accordingly
-	offset = scan_line(player, level, buffer, sprite_list)
-	pygame.surfarray.blit_array(screen_surface, buffer)
+	#Edits Are Taken In Right Before Rendering, Only The Edited Walls Are Given New Collision Shapes
+	if len(edited_walls) > 0:
+		level, wall_grid, sector_grid, sector_bounds = editor.level, editor.wall_grid, editor.sector_grid, editor.sector_bounds
+		world.edit_level(level, sector_grid, edited_walls)
+
+		edited_walls = []
+
+	#The Muzzle Flash Follows The Player & Fades Out Over A Few Ticks
+	frame_lights = list(dynamic_lights)
+
+	if flash_ticks > 0:
+		frame_lights.append((interpolated_position, 4.0, (flash_ticks / 3, flash_ticks / 3 * .8, flash_ticks / 3 * .5)))
+
+	#This Is Where The Magic Happens!
+	telemetry.begin_stage()
+	lights = bin_lights(frame_lights, sector_bounds, falloff, sprite_list)
+
+	if deferred_shading:
+		scan_gbuffer(player, level, wall_grid, sky, gbuffer, sprite_list, entities, lights, lightmaps, scratch)
+		telemetry.end_stage(STAGE_RENDER)
+
+		telemetry.begin_stage()
+		shade_frame(gbuffer, atlas, buffer, shade_pool)
+		telemetry.end_stage(STAGE_SHADE)
 
-	screen_surface.blit(font.render("FPS: " + str(int(fps)), False, (255, 255, 255)), (0, 0))
+	else:
+		scan_line(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch)
+		telemetry.end_stage(STAGE_RENDER)
+
+	telemetry.begin_stage()
+	pygame.surfarray.blit_array(view_surface, buffer)
+
+	if level_editor:
+		editor_view.draw(player)
+
+	fps_counter.draw(screen_surface, (0, 0), telemetry.frame_rate(30))
 	pygame.display.flip()
+	telemetry.end_stage(STAGE_PRESENT)
 
-	#This Is Unecessary In Closed Areas, But Performance Seems To Be Very Minimal, Might Be Removed After
-	#Implementing Skyboxes
-	buffer.fill(0)
+	if input_time is not None:
+		telemetry.record(STAGE_LATENCY, (time.perf_counter_ns() - input_time) / 1e6)
+		input_time = None
 
 	#We Increment By The Time It Took To Render & Update Everything
 	#Whenever We Reach 33 Milliseconds (30 FPS), The Game Logic Will Execute
@@ -597,12 +374,14 @@ while running:
 	new_time = pygame.time.get_ticks()
 	update_rate += (new_time - previous_time)
 
-	if ((new_time - previous_time) / 1000) != 0:
-		fps = 1 / ((new_time - previous_time) / 1000)
-
 	#Why Not Multiply By Delta Time? Physics Needs To Be Consistent, And Using Delta Time
 	#For Physics Is Not Good Practise, We Also Can Have An Easier Time Implement Logic,
 	#As We Don't Have To Figure Out Different Solutions To Make Something Framerate Independent
 	previous_time = new_time
 
+	telemetry.end_frame()
+
+if streamed_level:
+	streamer.close()
+
 pygame.quit()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from segment_kernel import LIGHTMAP_WALL_START
+from light_baker import bake_lightmaps
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#A Square Grid Of Square Rooms With Random Floor & Ceiling Heights, Just Like The Physics Benchmark
+#Every Room Also Gets A Torch Of Its Own Somewhere Inside It
+def build_synthetic_level(rooms_per_side, random):
+	texture = numpy.zeros((64, 64), dtype=numpy.int32)
+	level = []
+	lights = []
+
+	for room_x in range(rooms_per_side):
+		for room_y in range(rooms_per_side):
+			segment = room_y * rooms_per_side + room_x
+			x, y = room_x * 2.0, room_y * 2.0
+
+			floor_height = random.choice((0.0, 0.1, 0.2, 0.4))
+			ceiling_height = random.choice((0.0, 0.0, 0.0, 0.4))
+
+			corners = ((x, y), (x + 2.0, y), (x + 2.0, y + 2.0), (x, y + 2.0))
+
+			for i in range(4):
+				level.append((corners[i], corners[(i + 1) % 4], floor_height, ceiling_height, segment, texture, texture))
+
+			lights.append(((x + random.uniform(.2, 1.8), y + random.uniform(.2, 1.8)), 2.5, tuple(random.uniform(0, .6, 3))))
+
+	return tuple(level), lights
+
+
+#Bakes A Synthetic Map & Gives Back The Time It Took In Seconds
+def measure(rooms_per_side, pool):
+	level, lights = build_synthetic_level(rooms_per_side, numpy.random.default_rng(0))
+
+	start = time.perf_counter()
+	bake_lightmaps(level, (), lights, pool)
+
+	return time.perf_counter() - start
+
+
+#Pads The Level With A Placeholder Wall Like The Streamer, The Editor & The PE Compat Layer Do, It Belongs To No Segment
+#It Sits On The Corner Of The First Room & Is Taller Than Any Floor, So It Would Shade Or Block Something If It Were Baked
+def add_placeholder(level):
+	texture = numpy.zeros((64, 64), dtype=numpy.int32)
+
+	return level + (((0.0, 0.0), (0.0, 0.0), 1.0, 1.0, -1, texture, texture),)
+
+
+#Placeholder Walls Must Bake Without Any Samples & Leave The Lightmaps Of Everything Else As They Were
+def check_placeholder(rooms_per_side):
+	level, lights = build_synthetic_level(rooms_per_side, numpy.random.default_rng(0))
+
+	plain = bake_lightmaps(level, (), lights)
+	padded = bake_lightmaps(add_placeholder(level), (), lights)
+
+	wall_start = padded[LIGHTMAP_WALL_START]
+
+	return numpy.array_equal(wall_start[:-1], plain[LIGHTMAP_WALL_START]) and wall_start[-1] == wall_start[-2] and all(numpy.array_equal(plain[i], padded[i]) for i in range(LIGHTMAP_WALL_START + 1, len(plain)))
+
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+ROOMS_PER_SIDE = (4, 16, 32, 64)
+
+if __name__ == "__main__":
+	#Compile First, So It Isn't Counted
+	measure(2, None)
+
+	print("Placeholder Walls: " + ("Lightmaps Unchanged" if check_placeholder(4) else "FAILED, Lightmaps Changed"))
+
+	with ProcessPoolExecutor(os.cpu_count()) as pool:
+		#The Processes Are Started Before Timing, Like They Would Be When Baking Many Levels
+		measure(2, pool)
+
+		print("Walls    Serial s   Pool s (" + str(os.cpu_count()) + " Processes)")
+
+		for rooms_per_side in ROOMS_PER_SIDE:
+			serial = measure(rooms_per_side, None)
+			pooled = measure(rooms_per_side, pool)
+
+			print(str(rooms_per_side * rooms_per_side * 4).ljust(9) + format(serial, ".2f").ljust(11) + format(pooled, ".2f"))
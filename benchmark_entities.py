@@ -0,0 +1,141 @@
+import time
+
+import numpy
+
+from segment_kernel import build_sky, build_sprite, build_scratch, build_wall_grid, scan_line, WALL_SEGMENT, NO_PALETTE, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, SCRATCH_OVERFLOW, OVERFLOW_SPRITES
+from sector_lookup import build_sector_grid
+from entities import EntityStore, FLAG_SEEKING, FLAG_WANDERING
+from game_logic import TICK_RATE
+from benchmark_baker import build_synthetic_level
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+ENTITY_COUNT = 10000
+TICKS = 300
+
+#The Frames Are Also Drawn With Fewer & More Entities, The Same Crowd Is Always In The Corner That Is Drawn & The Rest Are Elsewhere
+#Only The Crowd Can Be Seen, So How Long A Frame Takes Should Hardly Change With The Count
+RENDER_ENTITY_COUNTS = (1000, 4000, 10000, 16000)
+CROWD = 32
+
+#The Ticks Run Over A Big Map, Which Only Needs Its Sector Grid
+#Rendering Needs The Level Compiled Into The Scan Line, So Only The Rooms In One Corner Are Drawn
+#Every Entity Is Still Handed To The Scan Line, Those Outside The Corner Are Left Out By Where They Are On Screen Or Hidden By Its Walls
+ROOMS_PER_SIDE = 64
+RENDER_ROOMS_PER_SIDE = 4
+
+FRAMES = 120
+SIZE = (256, 256)
+
+#Only The Closest Entities On Screen Are Drawn, The Rest Are Counted As Left Out
+SPRITE_CAPACITY = 256
+
+#Every Tenth Entity Follows The Player Around, The Rest Wander
+SEEKING_EVERY = 10
+
+
+#A Round Sprite On A Colorkeyed Background, So Its Columns Have Runs Like A Real Sprite
+def build_round_sprite():
+	x, y = numpy.mgrid[:64, :64]
+	texture = numpy.where((x - 32) ** 2 + (y - 40) ** 2 < 20 ** 2, 0x808080, 0xff00ff).astype(numpy.int32)
+
+	return build_sprite((0.0, 0.0, 0.0), texture, 0xff00ff)
+
+
+#Fills A Map Of The Given Size With Entities In Random Rooms, Every Room Is 2 Units Wide
+def spawn_entities(sector_grid, rooms_per_side, random, count=ENTITY_COUNT):
+	store = EntityStore((build_round_sprite(),), max(count, 1))
+	positions = random.uniform(.3, rooms_per_side * 2.0 - .3, (count, 2))
+
+	store.add(sector_grid, positions[::SEEKING_EVERY], 0, FLAG_SEEKING)
+	store.add(sector_grid, numpy.delete(positions, numpy.s_[::SEEKING_EVERY], axis=0), 0, FLAG_WANDERING, random.uniform(0, 2 * numpy.pi))
+
+	return store
+
+
+def describe(times):
+	return "Median " + format(numpy.median(times) * 1000, ".2f") + " ms, Worst " + format(numpy.max(times) * 1000, ".2f") + " ms"
+
+
+if __name__ == "__main__":
+	random = numpy.random.default_rng(0)
+
+	level, lights = build_synthetic_level(ROOMS_PER_SIDE, random)
+	sector_grid = build_sector_grid(level, 2.0)
+
+	store = spawn_entities(sector_grid, ROOMS_PER_SIDE, random)
+
+	#The Player Stands In The Corner That Is Drawn
+	player = ((RENDER_ROOMS_PER_SIDE + .5, RENDER_ROOMS_PER_SIDE + .5), 45.0, 75, 128, 0.0)
+	target = player[0]
+
+	#Compile First, So It Isn't Counted
+	store.tick(sector_grid, target)
+
+	tick_times = []
+
+	for tick in range(TICKS):
+		start = time.perf_counter()
+		store.tick(sector_grid, target)
+		tick_times.append(time.perf_counter() - start)
+
+	outside = numpy.count_nonzero(store.sector[:store.count] == -1)
+
+	print("Entities: " + str(store.count) + ", Walls: " + str(len(level)) + ", Left The Level: " + str(outside))
+	print("Ticks:         " + describe(tick_times) + ", The Budget Is " + format(1000 / TICK_RATE, ".1f") + " ms")
+
+	level = tuple(wall for wall in level if wall[WALL_SEGMENT] % ROOMS_PER_SIDE < RENDER_ROOMS_PER_SIDE and wall[WALL_SEGMENT] // ROOMS_PER_SIDE < RENDER_ROOMS_PER_SIDE)
+	wall_grid = build_wall_grid(level, 2.0)
+
+	sky = build_sky(numpy.zeros((1, 1), dtype=numpy.int32), SIZE[1], 1)
+	sprite_list = (build_round_sprite(),)
+	scratch = build_scratch(len(level), SPRITE_CAPACITY, SIZE)
+	buffer = numpy.zeros(SIZE, dtype=numpy.int32)
+
+	#Compile Both First, So It Isn't Counted
+	scan_line(player, level, wall_grid, sky, NO_PALETTE, buffer, sprite_list, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch)
+	scan_line(player, level, wall_grid, sky, NO_PALETTE, buffer, sprite_list, store.view(), NO_LIGHTS, NO_LIGHTMAPS, scratch)
+
+	plain_times = []
+
+	for frame in range(FRAMES):
+		player = (player[0], player[1] + 3.0) + player[2:]
+
+		start = time.perf_counter()
+		scan_line(player, level, wall_grid, sky, NO_PALETTE, buffer, sprite_list, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch)
+		plain_times.append(time.perf_counter() - start)
+
+	print("Frames:        " + describe(plain_times) + " Without Entities, " + str(len(level)) + " Walls Drawn")
+
+	#The Same Frames Again With Every Count Of Entities, The Views Are Binned Within The Time Taken
+	for entity_count in RENDER_ENTITY_COUNTS:
+		random = numpy.random.default_rng(0)
+		store = EntityStore(sprite_list, entity_count)
+
+		#Entities That Would Land In The Corner Are Moved Past It
+		elsewhere = random.uniform(.3, ROOMS_PER_SIDE * 2.0 - .3, (entity_count - CROWD, 2))
+		elsewhere[(elsewhere < RENDER_ROOMS_PER_SIDE * 2.0).all(axis=1), 0] += RENDER_ROOMS_PER_SIDE * 2.0
+
+		store.add(sector_grid, random.uniform(.3, RENDER_ROOMS_PER_SIDE * 2.0 - .3, (CROWD, 2)), 0, FLAG_WANDERING, random.uniform(0, 2 * numpy.pi))
+		store.add(sector_grid, elsewhere, 0, FLAG_WANDERING, random.uniform(0, 2 * numpy.pi))
+
+		frame_times = []
+		left_out = []
+
+		for frame in range(FRAMES):
+			player = (player[0], player[1] + 3.0) + player[2:]
+
+			store.tick(sector_grid, target)
+
+			start = time.perf_counter()
+			scan_line(player, level, wall_grid, sky, NO_PALETTE, buffer, sprite_list, store.view(.5), NO_LIGHTS, NO_LIGHTMAPS, scratch)
+			frame_times.append(time.perf_counter() - start)
+
+			left_out.append(scratch[SCRATCH_OVERFLOW][OVERFLOW_SPRITES])
+
+		print((str(entity_count) + " Entities:").ljust(15) + describe(frame_times) + ", " + format(numpy.mean(left_out), ".0f") + " Seen But Left Out On Average")
+
+	print("Compiled Scan Lines: " + str(len(scan_line.signatures)))
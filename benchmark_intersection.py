@@ -0,0 +1,139 @@
+import time
+
+import numpy
+import numba
+
+from segment_kernel import check_intersection, intersect_ray_wall, intersect_walls
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#The Old Way, Every Hit Gives Back A Point & Then The Distance And Texture Coordinate Both Need A Square Root
+#Both Paths Find The Closest Wall Each Ray Hits, As That Is What The Renderer Asks For Most
+@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def scalar_path(ray_origins, ray_directions, wall_points, closest):
+	for ray in range(len(ray_directions)):
+		translated_point = (
+			(ray_origins[ray, 0], ray_origins[ray, 1]),
+			(ray_origins[ray, 0] + ray_directions[ray, 0], ray_origins[ray, 1] + ray_directions[ray, 1]))
+
+		closest[ray, 0] = numpy.inf
+		closest[ray, 1] = -1
+		closest[ray, 2] = -1
+
+		for wall in range(len(wall_points)):
+			checked_intersection = check_intersection(translated_point, ((wall_points[wall, 0], wall_points[wall, 1]), (wall_points[wall, 2], wall_points[wall, 3])))
+
+			if checked_intersection != (0, 0):
+				distance = numpy.sqrt(
+					numpy.power(ray_origins[ray, 0] - checked_intersection[0], 2) +
+					numpy.power(ray_origins[ray, 1] - checked_intersection[1], 2))
+
+				if distance < closest[ray, 0]:
+					closest[ray, 0] = distance
+					closest[ray, 1] = numpy.sqrt(
+						numpy.power(wall_points[wall, 0] - checked_intersection[0], 2) +
+						numpy.power(wall_points[wall, 1] - checked_intersection[1], 2))
+					closest[ray, 2] = wall
+
+
+#The New Kernel Over Blocks Of Walls, The Distance And Texture Coordinate Are Just The Parametric Hits Multiplied By Lengths Known Beforehand
+@numba.jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def batched_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths, ray_t, wall_u, hit, closest):
+	block_size = ray_t.shape[1]
+
+	closest[:, 0] = numpy.inf
+	closest[:, 1] = -1
+	closest[:, 2] = -1
+
+	for block in range(0, len(wall_points), block_size):
+		block_walls = wall_points[block:block + block_size]
+		intersect_walls(ray_origins, ray_directions, block_walls, ray_t, wall_u, hit)
+
+		for ray in range(len(ray_directions)):
+			for wall in range(len(block_walls)):
+				if hit[ray, wall] and ray_t[ray, wall] * ray_lengths[ray] < closest[ray, 0]:
+					closest[ray, 0] = ray_t[ray, wall] * ray_lengths[ray]
+					closest[ray, 1] = wall_u[ray, wall] * wall_lengths[block + wall]
+					closest[ray, 2] = block + wall
+
+
+#The Same Kernel Run Over Whole Arrays, Without Numba
+def numpy_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths):
+	ray_t, wall_u, hit = intersect_ray_wall.py_func(
+		ray_origins[:, 0, None], ray_origins[:, 1, None], ray_directions[:, 0, None], ray_directions[:, 1, None],
+		wall_points[None, :, 0], wall_points[None, :, 1], wall_points[None, :, 2], wall_points[None, :, 3])
+
+	distances = numpy.where(hit, ray_t * ray_lengths[:, None], numpy.inf)
+	wall = numpy.argmin(distances, axis=1)
+	rays = numpy.arange(len(ray_origins))
+
+	closest = numpy.stack((distances[rays, wall], wall_u[rays, wall] * wall_lengths[wall], wall), axis=1)
+	closest[numpy.isinf(closest[:, 0]), 1:] = -1
+
+	return closest
+
+
+#Runs A Function A Few Times & Gives Back The Best Time In Milliseconds
+def measure(function, repeats):
+	best = numpy.inf
+
+	for i in range(repeats):
+		start = time.perf_counter()
+		function()
+		best = min(best, time.perf_counter() - start)
+
+	return best * 1000
+
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+RAY_COUNT = 256
+WALL_COUNT = 4096
+BLOCK_SIZE = 256
+REPEATS = 20
+
+random = numpy.random.default_rng(0)
+
+#Random Short Walls Scattered Around The Player, Similar To What A Large Level Would Have
+wall_starts = random.uniform(0, 128, (WALL_COUNT, 2))
+wall_points = numpy.hstack((wall_starts, wall_starts + random.uniform(-4, 4, (WALL_COUNT, 2))))
+wall_lengths = numpy.hypot(wall_points[:, 2] - wall_points[:, 0], wall_points[:, 3] - wall_points[:, 1])
+
+#One Ray Per Column Of A 75 Degree View, All Starting From The Middle Of The Map
+angles = numpy.radians(numpy.linspace(-37.5, 37.5, RAY_COUNT))
+ray_origins = numpy.full((RAY_COUNT, 2), 64.0)
+ray_directions = numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=1) * 128
+ray_lengths = numpy.full(RAY_COUNT, 128.0)
+
+#Everything Is Allocated Once, Like It Would Be In The Renderer, The Hit Records Only Hold One Block Of Walls At A Time
+ray_t = numpy.zeros((RAY_COUNT, BLOCK_SIZE))
+wall_u = numpy.zeros((RAY_COUNT, BLOCK_SIZE))
+hit = numpy.zeros((RAY_COUNT, BLOCK_SIZE), dtype=numpy.bool_)
+
+#Each Row Is The (Distance, Texture Distance, Wall) Of The Closest Hit
+scalar_closest = numpy.zeros((RAY_COUNT, 3))
+batched_closest = numpy.zeros((RAY_COUNT, 3))
+
+#Compile First, So It Isn't Counted
+scalar_path(ray_origins, ray_directions, wall_points, scalar_closest)
+batched_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths, ray_t, wall_u, hit, batched_closest)
+numpy_closest = numpy_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths)
+
+#Every Path Has To Agree Before The Timings Mean Anything
+assert numpy.array_equal(scalar_closest[:, 2], batched_closest[:, 2]) and numpy.array_equal(numpy_closest[:, 2], batched_closest[:, 2])
+assert numpy.allclose(scalar_closest, batched_closest) and numpy.allclose(numpy_closest, batched_closest)
+
+scalar_time = measure(lambda: scalar_path(ray_origins, ray_directions, wall_points, scalar_closest), REPEATS)
+batched_time = measure(lambda: batched_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths, ray_t, wall_u, hit, batched_closest), REPEATS)
+numpy_time = measure(lambda: numpy_path(ray_origins, ray_directions, ray_lengths, wall_points, wall_lengths), REPEATS)
+
+print(str(RAY_COUNT) + " Rays x " + str(WALL_COUNT) + " Walls In Blocks Of " + str(BLOCK_SIZE) + ", " + str(int((batched_closest[:, 2] >= 0).sum())) + " Rays Hit A Wall")
+print("Scalar:  " + format(scalar_time, ".2f") + " ms")
+print("Batched: " + format(batched_time, ".2f") + " ms (" + format(scalar_time / batched_time, ".2f") + "x)")
+print("NumPy:   " + format(numpy_time, ".2f") + " ms (" + format(scalar_time / numpy_time, ".2f") + "x)")
@@ -0,0 +1,92 @@
+import time
+
+import numpy
+
+from sector_lookup import build_sector_grid
+from game_logic import World
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#A Square Grid Of Square Rooms, Each Room Is Its Own Segment With A Random Floor Or Ceiling Height
+#The Walls Between Rooms Are Doubled Up, Just Like In A Level Made By Hand
+def build_synthetic_level(rooms_per_side, random):
+	texture = numpy.zeros((64, 64), dtype=numpy.int32)
+	level = []
+
+	for room_x in range(rooms_per_side):
+		for room_y in range(rooms_per_side):
+			segment = room_y * rooms_per_side + room_x
+			x, y = room_x * 2.0, room_y * 2.0
+
+			floor_height = random.choice((0.0, 0.1, 0.2, 0.4))
+			ceiling_height = random.choice((0.0, 0.0, 0.0, 0.4))
+
+			corners = ((x, y), (x + 2.0, y), (x + 2.0, y + 2.0), (x, y + 2.0))
+
+			for i in range(4):
+				level.append((corners[i], corners[(i + 1) % 4], floor_height, ceiling_height, segment, texture, texture))
+
+	return tuple(level)
+
+
+#Runs The Tick Over A Synthetic Map & Gives Back The Average Time Per Tick In Microseconds
+def measure(rooms_per_side, body_count, ticks):
+	random = numpy.random.default_rng(0)
+
+	level = build_synthetic_level(rooms_per_side, random)
+	world = World(level, build_sector_grid(level, 2.0))
+
+	#The Bodies Start In The Middle Of Random Rooms & Wander Around
+	for i in range(body_count):
+		world.add_mover(tuple(random.integers(0, rooms_per_side, 2) * 2.0 + 1.0))
+
+	inputs = [[1, 0, random.uniform(0, 360)] for i in range(body_count)]
+
+	start = time.perf_counter()
+
+	for tick in range(ticks):
+		for i in range(body_count):
+			inputs[i][0] = random.integers(-1, 2)
+			inputs[i][1] = random.integers(-1, 2)
+			inputs[i][2] += random.uniform(-10, 10)
+
+		world.tick(inputs)
+
+	return (time.perf_counter() - start) / ticks * 1e6
+
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+ROOMS_PER_SIDE = (2, 4, 8, 16)
+BODY_COUNTS = (1, 8, 32)
+TICKS = 1000
+
+#Compile First, So It Isn't Counted
+measure(2, 1, 1)
+
+results = {}
+
+print("Walls    Bodies   us Per Tick")
+
+for rooms_per_side in ROOMS_PER_SIDE:
+	for body_count in BODY_COUNTS:
+		results[rooms_per_side, body_count] = measure(rooms_per_side, body_count, TICKS)
+
+		print(str(rooms_per_side * rooms_per_side * 4).ljust(9) + str(body_count).ljust(9) + format(results[rooms_per_side, body_count], ".1f"))
+
+#The Extra Cost Of Every Wall Is Taken From The Smallest & Largest Map With One Body,
+#And The Extra Cost Of Every Body From The Fewest & Most Bodies On The Smallest Map
+smallest, largest = ROOMS_PER_SIDE[0], ROOMS_PER_SIDE[-1]
+fewest, most = BODY_COUNTS[0], BODY_COUNTS[-1]
+
+wall_cost = (results[largest, fewest] - results[smallest, fewest]) / ((largest * largest - smallest * smallest) * 4)
+body_cost = (results[smallest, most] - results[smallest, fewest]) / (most - fewest)
+
+print("Per Wall: " + format(wall_cost, ".2f") + " us Per Tick")
+print("Per Body: " + format(body_cost, ".2f") + " us Per Tick")
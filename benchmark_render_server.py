@@ -0,0 +1,182 @@
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy
+
+from segment_kernel import build_wall_grid, build_scratch, scan_line, NO_ENTITIES, NO_LIGHTMAPS
+from render_server import RenderClient, serve_demo, load_demo_scene, COMMAND, COMMAND_CAMERA, SIZE, VISION, DISTANCE
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+CLIENT_COUNTS = (1, 2, 4, 8)
+FRAMES_PER_CLIENT = 200
+
+#How Many Commands The Vanishing Client Sends Before Leaving
+VANISHING_COMMANDS = 64
+
+#Looking Around From Random Places In The Demo Level
+def random_look(random):
+	position = random.uniform(64.5, 69.5, 2)
+
+	return (position[0], position[1]), random.uniform(0, 360)
+
+
+#Half Of The Clients Look Around From Random Places Like A Test Harness, The Others Walk Around With Inputs Like An Agent
+#Every Frame Is Read Whole From The Ring & Checked Afterwards, Frames Overwritten While Being Read Are Counted As Torn
+def run_client(path, index, frames, barrier, results):
+	random = numpy.random.default_rng(index)
+
+	start = time.perf_counter()
+	client = RenderClient(path)
+	connect_time = time.perf_counter() - start
+
+	barrier.wait()
+
+	latencies = []
+	torn = 0
+	checksum = 0
+
+	start = time.perf_counter()
+
+	for frame in range(frames):
+		request_start = time.perf_counter()
+
+		if index % 2 == 0:
+			number = client.look(*random_look(random))
+
+		else:
+			number = client.move(1.0, 0.0, frame * 3.0)
+
+		checksum += int(client.frame(number).sum())
+
+		latencies.append(time.perf_counter() - request_start)
+		torn += not client.is_current(number)
+
+	results.put((time.perf_counter() - start, connect_time, latencies, torn))
+
+	client.close()
+
+
+#Sends Half Of A Command & Hangs Until It Is Killed, In The Middle Of Its Request
+def run_stalled_client(path, ready):
+	client = RenderClient(path)
+	client.connection.sendall(COMMAND.pack(COMMAND_CAMERA, 66.0, 69.0, 0.0, 0.0)[:COMMAND.size // 2])
+
+	ready.set()
+	time.sleep(3600)
+
+
+#Sends A Burst Of Commands & Exits Straight Away Without Reading A Single Answer
+def run_vanishing_client(path):
+	client = RenderClient(path)
+
+	for frame in range(VANISHING_COMMANDS):
+		client.connection.sendall(COMMAND.pack(COMMAND_CAMERA, 66.0, 69.0, frame * 3.0, 0.0))
+
+	os._exit(0)
+
+
+#Every Client Is Started At Once & Timed From When They Are All Connected, Gives Back The Time Taken & Each Client's Results
+def serve_clients(context, path, client_count):
+	barrier = context.Barrier(client_count + 1)
+	results = context.Queue()
+
+	clients = [context.Process(target=run_client, args=(path, index, FRAMES_PER_CLIENT, barrier, results)) for index in range(client_count)]
+
+	for client in clients:
+		client.start()
+
+	barrier.wait()
+	start = time.perf_counter()
+
+	finished = [results.get() for client in clients]
+	elapsed = time.perf_counter() - start
+
+	for client in clients:
+		client.join()
+
+	return elapsed, finished
+
+
+def describe(times):
+	return "Median " + format(numpy.median(times) * 1000, ".2f") + " ms, Worst " + format(numpy.max(times) * 1000, ".2f") + " ms"
+
+
+if __name__ == "__main__":
+	#Clients Are Started Fresh, So Nothing Compiled Or Loaded Here Is Shared With Them
+	context = multiprocessing.get_context("spawn")
+
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, "server.sock")
+
+		start = time.perf_counter()
+		server = context.Process(target=serve_demo, args=(path,))
+		server.start()
+
+		while not os.path.exists(path):
+			time.sleep(.01)
+
+		print("Server Ready In " + format(time.perf_counter() - start, ".2f") + " s, Loading The Level & Compiling Only Happen Once")
+
+		#The Same Looks Rendered Here Without The Server, Which Is As Fast As Any Number Of Clients Can Be Served On One Core
+		start = time.perf_counter()
+
+		level, sprite_list, sky, palette, lights = load_demo_scene()
+		wall_grid = build_wall_grid(level, 2.0)
+		scratch = build_scratch(len(level), len(sprite_list), SIZE)
+		buffer = numpy.zeros(SIZE, dtype=numpy.int32)
+
+		scan_line(((66.0, 69.0), 0.0, VISION, DISTANCE, 0.0), level, wall_grid, sky, palette, buffer, sprite_list, NO_ENTITIES, lights, NO_LIGHTMAPS, scratch)
+
+		print("Warming Up Without The Server Takes " + format(time.perf_counter() - start, ".2f") + " s In Every Process")
+
+		random = numpy.random.default_rng(0)
+		frame_times = []
+
+		for frame in range(FRAMES_PER_CLIENT):
+			position, angle = random_look(random)
+
+			frame_start = time.perf_counter()
+			scan_line((position, angle, VISION, DISTANCE, 0.0), level, wall_grid, sky, palette, buffer, sprite_list, NO_ENTITIES, lights, NO_LIGHTMAPS, scratch)
+			frame_times.append(time.perf_counter() - frame_start)
+
+		print("In Process:".ljust(12) + format(1 / numpy.median(frame_times), ".0f") + " Frames/s, Frames " + describe(frame_times))
+
+		for client_count in CLIENT_COUNTS:
+			elapsed, finished = serve_clients(context, path, client_count)
+			latencies = [latency for result in finished for latency in result[2]]
+
+			print((str(client_count) + " Clients:").ljust(12) + format(client_count * FRAMES_PER_CLIENT / elapsed, ".0f") + " Frames/s, Requests " + describe(latencies) + ", Connecting " + describe([result[1] for result in finished]) + ", " + str(sum(result[3] for result in finished)) + " Torn")
+
+		#A Client Stuck Halfway Through A Command & One That Left Without Reading Its Answers Must Not Hold Up Or Stop The Others
+		ready = context.Event()
+		stalled = context.Process(target=run_stalled_client, args=(path, ready))
+		stalled.start()
+		ready.wait()
+
+		vanishing = context.Process(target=run_vanishing_client, args=(path,))
+		vanishing.start()
+		vanishing.join()
+
+		elapsed, finished = serve_clients(context, path, 2)
+
+		print("Beside A Stalled & A Vanished Client: " + format(2 * FRAMES_PER_CLIENT / elapsed, ".0f") + " Frames/s, Requests " + describe([latency for result in finished for latency in result[2]]))
+
+		#Killed While The Server Still Holds Half Of Its Command
+		stalled.terminate()
+		stalled.join()
+
+		elapsed, finished = serve_clients(context, path, 1)
+
+		print("After Killing The Stalled Client: " + format(FRAMES_PER_CLIENT / elapsed, ".0f") + " Frames/s, Server " + ("Still Up" if server.is_alive() else "Gone"))
+
+		client = RenderClient(path)
+		client.shutdown()
+		client.close()
+
+		server.join()
@@ -0,0 +1,81 @@
+import tempfile
+import time
+
+import numpy
+
+from segment_kernel import build_sky, build_scratch, scan_line, NO_PALETTE, NO_SPRITES, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS
+from level_streaming import ChunkStreamer, partition_level
+from benchmark_baker import build_synthetic_level
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+ROOMS_PER_SIDE = 256
+FRAMES = 600
+SIZE = (256, 256)
+
+#The Player Walks Diagonally Across The World At A Brisk Pace, So New Chunks Keep Coming In
+STEP = .25
+
+#Small Enough That Chunks Behind The Player Have To Be Let Go Along The Way
+MEMORY_BUDGET = 2 * 1024 * 1024
+
+#Every Chunk Holds 4 Rooms Of 4 Walls, So The Resident Capacity Holds 4 Chunks, Which Is As Many As Half A Chunk Can Ever Reach
+LOAD_RADIUS = 2.0
+
+if __name__ == "__main__":
+	level, lights = build_synthetic_level(ROOMS_PER_SIDE, numpy.random.default_rng(0))
+
+	with tempfile.TemporaryDirectory() as directory:
+		start = time.perf_counter()
+		chunks = partition_level(level, directory)
+
+		print("Segments: " + str(ROOMS_PER_SIDE * ROOMS_PER_SIDE) + ", Walls: " + str(len(level)) + ", Chunks: " + str(len(chunks)))
+		print("Partitioned In " + format(time.perf_counter() - start, ".1f") + " s, " + format(chunks[:, 5].sum() / 1024 / 1024, ".0f") + " MB On Disk")
+
+		del level
+
+		streamer = ChunkStreamer(directory, MEMORY_BUDGET, LOAD_RADIUS)
+
+		sky = build_sky(numpy.zeros((1, 1), dtype=numpy.int32), SIZE[1], 1)
+		scratch = build_scratch(streamer.capacity, 0, SIZE)
+		buffer = numpy.zeros(SIZE, dtype=numpy.int32)
+
+		#The First Chunks Are Waited For, Like A Loading Screen
+		position = (ROOMS_PER_SIDE / 4 + .5, ROOMS_PER_SIDE / 4 + .5)
+
+		while not streamer.update(position) or len(streamer.resident_chunks) == 0:
+			time.sleep(.001)
+
+		while streamer.update(position) or len(streamer.pending) > 0:
+			time.sleep(.001)
+
+		scan_line((position, 45.0, 75, 128, 0.0), streamer.level, streamer.wall_grid, sky, NO_PALETTE, buffer, NO_SPRITES, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch)
+
+		frame_times = []
+		update_times = []
+
+		for frame in range(FRAMES):
+			position = (position[0] + STEP, position[1] + STEP)
+
+			start = time.perf_counter()
+			streamer.update(position)
+			update_times.append(time.perf_counter() - start)
+
+			scan_line((position, 45.0, 75, 128, 0.0), streamer.level, streamer.wall_grid, sky, NO_PALETTE, buffer, NO_SPRITES, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch)
+			frame_times.append(time.perf_counter() - start)
+
+		streamer.close()
+
+		def describe(times):
+			return "Median " + format(numpy.median(times) * 1000, ".2f") + " ms, Worst " + format(numpy.max(times) * 1000, ".2f") + " ms"
+
+		print("Frames:        " + describe(frame_times))
+		print("Updates:       " + describe(update_times))
+		print("Chunk Loads:   " + describe(streamer.load_times) + " On The Loader Thread, " + str(len(streamer.load_times)) + " Loads")
+		print("Hitches:       " + describe(streamer.hitch_times) + " On The Main Thread, " + str(len(streamer.hitch_times)) + " Rebuilds")
+		print("Cache:         " + format(streamer.cache_bytes / 1024 / 1024, ".1f") + " MB Of Chunks & " + format(streamer.texture_bytes / 1024, ".0f") + " KB Of Textures, Of " + format(MEMORY_BUDGET / 1024 / 1024, ".0f") + " MB, " + str(streamer.evictions) + " Evictions")
+		print("Left Out:      " + str(streamer.skipped_chunks) + " Chunks Over " + str(len(streamer.hitch_times)) + " Rebuilds Didn't Fit In " + str(streamer.capacity) + " Walls")
+		print("Compiled Scan Lines: " + str(len(scan_line.signatures)))
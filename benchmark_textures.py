@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+
+#There Is No Window, So Pygame Is Given The Dummy Driver Before It Starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy
+import pygame
+
+from demo_level import load_texture
+from texture_cache import load_textures, WORKERS
+
+#--------------------------------
+#Benchmark
+#--------------------------------
+
+
+TEXTURE_COUNT = 500
+TEXTURE_SIZE = 128
+REPEATS = 3
+
+
+#Gradients With Some Noise, So They Don't Compress Down To Nothing Like Flat Colors Would
+def save_textures(directory, random):
+	x, y = numpy.mgrid[:TEXTURE_SIZE, :TEXTURE_SIZE]
+	paths = []
+
+	for index in range(TEXTURE_COUNT):
+		color = numpy.stack(((x * 2 + index) % 256, (y * 2 + index * 7) % 256, (x + y + index * 13) % 256), axis=2)
+		color = numpy.clip(color + random.integers(-16, 16, color.shape), 0, 255).astype(numpy.uint8)
+
+		paths.append(os.path.join(directory, "texture_" + str(index) + ".png"))
+		pygame.image.save(pygame.surfarray.make_surface(color), paths[-1])
+
+	return paths
+
+
+def describe(times):
+	return "Median " + format(numpy.median(times) * 1000, ".0f") + " ms, Worst " + format(numpy.max(times) * 1000, ".0f") + " ms"
+
+
+if __name__ == "__main__":
+	pygame.display.init()
+	pygame.display.set_mode((256, 256))
+
+	with tempfile.TemporaryDirectory() as directory:
+		paths = save_textures(directory, numpy.random.default_rng(0))
+
+		print(str(TEXTURE_COUNT) + " Textures Of " + str(TEXTURE_SIZE) + "x" + str(TEXTURE_SIZE) + ", " + str(WORKERS) + " Workers, " + str(os.cpu_count()) + " Cores")
+
+		#Before, Every Texture Is Decoded & Converted One At A Time
+		before_times = []
+
+		for repeat in range(REPEATS):
+			start = time.perf_counter()
+			expected = [load_texture(path) for path in paths]
+			before_times.append(time.perf_counter() - start)
+
+		#The First Start Decodes Everything Over The Pool & Fills The Cache, Every Repeat Starts With An Empty One
+		cold_times = []
+
+		for repeat in range(REPEATS):
+			start = time.perf_counter()
+			textures = load_textures(paths, os.path.join(directory, "cache_" + str(repeat)))
+			cold_times.append(time.perf_counter() - start)
+
+		#Later Starts Only Hash The Files & Map What Was Cached
+		warm_times = []
+
+		for repeat in range(REPEATS):
+			start = time.perf_counter()
+			textures = load_textures(paths, os.path.join(directory, "cache_0"))
+			warm_times.append(time.perf_counter() - start)
+
+		matching = sum(numpy.array_equal(texture, expected_texture) for texture, expected_texture in zip(textures, expected))
+
+		print("Before:        " + describe(before_times))
+		print("First Start:   " + describe(cold_times))
+		print("Cached Starts: " + describe(warm_times))
+		print(str(matching) + " Of " + str(TEXTURE_COUNT) + " Cached Textures Match The Converted Ones")
@@ -0,0 +1,99 @@
+import numpy
+import pygame
+
+from segment_kernel import build_sprite
+from texture_cache import load_textures
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#The See-Through Color Of The Demo Sprites, Other Sprites Can Use Their Own
+THING_COLORKEY = 9357180
+
+#The Torches Of The Demo Level, Every Light Is (Position, Radius, Color)
+DEMO_LIGHTS = (
+	((66.0, 70.5), 2.5, (.9, .55, .2)),
+	((69.0, 67.0), 2.0, (.2, .35, .8)),
+)
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#We Convert These To Arrays To Access The Texture Data Faster During The Rendering Process
+#A Display Mode Has To Be Set First, As The Images Are Converted To Its Pixel Format, The Demo Level Goes Through The Texture Cache Instead
+def load_texture(path):
+	return pygame.surfarray.array2d(pygame.image.load(path).convert())
+
+
+#There Is No Sky Texture Yet, So A Night Sky Is Made Here, A Gradient From Dark Blue To A Lighter Blue With A Few Stars
+def make_sky_texture():
+	sky_gradient = numpy.linspace(0, 1, 128)[None, :]
+	sky_red = numpy.repeat((8 + 24 * sky_gradient).astype(numpy.int32), 256, axis=0)
+	sky_green = numpy.repeat((12 + 40 * sky_gradient).astype(numpy.int32), 256, axis=0)
+	sky_blue = numpy.repeat((40 + 80 * sky_gradient).astype(numpy.int32), 256, axis=0)
+
+	sky_stars = numpy.random.default_rng(0).random((256, 128)) < .01 * (1 - sky_gradient)
+	sky_red[sky_stars], sky_green[sky_stars], sky_blue[sky_stars] = 220, 220, 200
+
+	return (sky_red << 16) | (sky_green << 8) | sky_blue
+
+
+#Level Data, This Is Temporary And Will Instead Load Through External Files In A Later Version
+#Gives Back The (Level, Sprite List, Sky Texture) Of The Demo Level
+def load_demo_level():
+	#Decoded Over A Few Threads On The First Start & Mapped From The Cache After That
+	basic_wall_1, basic_wall_2, basic_wall_3, basic_wall_4, basic_wall_5, tree_thing, table_thing, armor_thing = load_textures((
+		"texture.png", "texture2.png", "texture3.png", "texture4.png", "texture5.png",
+		"tree.png", "table.png", "armor.png",
+	))
+
+	offset = .5
+	offset2 = 1
+
+	level = (
+		((64.0, 71.0), (70.0, 71.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
+		((70.0, 71.0), (70.0, 77.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
+		((64.0, 71.0), (70.0, 77.0), 0.6, 0.0, 0, basic_wall_1, basic_wall_2),
+
+		((64.0, 64.0), (70.0, 64.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
+		((70.0, 64.0), (70.0, 70.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
+		((64.0, 64.0), (70.0, 70.0), 0.2, 0.6, 1, basic_wall_2, basic_wall_3),
+
+		((64.0, 64.0), (64.0, 71.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
+		((64.0, 71.0), (70.0, 71.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
+		((70.0, 71.0), (70.0, 70.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
+		((70.0, 70.0), (64.0, 64.0), 0.0, 0.2, 2, basic_wall_4, basic_wall_4),
+
+		((70.0, 71.0), (70.0, 70.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
+		((70.0, 70.0), (70.5, 70.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
+		((70.5, 70.0), (70.5, 71.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
+		((70.5, 71.0), (70.0, 71.0), 0.1, 0.0, 3, basic_wall_2, basic_wall_3),
+
+		((70.0 + offset, 71.0), (70.0 + offset, 70.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
+		((70.0 + offset, 70.0), (70.5 + offset, 70.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
+		((70.5 + offset, 70.0), (70.5 + offset, 71.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
+		((70.5 + offset, 71.0), (70.0 + offset, 71.0), 0.2, 0.0, 4, basic_wall_2, basic_wall_3),
+
+		((70.0 + offset2, 71.0), (70.0 + offset2, 70.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
+		((70.0 + offset2, 70.0), (70.5 + offset2, 70.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
+		((70.5 + offset2, 70.0), (70.5 + offset2, 71.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
+		((70.5 + offset2, 71.0), (70.0 + offset2, 71.0), 0.3, 0.0, 5, basic_wall_2, basic_wall_3),
+
+		((71.5, 71.0), (70.0, 71.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
+		((70.0, 71.0), (70.0, 74.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
+		((70.0, 74.0), (71.5, 72.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
+		((71.5, 72.0), (71.5, 71.0), 0.4, 0.0, 6, basic_wall_2, basic_wall_3),
+	)
+
+	sprite_list = (
+		build_sprite((66, 70, 0.0), tree_thing, THING_COLORKEY),
+		build_sprite((69, 70, 0.2), table_thing, THING_COLORKEY),
+		build_sprite((67, 68, 0.0), armor_thing, THING_COLORKEY),
+	)
+
+	return level, sprite_list, make_sky_texture()
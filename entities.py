@@ -0,0 +1,286 @@
+import numpy
+
+from segment_kernel import jit, SPRITE_TEXTURE
+from sector_lookup import find_sector, find_sectors, LOCATED_SEGMENT, LOCATED_FLOOR_HEIGHT
+from game_logic import TICK_RATE
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+ENTITY_CAPACITY = 16384
+
+#The Flags Say How An Entity Moves, One Without Either Flag Stands Still
+#Seeking Entities Head Straight For The Target, Wandering Entities Turn A Little Every Tick & Walk Wherever They Face
+FLAG_SEEKING, FLAG_WANDERING = 1, 2
+
+#How Fast Entities Walk In Units Per Second & How Much Of The Way To Their Wanted Velocity They Turn Every Tick
+ENTITY_SPEED = 1.5
+ENTITY_STEERING = .2
+
+#The Most A Wandering Entity Turns In One Tick, In Radians
+WANDER_TURN = .3
+
+#Seeking Entities Stop This Close To The Target Instead Of Walking Into It
+SEEK_DISTANCE = 1.0
+
+#Entities Look This Far Ahead Of Where They Step, So They Stop Short Of Walls Like The Player's Circle Does
+ENTITY_RADIUS = .2
+
+#The Same Rule The Player's Solid Walls Follow, A Step Up Of More Than This Or A Ceiling Lower Than This Blocks The Way
+STEP_HEIGHT = .2
+
+#The Bins The Renderer Gathers Entities From Cover Wherever The Entities Are With At Most This Many Cells Along Each Side
+#The Cells Are Never Smaller Than A Room Of The Demo, So A Crowd Doesn't Spread Over Many Cells
+BINS_PER_SIDE = 64
+BIN_CELL_SIZE = 2.0
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#A Cheap Hash Of The Entity & The Tick Going From -1 To 1, So Wandering Is The Same Every Run Without Keeping Any Random State
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_wander_turn(entity, tick):
+	value = (entity * 73856093) ^ (tick * 19349663)
+	value = (value ^ (value >> 13)) * 1274126177
+	value = value ^ (value >> 16)
+
+	return (value & 1023) / 511.5 - 1
+
+
+#Whether An Entity Standing In A Segment At The Given Floor Height Can Walk Onto A Point
+#Staying In The Same Segment Is Always Fine, Leaving The Level Never Is
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def can_enter(sector_grid, sector, floor_height, x, y):
+	segment, new_floor_height, new_ceiling_height = find_sector(sector_grid, x, y)
+
+	if segment == sector:
+		return True
+
+	if segment == -1:
+		return False
+
+	return new_floor_height <= floor_height + STEP_HEIGHT and new_ceiling_height <= STEP_HEIGHT
+
+
+#Whether An Entity Can Take A Step, The Point Checked Is Ahead Of The Step By The Entity's Radius
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def can_step(sector_grid, sector, floor_height, x, y, step_x, step_y):
+	length = numpy.sqrt(step_x * step_x + step_y * step_y)
+
+	if length == 0:
+		return False
+
+	return can_enter(sector_grid, sector, floor_height, x + step_x + step_x / length * ENTITY_RADIUS, y + step_y + step_y / length * ENTITY_RADIUS)
+
+
+#Runs One Tick Of Every Entity, Steering Them, Moving Them & Keeping Them Out Of The Walls
+#Walls Are Never Looked At On Their Own, An Entity Is Blocked When The Segment Ahead Of It Couldn't Be Stepped Onto
+#A Blocked Entity Slides Along Whichever Axis Is Free, Wandering Entities With Nowhere To Go Turn Around
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def tick_entities(sector_grid, position, velocity, sector, flags, heading, target_x, target_y, tick):
+	for i in range(len(position)):
+		x, y, floor_height = position[i, 0], position[i, 1], position[i, 2]
+		wanted_x, wanted_y = 0.0, 0.0
+
+		if flags[i] & FLAG_SEEKING:
+			dx = target_x - x
+			dy = target_y - y
+
+			dist = numpy.sqrt(dx * dx + dy * dy)
+			heading[i] = numpy.arctan2(dy, dx)
+
+			if dist > SEEK_DISTANCE:
+				wanted_x = dx / dist * ENTITY_SPEED
+				wanted_y = dy / dist * ENTITY_SPEED
+
+		elif flags[i] & FLAG_WANDERING:
+			heading[i] += get_wander_turn(i, tick) * WANDER_TURN
+
+			wanted_x = numpy.cos(heading[i]) * ENTITY_SPEED
+			wanted_y = numpy.sin(heading[i]) * ENTITY_SPEED
+
+		velocity[i, 0] += (wanted_x - velocity[i, 0]) * ENTITY_STEERING
+		velocity[i, 1] += (wanted_y - velocity[i, 1]) * ENTITY_STEERING
+
+		step_x = velocity[i, 0] / TICK_RATE
+		step_y = velocity[i, 1] / TICK_RATE
+
+		if can_step(sector_grid, sector[i], floor_height, x, y, step_x, step_y):
+			x += step_x
+			y += step_y
+
+		elif can_step(sector_grid, sector[i], floor_height, x, y, step_x, 0.0):
+			x += step_x
+			velocity[i, 1] = 0
+
+		elif can_step(sector_grid, sector[i], floor_height, x, y, 0.0, step_y):
+			y += step_y
+			velocity[i, 0] = 0
+
+		segment, new_floor_height, new_ceiling_height = find_sector(sector_grid, x, y)
+
+		#Only The Point Ahead Was Checked, So Cutting Across A Corner Could Still Take The Centre Out Of The Level
+		if x == position[i, 0] and y == position[i, 1] or segment == -1 and sector[i] != -1:
+			velocity[i, 0] = 0
+			velocity[i, 1] = 0
+
+			if flags[i] & FLAG_WANDERING:
+				heading[i] += numpy.pi
+
+			continue
+
+		position[i, 0] = x
+		position[i, 1] = y
+
+		#An Entity That Was Already Outside Keeps Its Height Until It Finds Its Way Back In
+		if segment != -1:
+			position[i, 2] = new_floor_height
+
+		sector[i] = segment
+
+
+#Sorts The Entities Into The Cells Of A Grid Covering All Of Them With A Counting Sort, Entities In A Cell Keep Their Order
+#Gives Back The (Origin X, Origin Y, Cell Size, Columns, Rows) Of The Grid
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def bin_entities(position, cell_start, cell_entities, bins_per_side):
+	if len(position) == 0:
+		cell_start[0] = 0
+		cell_start[1] = 0
+
+		return 0.0, 0.0, BIN_CELL_SIZE, 1, 1
+
+	minimum_x, minimum_y = position[0, 0], position[0, 1]
+	maximum_x, maximum_y = position[0, 0], position[0, 1]
+
+	for i in range(len(position)):
+		minimum_x = min(minimum_x, position[i, 0])
+		minimum_y = min(minimum_y, position[i, 1])
+		maximum_x = max(maximum_x, position[i, 0])
+		maximum_y = max(maximum_y, position[i, 1])
+
+	cell_size = max(BIN_CELL_SIZE, max(maximum_x - minimum_x, maximum_y - minimum_y) / bins_per_side)
+
+	columns = min(int((maximum_x - minimum_x) / cell_size) + 1, bins_per_side)
+	rows = min(int((maximum_y - minimum_y) / cell_size) + 1, bins_per_side)
+
+	for cell in range(columns * rows + 1):
+		cell_start[cell] = 0
+
+	#Every Cell First Counts Its Entities, Then The Counts Are Added Up So Every Cell Knows Where It Ends
+	for i in range(len(position)):
+		cell = min(int((position[i, 1] - minimum_y) / cell_size), rows - 1) * columns + min(int((position[i, 0] - minimum_x) / cell_size), columns - 1)
+		cell_start[cell] += 1
+
+	for cell in range(1, columns * rows + 1):
+		cell_start[cell] += cell_start[cell - 1]
+
+	#Going Backwards Moves Every Cell's End Back To Its Start
+	for i in range(len(position) - 1, -1, -1):
+		cell = min(int((position[i, 1] - minimum_y) / cell_size), rows - 1) * columns + min(int((position[i, 0] - minimum_x) / cell_size), columns - 1)
+		cell_start[cell] -= 1
+		cell_entities[cell_start[cell]] = i
+
+	return minimum_x, minimum_y, cell_size, columns, rows
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Every Entity Is One Row Of A Few NumPy Columns Instead Of An Object, So Thousands Can Be Ticked & Drawn Without Python Looking At Each One
+#The Rows Of The First Count Entities Are The Live Ones, Removing An Entity Moves The Last One Into Its Row
+#Every Kind Of Entity Is Drawn With One Of The Given Sprites, Where Those Sprites Stand Doesn't Matter
+class EntityStore:
+	def __init__(self, sprites, capacity=ENTITY_CAPACITY):
+		self.sprites = tuple(((0.0, 0.0, 0.0),) + sprite[SPRITE_TEXTURE:] for sprite in sprites)
+
+		self.position = numpy.zeros((capacity, 3), dtype=numpy.float64)
+		self.previous_position = numpy.zeros((capacity, 3), dtype=numpy.float64)
+		self.velocity = numpy.zeros((capacity, 2), dtype=numpy.float64)
+		self.sector = numpy.full(capacity, -1, dtype=numpy.int64)
+		self.kind = numpy.zeros(capacity, dtype=numpy.int64)
+		self.flags = numpy.zeros(capacity, dtype=numpy.int64)
+		self.heading = numpy.zeros(capacity, dtype=numpy.float64)
+
+		#Where The Entities Are Drawn, Blended Between The Last Two Ticks & Binned For The Renderer
+		self.drawn_position = numpy.zeros((capacity, 3), dtype=numpy.float64)
+		self.cell_start = numpy.zeros(BINS_PER_SIDE * BINS_PER_SIDE + 1, dtype=numpy.int64)
+		self.cell_entities = numpy.zeros(capacity, dtype=numpy.int64)
+		self.located = numpy.zeros((capacity, 3), dtype=numpy.float64)
+
+		self.count = 0
+		self.ticks = 0
+
+	@property
+	def capacity(self):
+		return len(self.position)
+
+	#Adds An Entity Of One Kind At Every (X, Y) Position, Each Standing On The Floor Of The Segment Under It
+	#Gives Back The Indices Of The New Entities, Those That Don't Fit Are Left Out & An Unknown Kind Gives Back None
+	def add(self, sector_grid, positions, kind, flags, heading=0.0):
+		if kind < 0 or kind >= len(self.sprites):
+			return None
+
+		positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 2)[:self.capacity - self.count]
+		indices = numpy.arange(self.count, self.count + len(positions))
+
+		located = self.located[:len(positions)]
+		find_sectors(sector_grid, positions, located)
+
+		self.position[indices, :2] = positions
+		self.position[indices, 2] = located[:, LOCATED_FLOOR_HEIGHT]
+		self.previous_position[indices] = self.position[indices]
+		self.velocity[indices] = 0
+		self.sector[indices] = located[:, LOCATED_SEGMENT]
+		self.kind[indices] = kind
+		self.flags[indices] = flags
+		self.heading[indices] = heading
+
+		self.count += len(positions)
+
+		return indices
+
+	#Removes An Entity, The Last Entity Takes Its Index So The Live Rows Stay Packed
+	def remove(self, index):
+		if index < 0 or index >= self.count:
+			return
+
+		last = self.count - 1
+
+		for column in (self.position, self.previous_position, self.velocity, self.sector, self.kind, self.flags, self.heading):
+			column[index] = column[last]
+
+		self.count -= 1
+
+	#Runs One Tick Of Every Entity, The Sector Grid Is Taken Every Time As Streaming & Editing Can Swap It
+	def tick(self, sector_grid, target):
+		count = self.count
+
+		self.previous_position[:count] = self.position[:count]
+
+		tick_entities(
+			sector_grid, self.position[:count], self.velocity[:count], self.sector[:count], self.flags[:count], self.heading[:count],
+			float(target[0]), float(target[1]), self.ticks)
+
+		self.ticks += 1
+
+	#The Entities For The Scan Line, Blended Between The Last Two Ticks Like The Player Is
+	#They Are Binned Where They Are Drawn, So The Renderer Only Looks At The Cells The Player Can See
+	def view(self, blend=1.0):
+		count = self.count
+		drawn_position = self.drawn_position[:count]
+
+		numpy.subtract(self.position[:count], self.previous_position[:count], out=drawn_position)
+		drawn_position *= blend
+		drawn_position += self.previous_position[:count]
+
+		origin_x, origin_y, cell_size, columns, rows = bin_entities(drawn_position, self.cell_start, self.cell_entities, BINS_PER_SIDE)
+		bins = ((origin_x, origin_y), cell_size, (columns, rows), self.cell_start[:columns * rows + 1], self.cell_entities[:count])
+
+		return (drawn_position, self.sector[:count], self.kind[:count], self.sprites, bins)
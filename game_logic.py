@@ -0,0 +1,154 @@
+import numpy
+import pymunk
+
+from segment_kernel import lerp, normalize, WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT
+from sector_lookup import find_sector, LOCATED_FLOOR_HEIGHT
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+TICK_RATE = 30
+
+#Every Input Is (Forward, Strafe, Angle), Forward & Strafe Go From -1 To 1 & The Angle Is In Degrees
+INPUT_FORWARD, INPUT_STRAFE, INPUT_ANGLE = 0, 1, 2
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Anything That Walks Around The Level, The Player Is One Of These
+#Friction Won't Matter Here As The Game's Logic Is Handled "Top-Down",
+#Instead We Multiply The Velocity And Can Be Seen In The Tick
+class Mover:
+	__slots__ = ("body", "shape", "offset", "bobbing", "bobbing_strength", "final_bobbing")
+
+	def __init__(self, position):
+		self.body = pymunk.Body()
+		self.body.position = position
+
+		self.shape = pymunk.Circle(self.body, .2)
+		self.shape.mass = 1
+		self.shape.friction = 0
+
+		self.offset = 0.0
+		self.bobbing = 0.0
+		self.bobbing_strength = 0.0
+		self.final_bobbing = 0.0
+
+
+#The Physics Of A Level, Everything Here Runs Without A Window So It Can Be Measured On Its Own
+#The First Mover Decides Which Walls Are Solid, As Only The Player's Height Matters For Now
+class World:
+	def __init__(self, level, sector_grid):
+		self.level = level
+		self.sector_grid = sector_grid
+
+		self.space = pymunk.Space()
+		self.space.gravity = (0, 0)
+
+		self.movers = []
+
+		#The Shapes Of The Solid Walls By Wall Index, So Single Walls Can Be Added, Removed Or Made Again
+		self.wall_shapes = {}
+		self.wall_offset = None
+
+		self.rebuild_walls(0.0)
+
+	def add_mover(self, position):
+		mover = Mover(position)
+
+		self.space.add(mover.body, mover.shape)
+		self.movers.append(mover)
+
+		return mover
+
+	#Swaps In Another Level, Like When Streamed Chunks Come In Or Go Away, Movers Keep Their Place
+	def change_level(self, level, sector_grid):
+		for index in list(self.wall_shapes):
+			self.space.remove(*self.wall_shapes.pop(index))
+
+		self.level = level
+		self.sector_grid = sector_grid
+
+		self.update_walls(range(len(level)))
+
+	#Takes In A Level Where Only A Few Walls Were Edited, Only Their Shapes Are Made Again
+	def edit_level(self, level, sector_grid, walls):
+		self.level = level
+		self.sector_grid = sector_grid
+
+		self.update_walls(walls, True)
+
+	#Walls Low Enough To Step Onto From The Given Height Are Left Out
+	#Nothing Is Touched While The Height Stays The Same, Otherwise Only Walls That Turn Solid Or Stop Being Solid Are
+	def rebuild_walls(self, offset):
+		if offset != self.wall_offset:
+			self.wall_offset = offset
+			self.update_walls(range(len(self.level)))
+
+	#Adds & Removes The Shapes Of The Given Walls, Edited Walls Are Given New Shapes Even If They Were Already Solid
+	def update_walls(self, indices, edited=False):
+		for index in indices:
+			wall = self.level[index]
+			solid = wall[WALL_FLOOR_HEIGHT] > self.wall_offset + .2 or wall[WALL_CEILING_HEIGHT] > .2
+
+			if index in self.wall_shapes and (edited or not solid):
+				self.space.remove(*self.wall_shapes.pop(index))
+
+			if solid and index not in self.wall_shapes:
+				physics_geometry = pymunk.Body(body_type=pymunk.Body.STATIC)
+				physics_segment = pymunk.Segment(physics_geometry, wall[WALL_POINT_A], wall[WALL_POINT_B], .2)
+
+				self.space.add(physics_geometry, physics_segment)
+				self.wall_shapes[index] = (physics_geometry, physics_segment)
+
+	#Runs One Step Of The Game Logic, Every Mover Gets The Input With The Same Index
+	#Gives Back Which Movers Finished A Step, So The Caller Can Play A Sound For Them
+	def tick(self, inputs):
+		stepped = []
+
+		for i in range(len(self.movers)):
+			mover = self.movers[i]
+			forward, strafe, angle = inputs[i]
+
+			#Get The Height Of The Segment That The Mover Is Standing On, So That They Will Be Raised Accordingly
+			mover.offset = find_sector(self.sector_grid, mover.body.position[0], mover.body.position[1])[LOCATED_FLOOR_HEIGHT]
+
+			#Direction Here Is Normalized For Diagonal Movement,
+			#Without It Diagonal Movement Will Be Faster
+			direction = normalize((forward, strafe))
+
+			#We Use Pymunk Here To Move The Mover, This Will Allow Us To Collide With Any Obstacles
+			mover.body.apply_impulse_at_local_point(
+				((numpy.cos(numpy.radians(angle)) * direction[0] + numpy.cos(numpy.radians(angle + 90)) * direction[1]) * .4,
+				(numpy.sin(numpy.radians(angle)) * direction[0] + numpy.sin(numpy.radians(angle + 90)) * direction[1]) * .4))
+			mover.body.velocity *= .8
+
+			#The Smaller The Value, The Smaller The Bobbing. So If The Value Is 0, The Y-Offset Will Stay At Rest
+			moving = forward != 0 or strafe != 0
+			mover.bobbing_strength = lerp(mover.bobbing_strength, moving, .4)
+
+			mover.bobbing += .8
+
+			if mover.bobbing > numpy.radians(360):
+				mover.bobbing -= numpy.radians(360)
+
+				if moving:
+					stepped.append(mover)
+
+			mover.final_bobbing = -mover.offset + (numpy.sin(mover.bobbing) / 64) * mover.bobbing_strength
+
+		#We Step 16 Times For Better Collisions, In My Opinion Pymunk Should Not Be Restricted
+		#To Discrete Collisions, And Continous Collisions Would Be Faster Than This Solution,
+		#But It Is What It Is...
+		for i in range(16):
+			self.space.step(.01)
+
+		if len(self.movers) > 0:
+			self.rebuild_walls(self.movers[0].offset)
+
+		return stepped
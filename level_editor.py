@@ -0,0 +1,499 @@
+import time
+
+import pygame
+import numpy
+
+from segment_kernel import WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT, WALL_TEXTURE, WALL_FLOOR_TEXTURE, PLAYER_POSITION, PLAYER_ANGLE
+from sector_lookup import is_inside_sector
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#The Level Is Padded To This Many Walls, So Adding & Deleting Walls Never Changes Its Length & The Renderer Is Only Compiled Once
+EDITOR_CAPACITY = 128
+
+#The Grids Reach This Far Past The Level, Points Can't Be Moved Or Placed Outside Of Them
+EDITOR_MARGIN = 8.0
+
+GRID_CELL_SIZE = 2.0
+
+#Placed & Moved Points Snap To This, So Walls Meeting At A Point Are Still Found Together After Moving It
+SNAP = .25
+
+#How Much A Floor Or Ceiling Is Raised Or Lowered At A Time
+HEIGHT_STEP = .1
+
+#Pixels Per Unit Of The Top-Down Map, & How Close The Mouse Has To Be To Grab A Point
+MAP_SCALE = 12.0
+GRAB_DISTANCE = 5.0
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Packs A List Of Lists Into Where Every List Starts & All Their Items One After Another, Which Is How The Grids Store Their Cells
+def pack(lists):
+	start = numpy.zeros(len(lists) + 1, dtype=numpy.int64)
+	start[1:] = numpy.cumsum([len(items) for items in lists])
+
+	return start, numpy.array([item for items in lists for item in items], dtype=numpy.int64)
+
+
+#Replaces The Items Of One Packed List, Only The Starts After It Are Moved Along
+#Gives Back The New Items, The Starts Are Changed In Place
+def splice(start, items, index, new_items):
+	new_items = numpy.asarray(new_items, dtype=items.dtype).reshape((-1,) + items.shape[1:])
+	difference = len(new_items) - (start[index + 1] - start[index])
+
+	items = numpy.concatenate((items[:start[index]], new_items, items[start[index + 1]:]))
+	start[index + 1:] += difference
+
+	return items
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Keeps A Level That Can Be Edited While It Is Drawn, The Grids Are Only Patched Where Edits Touch Them
+#Walls Sit In Fixed Slots, Deleted Walls Become A Placeholder With No Length That Is Left Out Of Every Grid
+#The Editor Keeps Its Own Sector Bounds Too, Lights Are Binned With Them As Segments Come & Go
+class LevelEditor:
+	def __init__(self, level, capacity=EDITOR_CAPACITY, cell_size=GRID_CELL_SIZE, margin=EDITOR_MARGIN):
+		self.capacity = capacity
+		self.cell_size = float(cell_size)
+
+		#New Walls Look Like The First Wall Of The Level
+		self.wall_texture = level[0][WALL_TEXTURE]
+		self.floor_texture = level[0][WALL_FLOOR_TEXTURE]
+		self.placeholder = ((0.0, 0.0), (0.0, 0.0), 0.0, 0.0, -1, self.wall_texture, self.floor_texture)
+
+		self.walls = list(level) + [self.placeholder] * (capacity - len(level))
+		self.free_walls = list(range(capacity - 1, len(level) - 1, -1))
+
+		points = numpy.array([wall[WALL_POINT_A] + wall[WALL_POINT_B] for wall in level], dtype=numpy.float64).reshape(-1, 2)
+
+		origin = points.min(axis=0) - margin
+		size = numpy.ceil((points.max(axis=0) + margin - origin) / self.cell_size).astype(numpy.int64)
+
+		self.origin = (float(origin[0]), float(origin[1]))
+		self.size = (int(size[0]), int(size[1]))
+		self.maximum = (self.origin[0] + self.size[0] * self.cell_size, self.origin[1] + self.size[1] * self.cell_size)
+
+		#Walls Per Segment & Which Cells Every Wall & Sector Was Last Added To, So Edits Know What To Take Back Out
+		self.segment_walls = {}
+		self.wall_cells = {}
+		self.sector_cells = {}
+
+		for index in range(len(level)):
+			self.segment_walls.setdefault(level[index][WALL_SEGMENT], []).append(index)
+
+		self.next_segment = max(self.segment_walls) + 1
+
+		#The Wall Grid, Laid Out Just Like The One build_wall_grid Makes
+		self.wall_points = numpy.zeros((capacity, 4), dtype=numpy.float64)
+		self.wall_segment = numpy.full(capacity, -1, dtype=numpy.int64)
+		self.wall_side = numpy.zeros(capacity, dtype=numpy.float64)
+		self.wall_length = numpy.zeros(capacity, dtype=numpy.float64)
+
+		wall_lists = [[] for i in range(self.size[0] * self.size[1])]
+
+		for index in range(len(level)):
+			self.update_wall_arrays(index)
+			self.wall_cells[index] = self.find_cells(self.wall_points[index].reshape(2, 2))
+
+			for cell in self.wall_cells[index]:
+				wall_lists[cell].append(index)
+
+		for segment in self.segment_walls:
+			self.update_wall_sides(segment)
+
+		self.cell_start, self.cell_walls = pack(wall_lists)
+
+		#The Sector Grid, Every Segment Keeps The Sector Number It Was Given Even After Being Deleted
+		self.sectors = {}
+		sector_lists = [[] for i in range(self.size[0] * self.size[1])]
+
+		for segment in sorted(self.segment_walls):
+			self.sectors[segment] = len(self.sectors)
+			self.sector_cells[segment] = self.find_cells(self.get_segment_points(segment))
+
+			for cell in self.sector_cells[segment]:
+				sector_lists[cell].append(self.sectors[segment])
+
+		self.sector_start, self.sector_cell_sectors = pack(sector_lists)
+
+		segments = sorted(self.segment_walls)
+
+		self.sector_wall_start, wall_order = pack([self.segment_walls[segment] for segment in segments])
+		self.sector_wall_points = self.wall_points[wall_order]
+		self.sector_segment = numpy.array(segments, dtype=numpy.int64)
+		self.sector_floor_height = numpy.array([self.walls[self.segment_walls[segment][0]][WALL_FLOOR_HEIGHT] for segment in segments], dtype=numpy.float64)
+		self.sector_ceiling_height = numpy.array([self.walls[self.segment_walls[segment][0]][WALL_CEILING_HEIGHT] for segment in segments], dtype=numpy.float64)
+
+		self.sector_bounds = numpy.tile(numpy.array((numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)), (self.next_segment, 1))
+
+		for segment in segments:
+			self.update_sector_bounds(segment)
+
+		self.edit_times = []
+		self.pack_level()
+
+	#The Cells A Box Around Some Points Touches
+	def find_cells(self, points):
+		minimum = numpy.floor((points.min(axis=0) - self.origin) / self.cell_size).astype(numpy.int64)
+		maximum = numpy.floor((points.max(axis=0) - self.origin) / self.cell_size).astype(numpy.int64)
+
+		return [cell_y * self.size[0] + cell_x for cell_x in range(minimum[0], maximum[0] + 1) for cell_y in range(minimum[1], maximum[1] + 1)]
+
+	def get_segment_points(self, segment):
+		return self.wall_points[self.segment_walls[segment]].reshape(-1, 2)
+
+	def update_wall_arrays(self, index):
+		wall = self.walls[index]
+
+		self.wall_points[index] = wall[WALL_POINT_A] + wall[WALL_POINT_B]
+		self.wall_segment[index] = wall[WALL_SEGMENT]
+		self.wall_length[index] = numpy.hypot(self.wall_points[index, 2] - self.wall_points[index, 0], self.wall_points[index, 3] - self.wall_points[index, 1])
+
+	#Which Side Faces The Inside Depends On The Middle Of The Segment, So Moving One Wall Can Flip Any Wall Of Its Segment
+	def update_wall_sides(self, segment):
+		walls = self.segment_walls[segment]
+		center = self.wall_points[walls].reshape(-1, 2).mean(axis=0)
+
+		for index in walls:
+			x1, y1, x2, y2 = self.wall_points[index]
+			self.wall_side[index] = numpy.sign((center[0] - x1) * (y1 - y2) + (center[1] - y1) * (x2 - x1))
+
+	def update_sector_bounds(self, segment):
+		if segment >= len(self.sector_bounds):
+			grown = numpy.tile(numpy.array((numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)), (segment + 1, 1))
+			grown[:len(self.sector_bounds)] = self.sector_bounds
+			self.sector_bounds = grown
+
+		if segment in self.segment_walls:
+			points = self.get_segment_points(segment)
+			self.sector_bounds[segment] = numpy.concatenate((points.min(axis=0), points.max(axis=0)))
+
+		else:
+			self.sector_bounds[segment] = (numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)
+
+	#Takes A Wall Out Of The Cells It Was In & Puts It In The Cells It Is In Now, Only Cells That Differ Are Touched
+	def move_wall_cells(self, index, cells):
+		old_cells = self.wall_cells.pop(index, [])
+
+		for cell in set(old_cells) ^ set(cells):
+			walls = self.cell_walls[self.cell_start[cell]:self.cell_start[cell + 1]]
+			walls = walls[walls != index] if cell in old_cells else numpy.append(walls, index)
+
+			self.cell_walls = splice(self.cell_start, self.cell_walls, cell, walls)
+
+		if len(cells) > 0:
+			self.wall_cells[index] = cells
+
+	def move_sector_cells(self, segment, cells):
+		sector = self.sectors[segment]
+		old_cells = self.sector_cells.pop(segment, [])
+
+		for cell in set(old_cells) ^ set(cells):
+			sectors = self.sector_cell_sectors[self.sector_start[cell]:self.sector_start[cell + 1]]
+			sectors = sectors[sectors != sector] if cell in old_cells else numpy.append(sectors, sector)
+
+			self.sector_cell_sectors = splice(self.sector_start, self.sector_cell_sectors, cell, sectors)
+
+		if len(cells) > 0:
+			self.sector_cells[segment] = cells
+
+	#Brings Everything Built From The Walls Up To Date After An Edit, Only For The Walls & Segments Given
+	def apply(self, walls, segments):
+		for index in walls:
+			self.update_wall_arrays(index)
+			self.move_wall_cells(index, self.find_cells(self.wall_points[index].reshape(2, 2)) if self.walls[index][WALL_SEGMENT] != -1 else [])
+
+		for segment in segments:
+			if segment not in self.sectors:
+				self.sectors[segment] = len(self.sectors)
+
+				self.sector_wall_start = numpy.append(self.sector_wall_start, self.sector_wall_start[-1])
+				self.sector_segment = numpy.append(self.sector_segment, segment)
+				self.sector_floor_height = numpy.append(self.sector_floor_height, 0.0)
+				self.sector_ceiling_height = numpy.append(self.sector_ceiling_height, 0.0)
+
+			sector = self.sectors[segment]
+			alive = segment in self.segment_walls
+
+			self.sector_wall_points = splice(self.sector_wall_start, self.sector_wall_points, sector, self.wall_points[self.segment_walls[segment]] if alive else ())
+			self.move_sector_cells(segment, self.find_cells(self.get_segment_points(segment)) if alive else [])
+			self.update_sector_bounds(segment)
+
+			if alive:
+				self.update_wall_sides(segment)
+
+				first_wall = self.walls[self.segment_walls[segment][0]]
+				self.sector_floor_height[sector] = first_wall[WALL_FLOOR_HEIGHT]
+				self.sector_ceiling_height[sector] = first_wall[WALL_CEILING_HEIGHT]
+
+		self.pack_level()
+
+	#The Level & Grids Are Tuples, So They Are Put Together Again, Which Only Gathers What Is Already There
+	def pack_level(self):
+		self.level = tuple(self.walls)
+
+		self.wall_grid = (
+			self.origin, self.cell_size, self.size, self.cell_start, self.cell_walls,
+			self.wall_points, self.wall_segment, self.wall_side, self.wall_length)
+
+		self.sector_grid = (
+			self.origin, self.cell_size, self.size, self.sector_start, self.sector_cell_sectors,
+			self.sector_wall_start, self.sector_wall_points, self.sector_segment, self.sector_floor_height, self.sector_ceiling_height)
+
+	def clamp(self, point):
+		return (
+			float(numpy.clip(numpy.round(point[0] / SNAP) * SNAP, self.origin[0], self.maximum[0] - SNAP)),
+			float(numpy.clip(numpy.round(point[1] / SNAP) * SNAP, self.origin[1], self.maximum[1] - SNAP)))
+
+	#Adds A Segment Closed Around The Points, Gives Back The Walls That Changed Or None When There Aren't Enough Free Slots
+	def add_segment(self, points, floor_height=0.0, ceiling_height=0.0):
+		if len(points) < 3 or len(points) > len(self.free_walls):
+			return None
+
+		start = time.perf_counter()
+
+		points = [self.clamp(point) for point in points]
+		segment = self.next_segment
+		self.next_segment += 1
+
+		walls = [self.free_walls.pop() for point in points]
+		self.segment_walls[segment] = walls
+
+		for i in range(len(points)):
+			self.walls[walls[i]] = (points[i], points[(i + 1) % len(points)], floor_height, ceiling_height, segment, self.wall_texture, self.floor_texture)
+
+		#The Wall Arrays Have To Be Filled Before The Segment Can Be Added To The Sector Grid
+		for index in walls:
+			self.update_wall_arrays(index)
+
+		self.apply(walls, (segment,))
+		self.edit_times.append(time.perf_counter() - start)
+
+		return walls
+
+	def delete_segment(self, segment):
+		if segment not in self.segment_walls:
+			return None
+
+		start = time.perf_counter()
+		walls = self.segment_walls.pop(segment)
+
+		for index in walls:
+			self.walls[index] = self.placeholder
+			self.free_walls.append(index)
+
+		self.apply(walls, (segment,))
+		self.edit_times.append(time.perf_counter() - start)
+
+		return walls
+
+	#Moves Every Wall End At A Point, So Segments Sharing The Point Stay Joined
+	def move_point(self, point, new_point):
+		new_point = self.clamp(new_point)
+
+		start = time.perf_counter()
+		walls = []
+		segments = set()
+
+		for index in range(self.capacity):
+			wall = self.walls[index]
+
+			if wall[WALL_SEGMENT] != -1 and (wall[WALL_POINT_A] == point or wall[WALL_POINT_B] == point):
+				self.walls[index] = (new_point if wall[WALL_POINT_A] == point else wall[WALL_POINT_A], new_point if wall[WALL_POINT_B] == point else wall[WALL_POINT_B]) + wall[WALL_FLOOR_HEIGHT:]
+
+				walls.append(index)
+				segments.add(wall[WALL_SEGMENT])
+
+		if len(walls) == 0:
+			return None
+
+		self.apply(walls, segments)
+		self.edit_times.append(time.perf_counter() - start)
+
+		return walls
+
+	#Heights Don't Change Where Anything Is, So Only The Walls & The Sector Heights Are Touched
+	def change_heights(self, segment, floor_change, ceiling_change):
+		if segment not in self.segment_walls:
+			return None
+
+		start = time.perf_counter()
+		walls = self.segment_walls[segment]
+
+		for index in walls:
+			wall = self.walls[index]
+			self.walls[index] = wall[:WALL_FLOOR_HEIGHT] + (round(max(wall[WALL_FLOOR_HEIGHT] + floor_change, 0.0), 4), round(max(wall[WALL_CEILING_HEIGHT] + ceiling_change, 0.0), 4)) + wall[WALL_SEGMENT:]
+
+		sector = self.sectors[segment]
+		self.sector_floor_height[sector] = self.walls[walls[0]][WALL_FLOOR_HEIGHT]
+		self.sector_ceiling_height[sector] = self.walls[walls[0]][WALL_CEILING_HEIGHT]
+
+		self.pack_level()
+		self.edit_times.append(time.perf_counter() - start)
+
+		return walls
+
+	#The Segment Under A Point Or -1, Segments Inside Others Are Picked Over Them So Every Segment Can Still Be Reached
+	def find_segment(self, point):
+		cell_x, cell_y = numpy.floor((numpy.array(point) - self.origin) / self.cell_size).astype(numpy.int64)
+		found, found_area = -1, numpy.inf
+
+		if cell_x < 0 or cell_x >= self.size[0] or cell_y < 0 or cell_y >= self.size[1]:
+			return found
+
+		cell = cell_y * self.size[0] + cell_x
+
+		for sector in self.sector_cell_sectors[self.sector_start[cell]:self.sector_start[cell + 1]]:
+			segment = int(self.sector_segment[sector])
+			bounds = self.sector_bounds[segment]
+			area = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+
+			if area < found_area and is_inside_sector(self.sector_grid, sector, point[0], point[1]):
+				found, found_area = segment, area
+
+		return found
+
+	#The Closest Wall End Within A Distance, Or None
+	def find_point(self, position, distance):
+		used = self.wall_segment != -1
+		ends = self.wall_points[used].reshape(-1, 2)
+
+		if len(ends) == 0:
+			return None
+
+		squared = ((ends - position) ** 2).sum(axis=1)
+		closest = numpy.argmin(squared)
+
+		if squared[closest] > distance ** 2:
+			return None
+
+		return (float(ends[closest, 0]), float(ends[closest, 1]))
+
+
+#The Top-Down Map Next To The 3D View, Mouse & Keys Given To It Are Turned Into Edits
+#Left Click Places The Points Of A New Segment & Clicking The First Point Again Closes It, Right Click Or Escape Cancels It
+#Dragging A Point Moves It, Delete Removes The Segment Under The Mouse & Page Up Or Down Raise Or Lower Its Floor, Or Its Ceiling With Shift
+class EditorView:
+	def __init__(self, editor, surface):
+		self.editor = editor
+		self.surface = surface
+
+		#The Map Stays Still Over The Middle Of The Grids, So Points Don't Slide Away From The Mouse While The Player Moves
+		self.center = ((editor.origin[0] + editor.maximum[0]) / 2, (editor.origin[1] + editor.maximum[1]) / 2)
+
+		self.drawn_points = []
+		self.dragged_point = None
+		self.mouse = (0, 0)
+
+	def to_screen(self, point):
+		return (
+			self.surface.get_width() / 2 + (point[0] - self.center[0]) * MAP_SCALE,
+			self.surface.get_height() / 2 + (point[1] - self.center[1]) * MAP_SCALE)
+
+	def to_world(self, position):
+		return (
+			self.center[0] + (position[0] - self.surface.get_width() / 2) / MAP_SCALE,
+			self.center[1] + (position[1] - self.surface.get_height() / 2) / MAP_SCALE)
+
+	#Mouse Positions Come From The Whole Window, The Map Is Wherever Its Surface Sits Inside It
+	def to_map(self, position):
+		offset = self.surface.get_abs_offset()
+
+		return (position[0] - offset[0], position[1] - offset[1])
+
+	def hovered_segment(self):
+		return self.editor.find_segment(self.to_world(self.mouse))
+
+	#Gives Back The Walls An Event Changed, Or None When Nothing Changed
+	def handle(self, event):
+		if event.type == pygame.MOUSEMOTION:
+			self.mouse = self.to_map(event.pos)
+
+			if self.dragged_point is not None:
+				new_point = self.editor.clamp(self.to_world(self.mouse))
+
+				if new_point != self.dragged_point:
+					changed = self.editor.move_point(self.dragged_point, new_point)
+					self.dragged_point = new_point
+
+					return changed
+
+		elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+			self.mouse = self.to_map(event.pos)
+			point = self.to_world(self.mouse)
+
+			grabbed = self.editor.find_point(point, GRAB_DISTANCE / MAP_SCALE)
+
+			if len(self.drawn_points) == 0 and grabbed is not None:
+				self.dragged_point = grabbed
+
+			elif len(self.drawn_points) >= 3 and self.editor.clamp(point) == self.drawn_points[0]:
+				changed = self.editor.add_segment(self.drawn_points)
+				self.drawn_points = []
+
+				return changed
+
+			else:
+				self.drawn_points.append(self.editor.clamp(point))
+
+		elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+			self.dragged_point = None
+
+		elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+			self.drawn_points = []
+
+		elif event.type == pygame.KEYDOWN:
+			shift = event.mod & pygame.KMOD_SHIFT
+
+			if event.key == pygame.K_ESCAPE:
+				self.drawn_points = []
+
+			elif event.key in (pygame.K_DELETE, pygame.K_BACKSPACE):
+				return self.editor.delete_segment(self.hovered_segment())
+
+			elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+				change = HEIGHT_STEP if event.key == pygame.K_PAGEUP else -HEIGHT_STEP
+
+				return self.editor.change_heights(self.hovered_segment(), 0.0 if shift else change, change if shift else 0.0)
+
+		return None
+
+	def draw(self, player):
+		self.surface.fill((16, 16, 24))
+
+		hovered = self.hovered_segment()
+		editor = self.editor
+
+		for index in range(editor.capacity):
+			wall = editor.walls[index]
+
+			if wall[WALL_SEGMENT] != -1:
+				#Higher Floors Are Drawn Brighter, The Segment Under The Mouse Is Picked Out In Yellow
+				brightness = int(min(120 + wall[WALL_FLOOR_HEIGHT] * 200, 255))
+				color = (255, 220, 64) if wall[WALL_SEGMENT] == hovered else (brightness, brightness, brightness)
+
+				pygame.draw.line(self.surface, color, self.to_screen(wall[WALL_POINT_A]), self.to_screen(wall[WALL_POINT_B]))
+
+		for i in range(len(self.drawn_points)):
+			pygame.draw.circle(self.surface, (64, 200, 255), self.to_screen(self.drawn_points[i]), 2)
+
+			if i > 0:
+				pygame.draw.line(self.surface, (64, 200, 255), self.to_screen(self.drawn_points[i - 1]), self.to_screen(self.drawn_points[i]))
+
+		position = self.to_screen(player[PLAYER_POSITION])
+		direction = numpy.radians(player[PLAYER_ANGLE])
+
+		pygame.draw.circle(self.surface, (255, 64, 64), position, 3)
+		pygame.draw.line(self.surface, (255, 64, 64), position, (position[0] + numpy.cos(direction) * 8, position[1] + numpy.sin(direction) * 8))
@@ -0,0 +1,512 @@
+import os
+import queue
+import threading
+import time
+
+from collections import OrderedDict
+
+import numpy
+
+from segment_kernel import WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT, WALL_TEXTURE, WALL_FLOOR_TEXTURE
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#Every Chunk In The Manifest Is (Minimum X, Minimum Y, Maximum X, Maximum Y, Walls, Bytes), The Box Covers Every Wall Inside It
+MANIFEST_MINIMUM_X, MANIFEST_MINIMUM_Y, MANIFEST_MAXIMUM_X, MANIFEST_MAXIMUM_Y, MANIFEST_WALLS, MANIFEST_BYTES = 0, 1, 2, 3, 4, 5
+
+#Every Loaded Chunk Is (Walls, Wall Sectors, Wall Points, Wall Sides, Wall Lengths, Wall Cells, Sector Wall Start, Sector Bounds, Sector Heights, Sector Cells, Bytes)
+#The Walls Still Use The Segment Numbers Of The Whole World, Their Sectors Are Numbered From 0 Within The Chunk
+#The Cells Are The Chunk's Own Grids, Each Is (Cells, Cell Start, Items) With The Cells Numbered Like In The Resident Grids
+CHUNK_WALLS, CHUNK_WALL_SECTORS, CHUNK_WALL_POINTS, CHUNK_WALL_SIDE, CHUNK_WALL_LENGTH, CHUNK_WALL_CELLS, CHUNK_SECTOR_WALL_START, CHUNK_SECTOR_BOUNDS, CHUNK_SECTOR_HEIGHTS, CHUNK_SECTOR_CELLS, CHUNK_BYTES = 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10
+
+#A Segment Belongs To The Chunk Its Middle Is In, So Its Walls Always Stream In Together
+CHUNK_SIZE = 4.0
+
+#Chunks Closer Than This To The Player Are Loaded & Drawn
+LOAD_RADIUS = 8.0
+
+#How Much Memory The Loaded Chunks & Textures May Take, Chunks That Aren't Needed Are Let Go From The Least Recently Used Once It Is Passed
+MEMORY_BUDGET = 64 * 1024 * 1024
+
+#The Level Is A Tuple, So Compiling The Renderer Takes Longer The More Walls It Has, 256 Walls Already Take Minutes
+#It Is Always Padded To This Many Walls, As A Level Of Another Length Would Have To Be Compiled Again
+#Chunks That Don't Fit Are Left Out & Counted, So A Load Radius Too Large For It Shows Up Instead Of Geometry Just Going Missing
+RESIDENT_CAPACITY = 64
+
+#The Grids Of The Resident Level Use The Same Cells As The Whole Level Would
+GRID_CELL_SIZE = 2.0
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Streams The Chunks Around The Player From Disk On A Background Thread, The Renderer & Physics Only See The Resident Chunks
+#Every Chunk Comes With Its Own Grids, Built On The Loader Thread, The Resident Grids Cover The Whole World & Only Have Chunks Spliced In & Out
+#Walls & Sectors Sit In Fixed Slots Like In The Editor, Slots Without A Chunk Hold The Placeholder & Sector Numbers Stay Below The Capacity
+#Loading Is Timed On The Loader Thread, Splicing Chunks In & Out Is The Hitch The Main Thread Sees & Is Timed As Well
+class ChunkStreamer:
+	def __init__(self, directory, memory_budget=MEMORY_BUDGET, load_radius=LOAD_RADIUS, capacity=RESIDENT_CAPACITY):
+		self.directory = directory
+		self.memory_budget = memory_budget
+		self.load_radius = load_radius
+		self.capacity = capacity
+
+		with numpy.load(os.path.join(directory, "manifest.npz")) as manifest:
+			self.chunks = manifest["chunks"]
+			placeholder_texture = manifest["placeholder_texture"]
+			texture_count = int(manifest["texture_count"])
+
+		#Anything Past The Resident Walls Is This Wall, It Has No Length & Is Left Out Of The Grids So It Is Never Hit
+		#Like The Editor's Free Walls It Belongs To No Sector, So Lights Are Never Binned Around It
+		self.placeholder = ((0.0, 0.0), (0.0, 0.0), 0.0, 0.0, -1, placeholder_texture, placeholder_texture)
+
+		#The Grids Start Where build_wall_grid Would Start Them For The Whole World, So Every Chunk Can Find Its Own Cells
+		minimum = self.chunks[:, MANIFEST_MINIMUM_X:MANIFEST_MINIMUM_Y + 1].min(axis=0)
+		maximum = self.chunks[:, MANIFEST_MAXIMUM_X:MANIFEST_MAXIMUM_Y + 1].max(axis=0)
+		size = numpy.floor((maximum - minimum) / GRID_CELL_SIZE).astype(numpy.int64) + 1
+
+		self.grid_origin = (float(minimum[0]), float(minimum[1]))
+		self.grid_size = (int(size[0]), int(size[1]))
+
+		#Textures Are Shared By Every Chunk, Each Is Only Loaded Once By The Loader Thread & Then Kept
+		self.textures = [None] * texture_count
+		self.texture_bytes = 0
+
+		self.cache = OrderedDict()
+		self.cache_bytes = 0
+		self.pending = set()
+
+		self.requests = queue.Queue()
+		self.loaded = queue.Queue()
+
+		self.load_times = []
+		self.hitch_times = []
+		self.evictions = 0
+		self.skipped_chunks = 0
+		self.left_out_chunks = 0
+
+		#The Slots Of The Resident Level, Every Resident Chunk Keeps (Chunk, Wall Slots, Sector Slots) As It May Be Evicted Before It Is Taken Out
+		self.walls = [self.placeholder] * capacity
+		self.free_walls = list(range(capacity - 1, -1, -1))
+		self.free_sectors = list(range(capacity - 1, -1, -1))
+		self.resident = {}
+
+		#The Wall Grid, Laid Out Just Like The One build_wall_grid Makes
+		self.cell_start = numpy.zeros(size[0] * size[1] + 1, dtype=numpy.int64)
+		self.cell_walls = numpy.zeros(0, dtype=numpy.int64)
+		self.wall_points = numpy.zeros((capacity, 4), dtype=numpy.float64)
+		self.wall_segment = numpy.full(capacity, -1, dtype=numpy.int64)
+		self.wall_side = numpy.zeros(capacity, dtype=numpy.float64)
+		self.wall_length = numpy.zeros(capacity, dtype=numpy.float64)
+
+		#The Sector Grid, Every Sector Slot Is Its Own Segment, Empty Slots Have No Walls & Sit In No Cells
+		self.sector_start = numpy.zeros(size[0] * size[1] + 1, dtype=numpy.int64)
+		self.sector_cell_sectors = numpy.zeros(0, dtype=numpy.int64)
+		self.sector_wall_start = numpy.zeros(capacity + 1, dtype=numpy.int64)
+		self.sector_wall_points = numpy.zeros((0, 4), dtype=numpy.float64)
+		self.sector_segment = numpy.arange(capacity, dtype=numpy.int64)
+		self.sector_floor_height = numpy.zeros(capacity, dtype=numpy.float64)
+		self.sector_ceiling_height = numpy.zeros(capacity, dtype=numpy.float64)
+
+		#Lights Are Binned With These, Empty Slots Never Reach Any Light
+		self.sector_bounds = numpy.tile(numpy.array((numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)), (capacity, 1))
+
+		#The Wall Slots The Last Change Touched, So The Physics Only Has To Redo Those
+		self.changed_walls = []
+
+		self.available_chunks = None
+		self.resident_chunks = set()
+		self.pack_level()
+
+		self.loader = threading.Thread(target=self.load_chunks, daemon=True)
+		self.loader.start()
+
+	#Runs On The Loader Thread, Until It Is Given None
+	def load_chunks(self):
+		while True:
+			chunk = self.requests.get()
+
+			if chunk is None:
+				return
+
+			start = time.perf_counter()
+			loaded, texture_bytes = load_chunk(self.directory, chunk, self.textures, self.grid_origin, self.grid_size)
+
+			self.loaded.put((chunk, loaded, texture_bytes, time.perf_counter() - start))
+
+	#The Chunks Reaching Within The Load Radius Of A Position, From Closest To Furthest
+	def find_wanted(self, position):
+		closest_x = numpy.clip(position[0], self.chunks[:, MANIFEST_MINIMUM_X], self.chunks[:, MANIFEST_MAXIMUM_X])
+		closest_y = numpy.clip(position[1], self.chunks[:, MANIFEST_MINIMUM_Y], self.chunks[:, MANIFEST_MAXIMUM_Y])
+
+		distance = (closest_x - position[0]) ** 2 + (closest_y - position[1]) ** 2
+		wanted = numpy.nonzero(distance < self.load_radius ** 2)[0]
+
+		return wanted[numpy.argsort(distance[wanted], kind="stable")].tolist()
+
+	#Lets Go Of The Least Recently Used Chunks Until The Cache Fits The Budget, Chunks That Are Wanted Are Always Kept
+	#Textures Stay Loaded, So They Only Take Away From What Is Left For Chunks
+	def evict(self, wanted):
+		for chunk in list(self.cache):
+			if self.cache_bytes + self.texture_bytes <= self.memory_budget:
+				return
+
+			if chunk not in wanted:
+				self.cache_bytes -= self.cache.pop(chunk)[CHUNK_BYTES]
+				self.evictions += 1
+
+	#Asks For The Chunks Around The Position & Takes In Whatever The Loader Has Finished
+	#Gives Back If The Resident Level Changed, The Level, Grids & Sector Bounds Have Then Been Brought Up To Date
+	def update(self, position):
+		wanted = self.find_wanted(position)
+
+		for chunk in wanted:
+			if chunk in self.cache:
+				self.cache.move_to_end(chunk)
+
+			elif chunk not in self.pending:
+				self.pending.add(chunk)
+				self.requests.put(chunk)
+
+		while not self.loaded.empty():
+			chunk, loaded, texture_bytes, load_time = self.loaded.get()
+
+			self.pending.discard(chunk)
+			self.cache[chunk] = loaded
+			self.cache_bytes += loaded[CHUNK_BYTES]
+			self.texture_bytes += texture_bytes
+			self.load_times.append(load_time)
+
+		wanted_set = set(wanted)
+		self.evict(wanted_set)
+
+		#Only Chunks That Came In Or Went Away Change The Level, Chunks Left Out For Room Stay Left Out Until Then
+		available = [chunk for chunk in wanted if chunk in self.cache]
+
+		if self.available_chunks is not None and set(available) == self.available_chunks:
+			return False
+
+		self.available_chunks = set(available)
+
+		start = time.perf_counter()
+		self.build_resident_level(available)
+		self.hitch_times.append(time.perf_counter() - start)
+
+		return True
+
+	#Keeps The Closest Chunks That Fit, So Only The Furthest Are Left Out When They Don't All Fit
+	#Chunks No Longer Kept Are Taken Out First To Make Room, Only The Cells & Sectors Of Chunks That Came Or Went Are Touched
+	def build_resident_level(self, available):
+		kept = []
+		wall_count = 0
+
+		self.left_out_chunks = 0
+
+		for chunk in available:
+			chunk_walls = len(self.cache[chunk][CHUNK_WALLS])
+
+			if wall_count + chunk_walls > self.capacity:
+				self.left_out_chunks += 1
+				continue
+
+			kept.append(chunk)
+			wall_count += chunk_walls
+
+		self.skipped_chunks += self.left_out_chunks
+
+		#Walls & Sectors To Take Out Of & Put Into Every Cell They Touch
+		removed_walls, added_walls = {}, {}
+		removed_sectors, added_sectors = {}, {}
+		sector_points = {}
+
+		self.changed_walls = []
+
+		for chunk in [chunk for chunk in self.resident if chunk not in kept]:
+			loaded, wall_slots, sector_slots = self.resident.pop(chunk)
+
+			gather_cells(removed_walls, loaded[CHUNK_WALL_CELLS], wall_slots)
+			gather_cells(removed_sectors, loaded[CHUNK_SECTOR_CELLS], sector_slots)
+
+			for slot in wall_slots:
+				self.walls[slot] = self.placeholder
+
+			self.wall_points[wall_slots] = 0
+			self.wall_segment[wall_slots] = -1
+			self.wall_side[wall_slots] = 0
+			self.wall_length[wall_slots] = 0
+
+			for slot in sector_slots:
+				sector_points[slot] = self.sector_wall_points[:0]
+
+			self.sector_floor_height[sector_slots] = 0
+			self.sector_ceiling_height[sector_slots] = 0
+			self.sector_bounds[sector_slots] = (numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)
+
+			self.free_walls.extend(wall_slots.tolist())
+			self.free_sectors.extend(sector_slots.tolist())
+			self.changed_walls.extend(wall_slots.tolist())
+
+		for chunk in kept:
+			if chunk in self.resident:
+				continue
+
+			loaded = self.cache[chunk]
+
+			wall_slots = numpy.array([self.free_walls.pop() for wall in loaded[CHUNK_WALLS]], dtype=numpy.int64)
+			sector_slots = numpy.array([self.free_sectors.pop() for sector in loaded[CHUNK_SECTOR_HEIGHTS]], dtype=numpy.int64)
+			wall_sectors = sector_slots[loaded[CHUNK_WALL_SECTORS]]
+
+			gather_cells(added_walls, loaded[CHUNK_WALL_CELLS], wall_slots)
+			gather_cells(added_sectors, loaded[CHUNK_SECTOR_CELLS], sector_slots)
+
+			#The Walls Are Given The Segment Of Their Sector Slot
+			for i in range(len(wall_slots)):
+				wall = loaded[CHUNK_WALLS][i]
+				self.walls[wall_slots[i]] = wall[:WALL_SEGMENT] + (int(wall_sectors[i]),) + wall[WALL_SEGMENT + 1:]
+
+			self.wall_points[wall_slots] = loaded[CHUNK_WALL_POINTS]
+			self.wall_segment[wall_slots] = wall_sectors
+			self.wall_side[wall_slots] = loaded[CHUNK_WALL_SIDE]
+			self.wall_length[wall_slots] = loaded[CHUNK_WALL_LENGTH]
+
+			sector_wall_start = loaded[CHUNK_SECTOR_WALL_START]
+
+			for i in range(len(sector_slots)):
+				sector_points[sector_slots[i]] = loaded[CHUNK_WALL_POINTS][sector_wall_start[i]:sector_wall_start[i + 1]]
+
+			self.sector_floor_height[sector_slots] = loaded[CHUNK_SECTOR_HEIGHTS][:, 0]
+			self.sector_ceiling_height[sector_slots] = loaded[CHUNK_SECTOR_HEIGHTS][:, 1]
+			self.sector_bounds[sector_slots] = loaded[CHUNK_SECTOR_BOUNDS]
+
+			self.resident[chunk] = (loaded, wall_slots, sector_slots)
+			self.changed_walls.extend(wall_slots.tolist())
+
+		self.cell_walls = splice_cells(self.cell_start, self.cell_walls, removed_walls, added_walls)
+		self.sector_cell_sectors = splice_cells(self.sector_start, self.sector_cell_sectors, removed_sectors, added_sectors)
+
+		slots = sorted(sector_points)
+		self.sector_wall_points = splice_lists(self.sector_wall_start, self.sector_wall_points, slots, [sector_points[slot] for slot in slots])
+
+		self.resident_chunks = set(self.resident)
+		self.pack_level()
+
+	#The Level & Grids Are Tuples, So They Are Put Together Again, Which Only Gathers What Is Already There
+	def pack_level(self):
+		self.level = tuple(self.walls)
+
+		self.wall_grid = (
+			self.grid_origin, GRID_CELL_SIZE, self.grid_size, self.cell_start, self.cell_walls,
+			self.wall_points, self.wall_segment, self.wall_side, self.wall_length)
+
+		self.sector_grid = (
+			self.grid_origin, GRID_CELL_SIZE, self.grid_size, self.sector_start, self.sector_cell_sectors,
+			self.sector_wall_start, self.sector_wall_points, self.sector_segment, self.sector_floor_height, self.sector_ceiling_height)
+
+	#Stops The Loader Thread, Chunks Still Being Loaded Are Dropped
+	def close(self):
+		self.requests.put(None)
+		self.loader.join()
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Packs The Items Of Every Box Into The Grid Cells It Touches, Cells Are Numbered Like In A Grid Of The Given Origin & Size
+#Gives Back (Cells, Cell Start, Items) For Only The Cells That Hold Something, Items Are The Indices Of The Boxes
+def build_chunk_cells(boxes, grid_origin, grid_size, cell_size=GRID_CELL_SIZE):
+	minimum = numpy.floor((boxes[:, :2] - grid_origin) / cell_size).astype(numpy.int64)
+	maximum = numpy.floor((boxes[:, 2:] - grid_origin) / cell_size).astype(numpy.int64)
+
+	cells = {}
+
+	for index in range(len(boxes)):
+		for cell_x in range(minimum[index, 0], maximum[index, 0] + 1):
+			for cell_y in range(minimum[index, 1], maximum[index, 1] + 1):
+				cells.setdefault(cell_y * grid_size[0] + cell_x, []).append(index)
+
+	numbers = sorted(cells)
+
+	cell_start = numpy.zeros(len(numbers) + 1, dtype=numpy.int64)
+	cell_start[1:] = numpy.cumsum([len(cells[cell]) for cell in numbers])
+
+	return numpy.array(numbers, dtype=numpy.int64), cell_start, numpy.array([index for cell in numbers for index in cells[cell]], dtype=numpy.int64)
+
+
+#Adds The Items Of A Chunk's Cells To What Is Gathered For Every Cell, With The Items Turned Into The Slots They Were Given
+def gather_cells(gathered, chunk_cells, slots):
+	cells, cell_start, items = chunk_cells
+
+	for i in range(len(cells)):
+		gathered.setdefault(int(cells[i]), []).extend(slots[items[cell_start[i]:cell_start[i + 1]]].tolist())
+
+
+#Replaces Many Packed Lists At Once Like The Editor's splice, Only The Starts Are Added Up Again & Only Once For All Of Them
+#The Indices Have To Be Sorted, Gives Back The New Items, The Starts Are Changed In Place
+def splice_lists(start, items, indices, new_lists):
+	if len(indices) == 0:
+		return items
+
+	counts = numpy.diff(start)
+	pieces = []
+	previous = 0
+
+	for index, new_items in zip(indices, new_lists):
+		new_items = numpy.asarray(new_items, dtype=items.dtype).reshape((-1,) + items.shape[1:])
+
+		pieces.append(items[start[previous]:start[index]])
+		pieces.append(new_items)
+
+		counts[index] = len(new_items)
+		previous = index + 1
+
+	pieces.append(items[start[previous]:])
+	start[1:] = numpy.cumsum(counts)
+
+	return numpy.concatenate(pieces)
+
+
+#Takes The Removed Slots Out Of Every Cell & Puts The Added Ones In, Cells Stay In Order Like build_wall_grid Leaves Them
+def splice_cells(start, items, removed, added):
+	cells = sorted(set(removed) | set(added))
+	new_lists = []
+
+	for cell in cells:
+		current = items[start[cell]:start[cell + 1]]
+
+		if cell in removed:
+			current = current[~numpy.isin(current, removed[cell])]
+
+		new_lists.append(numpy.sort(numpy.concatenate((current, numpy.array(added.get(cell, ()), dtype=items.dtype)))))
+
+	return splice_lists(start, items, cells, new_lists)
+
+
+#Reads One Chunk Back Into Walls Of The Level & Builds Its Own Grids, So Only Splicing Them In Is Left For The Main Thread
+#Textures Come From The Pack, Those Not Loaded Yet Are Loaded Into The List Once & Shared From Then On
+#Gives Back (Chunk, Bytes Of The Textures That Had To Be Loaded For It)
+def load_chunk(directory, chunk, textures, grid_origin, grid_size, cell_size=GRID_CELL_SIZE):
+	with numpy.load(os.path.join(directory, "chunk_" + str(chunk) + ".npz")) as saved:
+		points = saved["points"]
+		heights = saved["heights"]
+		segments = saved["segments"]
+		wall_textures = saved["wall_textures"]
+		floor_textures = saved["floor_textures"]
+
+	texture_bytes = 0
+
+	for index in numpy.unique(numpy.concatenate((wall_textures, floor_textures))):
+		if textures[index] is None:
+			textures[index] = numpy.load(os.path.join(directory, "texture_" + str(index) + ".npy"))
+			texture_bytes += textures[index].nbytes
+
+	#The Walls Are Put In Order Of Segment, So The Walls Of Every Sector Sit Next To Each Other
+	order = numpy.argsort(segments, kind="stable")
+	points, heights, segments, wall_textures, floor_textures = points[order], heights[order], segments[order], wall_textures[order], floor_textures[order]
+
+	segment_numbers, wall_sectors = numpy.unique(segments, return_inverse=True)
+	wall_sectors = wall_sectors.ravel()
+
+	sector_wall_start = numpy.searchsorted(wall_sectors, numpy.arange(len(segment_numbers) + 1))
+	sector_counts = numpy.diff(sector_wall_start)
+
+	walls = tuple(
+		((float(points[i, 0]), float(points[i, 1])), (float(points[i, 2]), float(points[i, 3])), float(heights[i, 0]), float(heights[i, 1]), int(segments[i]), textures[wall_textures[i]], textures[floor_textures[i]])
+		for i in range(len(points)))
+
+	#Which Side Faces The Inside Depends On The Middle Of The Segment, A Segment Is Always Loaded Whole So Its Chunk Knows It
+	sums = numpy.add.reduceat(points, sector_wall_start[:-1])
+	center = numpy.stack((sums[:, 0] + sums[:, 2], sums[:, 1] + sums[:, 3]), axis=1) / (2 * sector_counts[:, None])
+	center = center[wall_sectors]
+
+	wall_side = numpy.sign((center[:, 0] - points[:, 0]) * (points[:, 1] - points[:, 3]) + (center[:, 1] - points[:, 1]) * (points[:, 2] - points[:, 0]))
+	wall_length = numpy.hypot(points[:, 2] - points[:, 0], points[:, 3] - points[:, 1])
+
+	wall_boxes = numpy.concatenate((numpy.minimum(points[:, :2], points[:, 2:]), numpy.maximum(points[:, :2], points[:, 2:])), axis=1)
+
+	sector_bounds = numpy.concatenate((
+		numpy.minimum.reduceat(wall_boxes[:, :2], sector_wall_start[:-1]),
+		numpy.maximum.reduceat(wall_boxes[:, 2:], sector_wall_start[:-1])), axis=1)
+
+	#A Sector Takes The Heights Of Its First Wall, Like In build_sector_grid
+	sector_heights = heights[sector_wall_start[:-1]]
+
+	wall_cells = build_chunk_cells(wall_boxes, grid_origin, grid_size, cell_size)
+	sector_cells = build_chunk_cells(sector_bounds, grid_origin, grid_size, cell_size)
+
+	arrays = (wall_sectors, points, wall_side, wall_length, sector_wall_start, sector_bounds, sector_heights) + wall_cells + sector_cells
+
+	return (walls, wall_sectors, points, wall_side, wall_length, wall_cells, sector_wall_start, sector_bounds, sector_heights, sector_cells, sum(array.nbytes for array in arrays)), texture_bytes
+
+
+#Splits A Level Into Chunks On Disk, Every Chunk Holds The Geometry Of The Segments Whose Middle Is Inside It
+#Textures Are Saved Once For The Whole Pack & Chunks Only Keep Their Indices, So Shared Textures Are Never Loaded Twice
+#The Manifest Keeps The Box & Size Of Every Chunk, So The Streamer Knows What To Load Without Opening Them
+def partition_level(level, directory, chunk_size=CHUNK_SIZE):
+	os.makedirs(directory, exist_ok=True)
+
+	points = numpy.array([(wall[WALL_POINT_A][0], wall[WALL_POINT_A][1], wall[WALL_POINT_B][0], wall[WALL_POINT_B][1]) for wall in level], dtype=numpy.float64)
+	segments = numpy.array([wall[WALL_SEGMENT] for wall in level], dtype=numpy.int64)
+
+	texture_index = {}
+	textures = []
+
+	for wall in level:
+		for texture in (wall[WALL_TEXTURE], wall[WALL_FLOOR_TEXTURE]):
+			if id(texture) not in texture_index:
+				texture_index[id(texture)] = len(textures)
+				textures.append(texture)
+
+	wall_textures = numpy.array([texture_index[id(wall[WALL_TEXTURE])] for wall in level], dtype=numpy.int64)
+	floor_textures = numpy.array([texture_index[id(wall[WALL_FLOOR_TEXTURE])] for wall in level], dtype=numpy.int64)
+
+	for i in range(len(textures)):
+		numpy.save(os.path.join(directory, "texture_" + str(i) + ".npy"), textures[i])
+
+	#The Middle Of A Segment Is The Middle Of Its Box, Found For Every Segment At Once
+	segment_numbers, segment_index = numpy.unique(segments, return_inverse=True)
+
+	segment_minimum = numpy.full((len(segment_numbers), 2), numpy.inf)
+	segment_maximum = numpy.full((len(segment_numbers), 2), -numpy.inf)
+
+	for corner in (points[:, 0:2], points[:, 2:4]):
+		numpy.minimum.at(segment_minimum, segment_index, corner)
+		numpy.maximum.at(segment_maximum, segment_index, corner)
+
+	cell = numpy.floor((segment_minimum + segment_maximum) / 2 / chunk_size).astype(numpy.int64)
+	cell_keys, wall_chunk = numpy.unique(cell[segment_index], axis=0, return_inverse=True)
+	wall_chunk = wall_chunk.ravel()
+
+	by_chunk = numpy.argsort(wall_chunk, kind="stable")
+	chunk_start = numpy.searchsorted(wall_chunk[by_chunk], numpy.arange(len(cell_keys) + 1))
+
+	chunks = numpy.zeros((len(cell_keys), 6), dtype=numpy.float64)
+
+	for chunk in range(len(cell_keys)):
+		wall_index = by_chunk[chunk_start[chunk]:chunk_start[chunk + 1]]
+		chunk_points = points[wall_index]
+
+		saved = {
+			"points": chunk_points,
+			"heights": numpy.array([(level[i][WALL_FLOOR_HEIGHT], level[i][WALL_CEILING_HEIGHT]) for i in wall_index], dtype=numpy.float64),
+			"segments": segments[wall_index],
+			"wall_textures": wall_textures[wall_index],
+			"floor_textures": floor_textures[wall_index]}
+
+		numpy.savez(os.path.join(directory, "chunk_" + str(chunk) + ".npz"), **saved)
+
+		chunks[chunk, MANIFEST_MINIMUM_X:MANIFEST_MINIMUM_Y + 1] = chunk_points.reshape(-1, 2).min(axis=0)
+		chunks[chunk, MANIFEST_MAXIMUM_X:MANIFEST_MAXIMUM_Y + 1] = chunk_points.reshape(-1, 2).max(axis=0)
+		chunks[chunk, MANIFEST_WALLS] = len(wall_index)
+		chunks[chunk, MANIFEST_BYTES] = sum(array.nbytes for array in saved.values())
+
+	#The Placeholder Wall Needs A Texture Of The Same Kind As Every Other, Or Numba Couldn't Type The Level As One
+	numpy.savez(os.path.join(directory, "manifest.npz"), chunks=chunks, chunk_size=numpy.array(chunk_size), texture_count=numpy.array(len(textures)), placeholder_texture=numpy.zeros_like(level[0][WALL_TEXTURE]))
+
+	return chunks
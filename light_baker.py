@@ -0,0 +1,352 @@
+import hashlib
+import os
+
+import numpy
+
+from segment_kernel import jit, WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT, SPRITE_POSITION
+from segment_kernel import LIGHTMAP_INVERSE_CELL_SIZE
+from sector_lookup import build_sector_grid, find_sectors, LOCATED_FLOOR_HEIGHT
+from point_lights import build_falloff, LIGHT_POSITION, LIGHT_RADIUS, LIGHT_COLOR
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#Every Row Of The Geometry Is (X1, Y1, X2, Y2, Floor Height, Ceiling Height, Segment), The Level Without Its Textures
+GEOMETRY_X1, GEOMETRY_Y1, GEOMETRY_X2, GEOMETRY_Y2, GEOMETRY_FLOOR_HEIGHT, GEOMETRY_CEILING_HEIGHT, GEOMETRY_SEGMENT = 0, 1, 2, 3, 4, 5, 6
+
+#Every Task Bakes One Segment & Is (Segment, Grid Origin, Grid Size, Geometry Of The Segment, Nearby Geometry, Nearby Lights, Light Floors, Falloff, Cell Size)
+TASK_SEGMENT, TASK_ORIGIN, TASK_SIZE, TASK_WALLS, TASK_NEARBY, TASK_LIGHTS, TASK_LIGHT_FLOORS, TASK_FALLOFF, TASK_CELL_SIZE = 0, 1, 2, 3, 4, 5, 6, 7, 8
+
+#Every Baked Segment Is (Floor Samples, Ceiling Samples, Wall Samples, Samples Per Wall)
+BAKED_FLOORS, BAKED_CEILINGS, BAKED_WALLS, BAKED_WALL_COUNTS = 0, 1, 2, 3
+
+#The Lightmaps Are Low Resolution, A Sample Covers This Much Of The Level Along Each Side
+LIGHTMAP_CELL_SIZE = .25
+
+#Steps Darken The Floor Next To Them Up To This Far Away, Steps This Tall Or Taller Darken It The Most
+OCCLUSION_RADIUS = .75
+OCCLUSION_STEP = .2
+OCCLUSION_STRENGTH = .5
+
+#How Far A Wall Sample Is Moved Off The Wall, So The Wall Itself Never Blocks Its Own Light
+WALL_NUDGE = 1e-3
+
+#The Order The Lightmaps Are Saved In, The Key Is Saved Alongside Them
+LIGHTMAP_NAMES = ("wall_start", "walls", "sector_origin", "sector_size", "sector_start", "floors", "ceilings", "sprites", "inverse_cell_size")
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Only The Shape Of The Level Is Needed To Bake It, Which Is Far Less To Send To Other Processes Than The Textures
+def extract_geometry(level):
+	return numpy.array([
+		(wall[WALL_POINT_A][0], wall[WALL_POINT_A][1], wall[WALL_POINT_B][0], wall[WALL_POINT_B][1], wall[WALL_FLOOR_HEIGHT], wall[WALL_CEILING_HEIGHT], wall[WALL_SEGMENT])
+		for wall in level], dtype=numpy.float64).reshape(-1, 7)
+
+
+#Every Light As A Row Of (X, Y, Radius Squared, Red, Green, Blue), The Same As The Light Data Of Binned Lights
+def extract_lights(lights):
+	return numpy.array([(light[LIGHT_POSITION][0], light[LIGHT_POSITION][1], light[LIGHT_RADIUS] ** 2) + tuple(light[LIGHT_COLOR]) for light in lights], dtype=numpy.float64).reshape(-1, 6)
+
+
+#Lightmaps Only Match The Level, Sprites & Lights They Were Baked From, So Those Are Hashed Into A Key Saved With Them
+def build_bake_key(geometry, sprite_list, static_lights, cell_size=LIGHTMAP_CELL_SIZE):
+	sprite_position = numpy.array([sprite[SPRITE_POSITION] for sprite in sprite_list], dtype=numpy.float64)
+	settings = numpy.array((cell_size, OCCLUSION_RADIUS, OCCLUSION_STEP, OCCLUSION_STRENGTH), dtype=numpy.float64)
+
+	key = hashlib.sha1()
+
+	for array in (geometry, sprite_position, extract_lights(static_lights), settings):
+		key.update(numpy.ascontiguousarray(array).tobytes())
+
+	return key.hexdigest()
+
+
+#The Distance From Every Point To Every Wall, Points Are Rows Of (X, Y) & Walls Are Rows Of The Geometry
+def get_wall_distances(points, walls):
+	edge = walls[None, :, 2:4] - walls[None, :, 0:2]
+	offset = points[:, None, :] - walls[None, :, 0:2]
+
+	along = numpy.clip((offset * edge).sum(axis=2) / numpy.maximum((edge * edge).sum(axis=2), 1e-12), 0, 1)
+
+	return numpy.hypot(offset[:, :, 0] - along * edge[:, :, 0], offset[:, :, 1] - along * edge[:, :, 1])
+
+
+#How Much Of The Ambient Light Reaches Every Point, Walls Of Steps That Rise Above The Height Darken The Points Close To Them
+#Only The Darkest Step Counts, So Doubled Walls & Steps Made Of Several Walls Aren't Counted More Than Once
+def get_ambient(points, height, step_heights, walls):
+	steps = step_heights > height + 1e-9
+
+	if not steps.any() or len(points) == 0:
+		return numpy.ones(len(points))
+
+	closeness = numpy.clip(1 - get_wall_distances(points, walls[steps]) / OCCLUSION_RADIUS, 0, 1) ** 2
+	tallness = numpy.clip((step_heights[steps] - height) / OCCLUSION_STEP, 0, 1)
+
+	return 1 - OCCLUSION_STRENGTH * (closeness * tallness[None, :]).max(axis=1)
+
+
+#Checks If The Way From A Point To A Light Crosses A Wall, Touching Its Ends Doesn't Count
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def is_crossed(point_x, point_y, light_x, light_y, x1, y1, x2, y2):
+	point_side = (x2 - x1) * (point_y - y1) - (y2 - y1) * (point_x - x1)
+	light_side = (x2 - x1) * (light_y - y1) - (y2 - y1) * (light_x - x1)
+
+	start_side = (light_x - point_x) * (y1 - point_y) - (light_y - point_y) * (x1 - point_x)
+	end_side = (light_x - point_x) * (y2 - point_y) - (light_y - point_y) * (x2 - point_x)
+
+	return point_side * light_side < 0 and start_side * end_side < 0
+
+
+#Adds The Light Of Static Lights Reaching Every Point Into Light, With The Same Falloff As Lights Gathered Every Frame
+#A Light Is Blocked By The Walls Of Any Step Rising Above Both The Floor Of The Point & The Floor The Light Stands On
+#Points Only Take Light From In Front Of Where They Face, A Facing Of (0, 0) Takes It From Everywhere
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def gather_static_light(points, floors, facing, walls, lights, light_floors, falloff, light):
+	for point in range(len(points)):
+		point_x, point_y = points[point, 0], points[point, 1]
+
+		for index in range(len(lights)):
+			dx = lights[index, 0] - point_x
+			dy = lights[index, 1] - point_y
+			reach = (dx * dx + dy * dy) / lights[index, 2]
+
+			if reach >= 1:
+				continue
+
+			if (facing[point, 0] != 0 or facing[point, 1] != 0) and dx * facing[point, 0] + dy * facing[point, 1] <= 0:
+				continue
+
+			lowest = max(floors[point], light_floors[index])
+			blocked = False
+
+			for wall in range(len(walls)):
+				if walls[wall, GEOMETRY_FLOOR_HEIGHT] > lowest:
+					if is_crossed(point_x, point_y, lights[index, 0], lights[index, 1], walls[wall, 0], walls[wall, 1], walls[wall, 2], walls[wall, 3]):
+						blocked = True
+						break
+
+			if not blocked:
+				strength = falloff[int(reach * (len(falloff) - 1))]
+
+				light[point, 0] += lights[index, 3] * strength
+				light[point, 1] += lights[index, 4] * strength
+				light[point, 2] += lights[index, 5] * strength
+
+
+#Gives Back The Light Of Static Lights Reaching Every Point, Points Facing Nowhere Take Light From Every Direction
+def get_static_light(points, floors, walls, lights, light_floors, falloff, facing=None):
+	light = numpy.zeros((len(points), 3))
+
+	if facing is None:
+		facing = numpy.zeros((len(points), 2))
+
+	gather_static_light(numpy.ascontiguousarray(points), floors, numpy.ascontiguousarray(facing), walls, lights, light_floors, falloff, light)
+
+	return light
+
+
+#Bakes The Floor & Ceiling Grids Of One Segment & The Strips Of Its Walls, Only Looking At What Is Close Enough To Matter
+#This Only Works With Arrays, So It Can Run In Another Process With Nothing But The Task Sent Over
+def bake_sector(task):
+	walls, nearby = task[TASK_WALLS], task[TASK_NEARBY]
+	lights, light_floors, falloff, cell_size = task[TASK_LIGHTS], task[TASK_LIGHT_FLOORS], task[TASK_FALLOFF], task[TASK_CELL_SIZE]
+	columns, rows = task[TASK_SIZE]
+
+	floor_height = walls[0, GEOMETRY_FLOOR_HEIGHT]
+	ceiling_height = walls[0, GEOMETRY_CEILING_HEIGHT]
+
+	#The Samples Sit In The Middle Of Their Cells & Go Column By Column, Like The Scan Line Looks Them Up
+	cell_x, cell_y = numpy.meshgrid(numpy.arange(columns), numpy.arange(rows), indexing="ij")
+	points = numpy.stack((cell_x.ravel(), cell_y.ravel()), axis=1) * cell_size + cell_size / 2 + task[TASK_ORIGIN]
+
+	#Floors & Ceilings Share The Light Of The Same Point, Only Their Ambient Differs
+	flat_light = get_static_light(points, numpy.full(len(points), floor_height), nearby, lights, light_floors, falloff)
+
+	floors = numpy.column_stack((flat_light, get_ambient(points, floor_height, nearby[:, GEOMETRY_FLOOR_HEIGHT], nearby)))
+	ceilings = numpy.column_stack((flat_light, get_ambient(points, ceiling_height, nearby[:, GEOMETRY_CEILING_HEIGHT], nearby)))
+
+	#Walls Are Seen From Outside The Segment They Belong To, So Their Samples Face Away From Its Middle
+	middle = walls[:, :4].reshape(-1, 2).mean(axis=0)
+
+	lengths = numpy.hypot(walls[:, 2] - walls[:, 0], walls[:, 3] - walls[:, 1])
+	counts = numpy.maximum(numpy.ceil(lengths / cell_size).astype(numpy.int64), 1)
+
+	wall = numpy.repeat(numpy.arange(len(walls)), counts)
+	along = numpy.minimum((numpy.arange(counts.sum()) - numpy.repeat(numpy.cumsum(counts) - counts, counts) + .5) * cell_size, lengths[wall]) / numpy.maximum(lengths[wall], 1e-12)
+
+	edge = walls[wall, 2:4] - walls[wall, 0:2]
+	wall_points = walls[wall, 0:2] + along[:, None] * edge
+
+	normal = numpy.stack((edge[:, 1], -edge[:, 0]), axis=1) / numpy.maximum(numpy.hypot(edge[:, 0], edge[:, 1]), 1e-12)[:, None]
+	normal *= numpy.where(((wall_points - middle) * normal).sum(axis=1) < 0, -1, 1)[:, None]
+
+	wall_light = get_static_light(wall_points + normal * WALL_NUDGE, numpy.full(len(wall_points), floor_height), nearby, lights, light_floors, falloff, normal)
+
+	return (floors, ceilings, wall_light, counts)
+
+
+#Splits The Level Into One Task Per Segment, Every Task Only Gets The Walls & Lights That Can Reach Its Segment
+#Gives Back The (Tasks, Wall Indices) With The Walls Of Every Task In The Level, Segments Without Any Walls Are Skipped
+#Free & Placeholder Walls Belong To No Segment, They Get No Task & Neither Shade Nor Block Anything
+def build_tasks(geometry, lights, light_floors, falloff, cell_size):
+	wall_bounds = numpy.column_stack((
+		numpy.minimum(geometry[:, 0], geometry[:, 2]), numpy.minimum(geometry[:, 1], geometry[:, 3]),
+		numpy.maximum(geometry[:, 0], geometry[:, 2]), numpy.maximum(geometry[:, 1], geometry[:, 3])))
+
+	#The Walls Of A Segment Are Found By Sorting Them Once, Instead Of Looking Through The Whole Level For Every Segment
+	by_segment = numpy.argsort(geometry[:, GEOMETRY_SEGMENT], kind="stable")
+	segment_start = numpy.searchsorted(geometry[by_segment, GEOMETRY_SEGMENT], numpy.arange(int(geometry[:, GEOMETRY_SEGMENT].max()) + 2 if len(geometry) > 0 else 1))
+
+	#Nearby Walls Are Found The Same Way, No Wall Reaching Into A Box Can Start Further Left Than Its Left Side Minus The Widest Wall
+	by_left = numpy.argsort(wall_bounds[:, 0], kind="stable")
+	sorted_left = wall_bounds[by_left, 0]
+	widest = (wall_bounds[:, 2] - wall_bounds[:, 0]).max(initial=0)
+
+	tasks = []
+	wall_indices = []
+
+	for segment in range(len(segment_start) - 1):
+		wall_index = by_segment[segment_start[segment]:segment_start[segment + 1]]
+
+		if len(wall_index) == 0:
+			continue
+
+		walls = geometry[wall_index]
+
+		points = walls[:, :4].reshape(-1, 2)
+		bounds = numpy.concatenate((points.min(axis=0), points.max(axis=0)))
+
+		#Lights Are Only Kept When Their Radius Reaches The Box Of The Segment, Just Like When They Are Binned
+		closest_x = numpy.clip(lights[:, 0], bounds[0], bounds[2])
+		closest_y = numpy.clip(lights[:, 1], bounds[1], bounds[3])
+		reached = (closest_x - lights[:, 0]) ** 2 + (closest_y - lights[:, 1]) ** 2 < lights[:, 2]
+
+		#Anything Between The Segment & Its Lights Can Block Them, So The Box Grows By The Largest Radius Too
+		reach = max(OCCLUSION_RADIUS, numpy.sqrt(lights[reached, 2]).max(initial=0))
+
+		candidates = by_left[numpy.searchsorted(sorted_left, bounds[0] - reach - widest):numpy.searchsorted(sorted_left, bounds[2] + reach, side="right")]
+		candidates = numpy.sort(candidates)
+
+		nearby = candidates[(wall_bounds[candidates, 2] >= bounds[0] - reach) & (wall_bounds[candidates, 1] <= bounds[3] + reach) & (wall_bounds[candidates, 3] >= bounds[1] - reach) & (geometry[candidates, GEOMETRY_SEGMENT] >= 0)]
+
+		size = tuple(numpy.maximum(numpy.ceil((bounds[2:] - bounds[:2]) / cell_size).astype(numpy.int64), 1))
+
+		tasks.append((segment, bounds[:2].copy(), size, walls, geometry[nearby], lights[reached], light_floors[reached], falloff, cell_size))
+		wall_indices.append(wall_index)
+
+	return tasks, wall_indices
+
+
+#Bakes The Lightmaps Of A Level, Its Walls, Floors & Ceilings Get The Light Of The Static Lights & The Shade Of Nearby Steps
+#Sprites Get The Light Where They Stand When Baked, So Only Sprites That Never Move Should Rely On It
+#Segments Are Baked On Their Own, With A Process Pool They Are Spread Over Every Core
+def bake_lightmaps(level, sprite_list, static_lights, pool=None, cell_size=LIGHTMAP_CELL_SIZE):
+	geometry = extract_geometry(level)
+	lights = extract_lights(static_lights)
+	falloff = build_falloff()
+
+	#Lights Stand On The Floor Of The Segment They Are In, Just Like Sprites
+	sector_grid = build_sector_grid(level, 2.0)
+
+	light_located = numpy.zeros((len(lights), 3))
+	find_sectors(sector_grid, numpy.ascontiguousarray(lights[:, :2]), light_located)
+
+	tasks, wall_indices = build_tasks(geometry, lights, light_located[:, LOCATED_FLOOR_HEIGHT], falloff, cell_size)
+
+	if pool is None:
+		baked = list(map(bake_sector, tasks))
+
+	else:
+		baked = list(pool.map(bake_sector, tasks, chunksize=max(len(tasks) // (4 * (os.cpu_count() or 1)), 1)))
+
+	#The Results Are Stitched Back Together In The Order Of The Level, Every Segment Keeps Its Own Range
+	segment_count = int(geometry[:, GEOMETRY_SEGMENT].max()) + 1 if len(geometry) > 0 else 0
+
+	sector_origin = numpy.zeros((segment_count, 2))
+	sector_size = numpy.ones((segment_count, 2), dtype=numpy.int64)
+	sector_counts = numpy.ones(segment_count, dtype=numpy.int64)
+
+	floors = [numpy.array(((0.0, 0.0, 0.0, 1.0),))] * segment_count
+	ceilings = [numpy.array(((0.0, 0.0, 0.0, 1.0),))] * segment_count
+
+	#A Level Of Nothing But Free Walls Has No Segments At All
+	if segment_count == 0:
+		floors = ceilings = [numpy.zeros((0, 4))]
+
+	#Walls Without A Segment Aren't Baked, So They Keep No Samples
+	wall_samples = [numpy.zeros((0, 3))] * len(geometry)
+	wall_counts = numpy.zeros(len(geometry), dtype=numpy.int64)
+
+	for i in range(len(tasks)):
+		segment = tasks[i][TASK_SEGMENT]
+		wall_index = wall_indices[i]
+
+		sector_origin[segment] = tasks[i][TASK_ORIGIN]
+		sector_size[segment] = tasks[i][TASK_SIZE]
+		sector_counts[segment] = len(baked[i][BAKED_FLOORS])
+
+		floors[segment] = baked[i][BAKED_FLOORS]
+		ceilings[segment] = baked[i][BAKED_CEILINGS]
+
+		wall_start = numpy.cumsum(baked[i][BAKED_WALL_COUNTS]) - baked[i][BAKED_WALL_COUNTS]
+
+		for j in range(len(wall_index)):
+			wall_counts[wall_index[j]] = baked[i][BAKED_WALL_COUNTS][j]
+			wall_samples[wall_index[j]] = baked[i][BAKED_WALLS][wall_start[j]:wall_start[j] + baked[i][BAKED_WALL_COUNTS][j]]
+
+	sector_start = numpy.zeros(segment_count + 1, dtype=numpy.int64)
+	sector_start[1:] = numpy.cumsum(sector_counts)
+
+	wall_start = numpy.zeros(len(geometry) + 1, dtype=numpy.int64)
+	wall_start[1:] = numpy.cumsum(wall_counts)
+
+	#Sprites Are Lit Straight From Where They Stand, From Every Direction
+	sprite_position = numpy.array([sprite[SPRITE_POSITION][:2] for sprite in sprite_list], dtype=numpy.float64).reshape(-1, 2)
+	sprite_located = numpy.zeros((len(sprite_position), 3))
+	find_sectors(sector_grid, sprite_position, sprite_located)
+
+	sprites = get_static_light(sprite_position, sprite_located[:, LOCATED_FLOOR_HEIGHT], geometry[geometry[:, GEOMETRY_SEGMENT] >= 0], lights, light_located[:, LOCATED_FLOOR_HEIGHT], falloff)
+
+	return (
+		wall_start, numpy.concatenate(wall_samples) if len(geometry) > 0 else numpy.zeros((0, 3)),
+		sector_origin, sector_size, sector_start, numpy.concatenate(floors), numpy.concatenate(ceilings),
+		sprites, 1 / cell_size)
+
+
+#Lightmaps Are Stored Compressed Next To The Level, Together With The Key Of What They Were Baked From
+def save_lightmaps(path, lightmaps, key):
+	numpy.savez_compressed(path, key=numpy.array(key), **{LIGHTMAP_NAMES[i]: numpy.asarray(lightmaps[i]) for i in range(len(LIGHTMAP_NAMES))})
+
+
+#Gives Back The Saved Lightmaps, Or None When There Are None Or They Were Baked From Something Else
+def load_lightmaps(path, key):
+	if not os.path.exists(path):
+		return None
+
+	with numpy.load(path) as saved:
+		if str(saved["key"]) != key:
+			return None
+
+		lightmaps = [saved[name] for name in LIGHTMAP_NAMES]
+
+	lightmaps[LIGHTMAP_INVERSE_CELL_SIZE] = float(lightmaps[LIGHTMAP_INVERSE_CELL_SIZE])
+
+	return tuple(lightmaps)
+
+
+#Loads The Lightmaps Of A Level, Baking & Saving Them First When They Are Missing Or Out Of Date
+def load_or_bake_lightmaps(path, level, sprite_list, static_lights, pool=None):
+	key = build_bake_key(extract_geometry(level), sprite_list, static_lights)
+	lightmaps = load_lightmaps(path, key)
+
+	if lightmaps is None:
+		lightmaps = bake_lightmaps(level, sprite_list, static_lights, pool)
+		save_lightmaps(path, lightmaps, key)
+
+	return lightmaps
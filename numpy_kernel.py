@@ -0,0 +1,384 @@
+import numpy
+
+from segment_kernel import *
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Turns Entities Into Sprites Of Their Kind Standing Where The Entities Are, So They Are Drawn Like Any Other Sprite
+def list_entity_sprites(entities):
+	if entities is None:
+		return []
+
+	positions, kinds, sprites = entities[ENTITIES_POSITION], entities[ENTITIES_KIND], entities[ENTITIES_SPRITES]
+
+	return [(tuple(positions[i]),) + sprites[kinds[i]][SPRITE_POSITION + 1:] for i in range(len(positions))]
+
+
+#Without A Sprite List Only The Entities Are Drawn
+def list_sprites(sprite_list):
+	if sprite_list is None:
+		return []
+
+	return list(sprite_list)
+
+
+#The Plain Python Version Of The Intersection Kernel, It Doesn't Branch So It Works On Whole Arrays
+intersect_rays_walls = getattr(intersect_ray_wall, "py_func", intersect_ray_wall)
+
+
+#Same As Mix, But For Whole Arrays Of Colors & Darkness Values
+#The Light Of Every Pixel Is Added To Its Darkness Like In Write Texel, Up To The Full Color
+def mix_array(colors, darkness, light):
+	mixed_r = (((colors >> 16) & 0xff) * numpy.minimum(darkness + light[:, 0], 1)).astype(numpy.int64) << 16
+	mixed_g = (((colors >> 8) & 0xff) * numpy.minimum(darkness + light[:, 1], 1)).astype(numpy.int64) << 8
+	mixed_b = ((colors & 0xff) * numpy.minimum(darkness + light[:, 2], 1)).astype(numpy.int64)
+
+	return mixed_r + mixed_g + mixed_b
+
+
+#Same As Gather Light, But For Whole Arrays Of Points, Each With The Segment It Belongs To
+def gather_light_array(lights, segments, point_x, point_y):
+	light = numpy.zeros((len(segments), 3))
+
+	if lights is None:
+		return light
+
+	light_data, sector_start, sector_lights, falloff = lights[LIGHTS_DATA], lights[LIGHTS_SECTOR_START], lights[LIGHTS_SECTOR_LIGHTS], lights[LIGHTS_FALLOFF]
+
+	#Which Sectors Every Light Was Binned Into
+	reached = numpy.zeros((len(light_data), len(sector_start) - 1), dtype=numpy.bool_)
+	reached[sector_lights, numpy.repeat(numpy.arange(len(sector_start) - 1), numpy.diff(sector_start))] = True
+
+	#Points Outside Every Sector Have A Segment Of -1, Which Would Index The Last Sector Instead Of Getting No Light Like In The Scan Line
+	binned = (segments >= 0) & (segments < len(sector_start) - 1)
+	binned_segments = numpy.where(binned, segments, 0)
+
+	for index in range(len(light_data)):
+		reach = ((point_x - light_data[index, 0]) ** 2 + (point_y - light_data[index, 1]) ** 2) / light_data[index, 2]
+		lit = binned & reached[index, binned_segments] & (reach < 1)
+
+		light[lit] += falloff[(reach[lit] * (len(falloff) - 1)).astype(numpy.int64)][:, None] * light_data[index, 3:]
+
+	return light
+
+
+#Same As Get Baked Wall, But For Whole Arrays Of Walls & How Far Along Them They Were Hit
+def gather_baked_wall_array(lightmaps, walls, texture_distance):
+	if lightmaps is None:
+		return numpy.zeros((len(walls), 3))
+
+	wall_start = lightmaps[LIGHTMAP_WALL_START]
+	sample = clamp_array((texture_distance * lightmaps[LIGHTMAP_INVERSE_CELL_SIZE]).astype(numpy.int64), 0, wall_start[walls + 1] - wall_start[walls] - 1)
+
+	return lightmaps[LIGHTMAP_WALLS][wall_start[walls] + sample]
+
+
+#Same As Get Baked Flat, But For Whole Arrays Of Points, Gives Back The (Light, Ambient) Of Every Point
+def gather_baked_flat_array(lightmaps, flat, segments, point_x, point_y):
+	if lightmaps is None:
+		return numpy.zeros((len(segments), 3)), numpy.ones(len(segments))
+
+	#Like The Lights, Points Outside Every Baked Sector Get No Light & Nothing Hides Them
+	baked = (segments >= 0) & (segments < len(lightmaps[LIGHTMAP_SECTOR_SIZE]))
+	segments = numpy.where(baked, segments, 0)
+
+	sector_origin, sector_size = lightmaps[LIGHTMAP_SECTOR_ORIGIN][segments], lightmaps[LIGHTMAP_SECTOR_SIZE][segments]
+
+	#The Scan Line Truncates Towards 0 Before Clamping, So The Same Is Done Here
+	column = clamp_array(numpy.trunc((point_x - sector_origin[:, 0]) * lightmaps[LIGHTMAP_INVERSE_CELL_SIZE]).astype(numpy.int64), 0, sector_size[:, 0] - 1)
+	row = clamp_array(numpy.trunc((point_y - sector_origin[:, 1]) * lightmaps[LIGHTMAP_INVERSE_CELL_SIZE]).astype(numpy.int64), 0, sector_size[:, 1] - 1)
+
+	samples = lightmaps[flat][lightmaps[LIGHTMAP_SECTOR_START][segments] + column * sector_size[:, 1] + row]
+
+	return numpy.where(baked[:, None], samples[:, :3], 0.0), numpy.where(baked, samples[:, 3], 1.0)
+
+
+#Same As Clamp In Order, But For Whole Arrays
+def clamp_array(value, minimum, maximum):
+	return numpy.maximum(minimum, numpy.minimum(value, maximum))
+
+
+#Puts Every Texture Used By The Level Into One Array, So A Single Gather Can Read From Any Of Them
+#The Wall & Floor Texture Of Every Wall Become An Index Into That Array
+def stack_textures(level):
+	textures = []
+	texture_index = {}
+
+	wall_texture = numpy.zeros(len(level), dtype=numpy.int64)
+	floor_texture = numpy.zeros(len(level), dtype=numpy.int64)
+
+	for index in range(len(level)):
+		for texture, texture_list in ((level[index][WALL_TEXTURE], wall_texture), (level[index][WALL_FLOOR_TEXTURE], floor_texture)):
+			if id(texture) not in texture_index:
+				texture_index[id(texture)] = len(textures)
+				textures.append(texture)
+
+			texture_list[index] = texture_index[id(texture)]
+
+	return numpy.stack(textures), wall_texture, floor_texture
+
+
+#Same As Sample Texture, Looks Up The Colors Of Whole Arrays Of Texels When There Is A Palette
+def resolve_palette(values, palette):
+	if palette is None:
+		return values
+
+	return palette[values]
+
+
+#Turns The Opaque Runs Of A Sprite Back Into A Mask Of Its Texture, So Whole Arrays Of Texels Can Be Checked At Once
+def post_mask(post_start, post_runs, shape):
+	mask = numpy.zeros(shape, dtype=numpy.bool_)
+
+	for column in range(shape[0]):
+		for run_top, run_bottom in post_runs[post_start[column]:post_start[column + 1]]:
+			mask[column, run_top:run_bottom] = True
+
+	return mask
+
+
+#Every Pixel Inside [Top, Bottom) Of Its Column, Ranges Are Truncated Like Numba Does With Range
+#Gives Back The Row Of Each Column & The Screen Row Of Every Pixel
+def span_pixels(top, bottom, rows):
+	mask = (rows[None, :] >= top.astype(numpy.int64)[:, None]) & (rows[None, :] < bottom.astype(numpy.int64)[:, None])
+
+	return numpy.nonzero(mask)
+
+
+#Renders The Same Frame As The Numba Scan Line, But With Whole Arrays Instead Of One Column At A Time
+#Every Ray Is Intersected With Every Wall At Once, Then The Hits Are Walked Front To Back For All Columns Together
+#Whole Arrays Are Built For Every Frame, So The Scratch Arrays Are Only Taken To Match The Numba Scan Line
+def scan_line(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch):
+	columns, height = buffer.shape
+	half_height = height / 2
+
+	wall_points = wall_grid[GRID_WALL_POINTS]
+	wall_segment = wall_grid[GRID_WALL_SEGMENT]
+
+	floor_heights = numpy.array([wall[WALL_FLOOR_HEIGHT] for wall in level], dtype=numpy.float64)
+	ceiling_heights = numpy.array([wall[WALL_CEILING_HEIGHT] for wall in level], dtype=numpy.float64)
+	textures, wall_texture, floor_texture = stack_textures(level)
+
+	position_x, position_y = player[PLAYER_POSITION]
+	offset = player[PLAYER_OFFSET]
+
+	#One Ray Per Column, The Same Angles As The Numba Renderer
+	angles = numpy.radians((player[PLAYER_ANGLE] - player[PLAYER_VISION] / 2) + player[PLAYER_VISION] / columns * numpy.arange(columns))
+	fish_eye = numpy.cos(angles - numpy.radians(player[PLAYER_ANGLE]))
+
+	direction_x = player[PLAYER_DISTANCE] * numpy.cos(angles)
+	direction_y = player[PLAYER_DISTANCE] * numpy.sin(angles)
+
+	ray_t, wall_u, hit = intersect_rays_walls(
+		position_x, position_y, direction_x[:, None], direction_y[:, None],
+		wall_points[None, :, 0], wall_points[None, :, 1], wall_points[None, :, 2], wall_points[None, :, 3])
+
+	distance = numpy.where(hit, ray_t * numpy.hypot(direction_x, direction_y)[:, None], numpy.inf)
+	texture_distance = wall_u * wall_grid[GRID_WALL_LENGTH][None, :]
+	entering = (direction_x[:, None] * (wall_points[None, :, 1] - wall_points[None, :, 3]) + direction_y[:, None] * (wall_points[None, :, 2] - wall_points[None, :, 0])) * wall_grid[GRID_WALL_SIDE][None, :] >= 0
+
+	#Sort The Hits Of Every Column From Closest To Furthest, Only Keeping As Many As The Busiest Column Has
+	#When Two Walls Are Hit At The Same Spot The Segment Is Left Before The Next One Is Entered
+	order = numpy.lexsort((entering, distance))[:, :max(hit.sum(axis=1).max(), 1)]
+
+	hit_valid = numpy.take_along_axis(hit, order, 1)
+	hit_distance = numpy.take_along_axis(distance, order, 1)
+	hit_texture_distance = numpy.take_along_axis(texture_distance, order, 1)
+	hit_entering = numpy.take_along_axis(entering, order, 1)
+	hit_wall = order
+
+	#The Numba Renderer Counts Hits Closer Than A Tiny Amount As The Same Spot, So Those Are Reordered Here Too
+	for k in range(order.shape[1] - 1):
+		swap = hit_valid[:, k + 1] & (numpy.abs(numpy.where(hit_valid[:, k + 1], hit_distance[:, k + 1], 0) - hit_distance[:, k]) <= 1e-9) & hit_entering[:, k] & ~hit_entering[:, k + 1]
+
+		for hit_array in (hit_distance, hit_texture_distance, hit_entering, hit_wall):
+			hit_array[swap, k], hit_array[swap, k + 1] = hit_array[swap, k + 1], hit_array[swap, k]
+
+	hit_segment = numpy.where(hit_valid, wall_segment[hit_wall], -1)
+
+	#Previous Wall Information For Comparision, One Value Per Column
+	previous_floor_height = numpy.zeros(columns)
+	previous_ceiling_height = numpy.zeros(columns)
+	previous_distance = numpy.zeros(columns)
+	previous_segment = numpy.full(columns, -1)
+	column_closed = numpy.zeros(columns, dtype=numpy.bool_)
+
+	#Everything Not Drawn Over By A Wall Or Floor Is Sky At The End
+	covered = numpy.zeros(buffer.shape, dtype=numpy.bool_)
+	rows = numpy.arange(height)
+
+	#Entities Come After The Sprite List, Then All Of Them Are Sorted From Furthest To Closest, So The Closest Is Drawn Last
+	sprite_list = list_sprites(sprite_list)
+	listed_count = len(sprite_list)
+	sprite_list = sprite_list + list_entity_sprites(entities)
+
+	sprite_distance = numpy.array([numpy.hypot(sprite[0][0] - position_x, sprite[0][1] - position_y) for sprite in sprite_list])
+	sprite_order = numpy.argsort(-sprite_distance, kind="stable")
+	ordered_sprites = [sprite_list[i] for i in sprite_order]
+	sprite_distance = sprite_distance[sprite_order]
+
+	sprite_height = half_height / sprite_distance
+	sprite_x = numpy.zeros(len(ordered_sprites))
+
+	for i in range(len(ordered_sprites)):
+		theta = numpy.degrees(numpy.arctan2(-(ordered_sprites[i][0][1] - position_y), ordered_sprites[i][0][0] - position_x))
+		y = -(player[PLAYER_ANGLE] % 360) + (player[PLAYER_VISION] / 2) - theta
+
+		if y < -180:
+			y += 360
+
+		sprite_x[i] = y * (columns / player[PLAYER_VISION])
+
+	#The (Top, Bottom) Of Every Sprite In Every Column, Only Set Once By The First Wall Behind It
+	sprite_top = numpy.zeros((len(ordered_sprites), columns))
+	sprite_bottom = numpy.zeros((len(ordered_sprites), columns))
+	sprite_set = numpy.zeros((len(ordered_sprites), columns), dtype=numpy.bool_)
+
+	for wall in range(order.shape[1]):
+		active = hit_valid[:, wall] & ~column_closed
+
+		if not active.any():
+			break
+
+		next_segment = hit_segment[:, wall + 1] if wall + 1 < order.shape[1] else numpy.full(columns, -1)
+
+		x = numpy.nonzero(active & (hit_distance[:, wall] != 0))[0]
+		index = hit_wall[x, wall]
+
+		#Fix The Distance To Remove The Fish-Eye Distortion
+		fixed_distance = hit_distance[x, wall] * fish_eye[x]
+		wall_height = half_height / fixed_distance
+		texture_distance = hit_texture_distance[x, wall] % 1
+		darkness = clamp_array(1 / fixed_distance, 0, 1)
+
+		#The Whole Wall Span Of A Column Shares The Light Where The Wall Is Hit
+		wall_light = gather_light_array(lights, wall_segment[index], position_x + hit_distance[x, wall] * numpy.cos(angles[x]), position_y + hit_distance[x, wall] * numpy.sin(angles[x]))
+		wall_light += gather_baked_wall_array(lightmaps, index, hit_texture_distance[x, wall])
+
+		floor_height = (
+			clamp_array((half_height + wall_height) - 2 * wall_height * (floor_heights[index] + offset), 0, height),
+			clamp_array((half_height + wall_height) - 2 * wall_height * offset, 0, height))
+
+		ceiling_height = (
+			clamp_array((half_height - wall_height) + 2 * wall_height * -offset, 0, height),
+			clamp_array((half_height - wall_height) + 2 * wall_height * (ceiling_heights[index] - offset), 0, height))
+
+		floor_length = previous_floor_height[x]
+		ceiling_length = previous_ceiling_height[x]
+
+		if wall > 0:
+			floor_height = tuple(clamp_array(value, ceiling_length, floor_length) for value in floor_height)
+			ceiling_height = tuple(clamp_array(value, ceiling_length, floor_length) for value in ceiling_height)
+
+			cull_wall = wall_segment[index] == previous_segment[x]
+
+		#The First Wall Of A Segment The Player Is Standing In Only Draws Its Floor & Ceiling, Across The Whole Screen
+		else:
+			cull_wall = wall_segment[index] != next_segment[x]
+			floor_length = numpy.where(cull_wall, height, floor_length)
+			ceiling_length = numpy.where(cull_wall, 0, ceiling_length)
+
+		#Here We Will Draw The Walls
+		for top, bottom in ((floor_height[0], floor_height[1]), (ceiling_height[0], ceiling_height[1])):
+			column, y = span_pixels(numpy.where(cull_wall, 0, top), numpy.where(cull_wall, 0, bottom), rows)
+
+			wall_bottom = (half_height + wall_height[column]) - 2 * wall_height[column] * offset
+			texture_y = ((y - wall_bottom) / wall_height[column] * 32).astype(numpy.int64) % textures.shape[2]
+
+			color_value = resolve_palette(textures[wall_texture[index[column]], (texture_distance[column] * 64).astype(numpy.int64), texture_y], palette)
+
+			buffer[x[column], y] = mix_array(color_value, darkness[column], wall_light[column])
+			covered[x[column], y] = True
+
+		#Otherwise We Render The Floor & Then The Ceiling, The Horizon Row Is Skipped As It Is Infinitely Far Away
+		for top, bottom, flat_height, side, flat in ((floor_height[0], floor_length, floor_heights[index] + offset, 1, LIGHTMAP_FLOORS), (ceiling_length, ceiling_height[1], ceiling_heights[index] - offset, -1, LIGHTMAP_CEILINGS)):
+			column, y = span_pixels(numpy.where(cull_wall, top, 0), numpy.where(cull_wall, bottom, 0), rows)
+
+			interpolation = 2 * y - height
+			column, y, interpolation = column[interpolation != 0], y[interpolation != 0], interpolation[interpolation != 0]
+
+			floor_distance = (height / interpolation) / fish_eye[x[column]]
+			flat_scale = floor_distance * side * (1 - flat_height[column] * 2)
+
+			translated_floor_point = (
+				position_x + flat_scale * numpy.cos(angles[x[column]]),
+				position_y + flat_scale * numpy.sin(angles[x[column]]))
+
+			color_value = resolve_palette(textures[floor_texture[index[column]], ((translated_floor_point[0] * 64) % 64).astype(numpy.int64), ((translated_floor_point[1] * 64) % 64).astype(numpy.int64)], palette)
+
+			floor_light = gather_light_array(lights, wall_segment[index[column]], translated_floor_point[0], translated_floor_point[1])
+			baked_light, ambient = gather_baked_flat_array(lightmaps, flat, wall_segment[index[column]], translated_floor_point[0], translated_floor_point[1])
+
+			buffer[x[column], y] = mix_array(color_value, clamp_array(ambient / (floor_distance * side), 0, 1), floor_light + baked_light)
+			covered[x[column], y] = True
+
+		#A Sprite Is Placed By The First Wall Behind It, Clamped To What Could Still Be Seen Before That Wall
+		for i in range(len(ordered_sprites)):
+			inside = (x > sprite_x[i] - sprite_height[i]) & (x < sprite_x[i] + sprite_height[i]) & (sprite_distance[i] < hit_distance[x, wall]) & ~sprite_set[i, x]
+
+			top = (half_height - sprite_height[i]) + 2 * sprite_height[i] * (-offset + ordered_sprites[i][0][2])
+			bottom = (half_height + sprite_height[i]) - 2 * sprite_height[i] * (offset + ordered_sprites[i][0][2])
+
+			if wall == 0:
+				sprite_top[i, x[inside]] = clamp_array(top, 0, height)
+				sprite_bottom[i, x[inside]] = clamp_array(bottom, 0, height)
+
+			else:
+				inside &= sprite_distance[i] > previous_distance[x]
+
+				sprite_top[i, x[inside]] = clamp_array(top, previous_ceiling_height[x[inside]], previous_floor_height[x[inside]])
+				sprite_bottom[i, x[inside]] = clamp_array(bottom, previous_ceiling_height[x[inside]], previous_floor_height[x[inside]])
+
+			sprite_set[i, x[inside]] = True
+
+		#These Are Stored For Later Comparisions
+		previous_floor_height[x] = floor_height[0]
+		previous_ceiling_height[x] = ceiling_height[1]
+
+		#Once The Ceiling Reaches The Floor The Column Is Closed, Nothing Further Away Can Be Seen
+		column_closed[x] = ceiling_height[1] >= floor_height[0]
+
+		previous_distance[active] = hit_distance[active, wall]
+		previous_segment[active] = hit_segment[active, wall]
+
+	#Whatever Is Still Open Sees Past Every Wall, The Sky Is Drawn Before The Sprites So They Stay On Top
+	sky_columns = sky[SKY_COLUMNS]
+	sky_column = sky_columns[(numpy.degrees(angles) % 360 / 360 * len(sky_columns)).astype(numpy.int64) % len(sky_columns)]
+
+	column, y = numpy.nonzero(~covered)
+	buffer[column, y] = sky[SKY_TEXTURE][sky_column[column], sky[SKY_ROWS][y]]
+
+	#We Will Draw The Sprites Here As Overlays
+	for i in range(len(ordered_sprites)):
+		column, y = span_pixels(numpy.where(sprite_set[i], sprite_top[i], 0), numpy.where(sprite_set[i], sprite_bottom[i], 0), rows)
+
+		sprite_texture = ordered_sprites[i][SPRITE_TEXTURE]
+
+		#The Numba Renderer Keeps The Height & Position Of A Sprite As Whole Numbers, So The Texture Is Mapped The Same Way Here
+		drawn_height = int(sprite_height[i])
+		drawn_x = int(sprite_x[i])
+
+		if drawn_height == 0:
+			continue
+
+		sprite_bottom_row = (half_height + drawn_height) - 2 * drawn_height * (offset + ordered_sprites[i][0][2])
+
+		texture_x = ((column - (drawn_x + drawn_height)) / drawn_height * 32).astype(numpy.int64) % sprite_texture.shape[0]
+		texture_y = ((y - sprite_bottom_row) / drawn_height * 32).astype(numpy.int64) % sprite_texture.shape[1]
+
+		opaque = post_mask(ordered_sprites[i][SPRITE_POST_START], ordered_sprites[i][SPRITE_POST_RUNS], sprite_texture.shape)[texture_x, texture_y]
+		color_value = resolve_palette(sprite_texture[texture_x[opaque], texture_y[opaque]], palette)
+
+		sprite_light = numpy.zeros((len(color_value), 3)) if lights is None or sprite_order[i] >= listed_count else numpy.tile(lights[LIGHTS_SPRITE][sprite_order[i]], (len(color_value), 1))
+
+		#Entities Gather The Lights Of Their Sector Where They Stand Instead
+		if sprite_order[i] >= listed_count and entities[ENTITIES_SECTOR][sprite_order[i] - listed_count] >= 0:
+			sprite_light = gather_light_array(lights, numpy.full(len(color_value), entities[ENTITIES_SECTOR][sprite_order[i] - listed_count]), numpy.full(len(color_value), ordered_sprites[i][0][0]), numpy.full(len(color_value), ordered_sprites[i][0][1]))
+
+		elif lightmaps is not None and sprite_order[i] < len(lightmaps[LIGHTMAP_SPRITES]):
+			sprite_light += lightmaps[LIGHTMAP_SPRITES][sprite_order[i]]
+
+		buffer[column[opaque], y[opaque]] = mix_array(color_value, clamp_array(1 / sprite_distance[i], 0, 1), sprite_light)
@@ -0,0 +1,191 @@
+import math
+
+import numpy
+import pygame
+
+from segment_kernel import *
+
+#Without Numba The Whole Frame Is Rendered With NumPy Instead, Which Is Slower But Needs Nothing Else
+if not NUMBA_AVAILABLE:
+	from numpy_kernel import scan_line
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+SIZE = (256, 256)
+
+#The Walls Of PE Have No Floors Or Ceilings Of Their Own, So They Are Made As Tall As The View
+PE_WALL_FLOOR_HEIGHT, PE_WALL_CEILING_HEIGHT = 1.0, 0.0
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#The Same Wall As In PE, A Line From The Start To The End Position Covered By A Surface
+class Wall:
+	__slots__ = ("start_position", "end_position", "surface")
+
+	def __init__(self, start_position, end_position, surface):
+		self.start_position = start_position
+		self.end_position = end_position
+		self.surface = surface
+
+
+#The Floor Of PE, A Rect On The Ground Covered By A Surface That Is Drawn Below The Walls & Mirrored Above Them As The Ceiling
+class Floor:
+	__slots__ = ("rect", "surface")
+
+	def __init__(self, rect, surface):
+		self.rect = rect
+		self.surface = surface
+
+
+#The Same Player As In PE, But Rendering Goes Through The Scan Line Of The Segment Engine
+#The Walls Are Only Compiled Into A Level Again When One Of Them Changes
+class Player:
+	__slots__ = ("position", "angle", "fov", "distance", "interval_angle", "compiled_key", "compiled_level", "floor_texture", "buffer")
+
+	def __init__(self, position, fov, distance):
+		self.position = position
+		self.angle = 0
+		self.fov = fov
+		self.distance = distance
+
+		#Here We Get The Interval To Ensure That Every X Coordinate In The Engine Will Be Accounted For
+		self.interval_angle = fov / SIZE[0]
+
+		self.compiled_key = None
+		self.compiled_level = None
+		self.floor_texture = None
+		self.buffer = None
+
+	def update(self):
+		keys = pygame.key.get_pressed()
+
+		radian = math.radians(self.angle)
+
+		self.position = (
+			self.position[0] + (math.cos(radian) * (keys[pygame.K_w] - keys[pygame.K_s]) * .1),
+			self.position[1] + (math.sin(radian) * (keys[pygame.K_w] - keys[pygame.K_s]) * .1)
+		)
+
+	def render(self, surface, walls, floor=None):
+		key = build_compile_key(walls, floor, surface.get_size())
+
+		if key != self.compiled_key:
+			self.compiled_key = key
+			self.compiled_level = compile_walls(walls, surface.get_size())
+			self.floor_texture = None if floor is None else convert_surface(floor.surface)
+
+		if self.buffer is None or self.buffer.shape != surface.get_size():
+			self.buffer = numpy.zeros(surface.get_size(), dtype=numpy.int32)
+
+		level, wall_grid, sky, sprite_list, scratch = self.compiled_level
+		player = ((self.position[0], self.position[1]), self.angle, self.fov, self.distance, 0.0)
+
+		scan_line(player, level, wall_grid, sky, NO_PALETTE, self.buffer, sprite_list, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch)
+
+		if floor is not None:
+			draw_floor(player, floor.rect, self.floor_texture, scratch, self.buffer)
+
+		pygame.surfarray.blit_array(surface, self.buffer)
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#A Surface Can Be Drawn On & The Id Of A Freed One Handed To Another, So Surfaces Are Told Apart By What They Hold
+def get_surface_key(surface):
+	return surface.get_size(), pygame.image.tobytes(surface, "ARGB")
+
+
+#The Walls & Floor Only Have To Be Compiled Again When Something Drawn With Them Or The Size Of The Screen Changes
+def build_compile_key(walls, floor, size):
+	wall_key = tuple((wall.start_position, wall.end_position, get_surface_key(wall.surface)) for wall in walls)
+	floor_key = None if floor is None else (tuple(floor.rect), get_surface_key(floor.surface))
+
+	return wall_key, floor_key, size
+
+
+#The Renderer Expects 64 x 64 Textures As Arrays, Surfaces Of Any Other Size Are Scaled To Fit
+def convert_surface(surface):
+	if surface.get_size() != (64, 64):
+		surface = pygame.transform.scale(surface, (64, 64))
+
+	return pygame.surfarray.array2d(surface).astype(numpy.int32)
+
+
+#Turns A List Of PE Walls Into The (Level, Wall Grid, Sky, Sprite List, Scratch) Used By The Scan Line
+#Every Wall Becomes Its Own Segment Holding The Wall Twice, Since A Ray Entering A Segment Always Expects To Leave It Again
+#The Background Is Black Like In PE, Which Has No Sprites Either
+#Without Any Walls PE Draws Nothing, The Grids Can't Be Built Without Walls So A Placeholder Nobody Can See Is Added Instead
+def compile_walls(walls, size):
+	textures = {}
+	level = []
+
+	for segment in range(len(walls)):
+		wall = walls[segment]
+
+		if id(wall.surface) not in textures:
+			textures[id(wall.surface)] = convert_surface(wall.surface)
+
+		start_position = (float(wall.start_position[0]), float(wall.start_position[1]))
+		end_position = (float(wall.end_position[0]), float(wall.end_position[1]))
+
+		level_wall = (start_position, end_position, PE_WALL_FLOOR_HEIGHT, PE_WALL_CEILING_HEIGHT, segment, textures[id(wall.surface)], textures[id(wall.surface)])
+		#A Lone Wall Is Both Where A Ray Enters Its Segment & Where It Leaves Again, So The Segment Is Closed Behind It
+		level.extend((level_wall, level_wall))
+
+	#Like The Free Walls Of The Editor, It Has No Length & Belongs To No Segment
+	if len(level) == 0:
+		placeholder_texture = numpy.zeros((64, 64), dtype=numpy.int32)
+		level.append(((0.0, 0.0), (0.0, 0.0), PE_WALL_FLOOR_HEIGHT, PE_WALL_CEILING_HEIGHT, -1, placeholder_texture, placeholder_texture))
+
+	level = tuple(level)
+
+	sky = build_sky(numpy.zeros((1, 1), dtype=numpy.int32), size[1], 1)
+
+	return level, build_wall_grid(level, 2.0), sky, NO_SPRITES, build_scratch(len(level), 0, size)
+
+
+#Draws The Floor The Way PE Did, Below The Closest Wall Of Every Column & Mirrored Above It, But Only Where The Ground Is Inside The Rect
+#The Scan Line Keeps The Walls Every Column Crossed, So The Closest Wall Doesn't Have To Be Found Again
+#Like In PE The Texture Repeats Every 2 Units From The Corner Of The Rect & Isn't Darkened By Distance
+def draw_floor(player, rect, texture, scratch, buffer):
+	width, height = buffer.shape
+	half_height = height / 2
+
+	crossing_start = scratch[SCRATCH_CROSSING_START][:width + 1]
+	columns = numpy.flatnonzero(crossing_start[1:] > crossing_start[:-1])
+
+	#Columns That Don't See A Wall Get No Floor In PE Either
+	if len(columns) == 0:
+		return
+
+	radians = numpy.radians((player[PLAYER_ANGLE] - player[PLAYER_VISION] / 2) + player[PLAYER_VISION] / width * columns)
+	fish_eye = numpy.cos(radians - numpy.radians(player[PLAYER_ANGLE]))
+	wall_height = half_height / (scratch[SCRATCH_CROSSINGS][crossing_start[columns], CROSSING_DISTANCE] * fish_eye)
+
+	#The Horizon Row Is Infinitely Far Away, So The Floor Starts Below It At The Latest
+	rows = numpy.arange(int(half_height) + 1, height)
+	below = rows[None, :] >= (half_height + wall_height)[:, None]
+
+	floor_distance = (height / (2 * rows[None, :] - height)) / fish_eye[:, None]
+	floor_x = player[PLAYER_POSITION][0] + floor_distance * numpy.cos(radians)[:, None]
+	floor_y = player[PLAYER_POSITION][1] + floor_distance * numpy.sin(radians)[:, None]
+
+	inside = below & (floor_x >= rect[0]) & (floor_x < rect[0] + rect[2]) & (floor_y >= rect[1]) & (floor_y < rect[1] + rect[3])
+	column, row = numpy.nonzero(inside)
+
+	texels = texture[
+		((floor_x[column, row] - rect[0]) * 32).astype(numpy.int64) % texture.shape[0],
+		((floor_y[column, row] - rect[1]) * 32).astype(numpy.int64) % texture.shape[1]]
+
+	buffer[columns[column], rows[row]] = texels
+	buffer[columns[column], height - rows[row]] = texels
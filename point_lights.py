@@ -0,0 +1,72 @@
+import numpy
+
+from segment_kernel import WALL_POINT_A, WALL_POINT_B, WALL_SEGMENT, SPRITE_POSITION
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#Every Light Is (Position, Radius, Color), The Color Is How Much Brighter It Makes Red, Green & Blue Right Next To It
+LIGHT_POSITION, LIGHT_RADIUS, LIGHT_COLOR = 0, 1, 2
+
+FALLOFF_SIZE = 256
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#The Falloff Table Goes From The Light (0) To The Edge Of Its Radius (1), Indexed By The Squared Distance Over The Squared Radius
+#It Is Roughly Inverse Square, But Fades To Exactly 0 At The Radius So Lights Can Be Cut Off There
+def build_falloff(size=FALLOFF_SIZE):
+	reach = numpy.linspace(0, 1, size)
+
+	return (1 - reach) ** 2 / (1 + 16 * reach)
+
+
+#The Bounding Box Of Every Segment As (Minimum X, Minimum Y, Maximum X, Maximum Y), Indexed By The Segment
+#Numbers That No Wall Uses Get An Empty Box, So No Light Is Ever Binned Into Them
+def build_sector_bounds(level):
+	sector_bounds = numpy.tile(numpy.array((numpy.inf, numpy.inf, -numpy.inf, -numpy.inf)), (max((wall[WALL_SEGMENT] for wall in level), default=-1) + 1, 1))
+
+	for wall in level:
+		#Free & Placeholder Walls Belong To No Sector, Counting Them Would Stretch The Last Sector Over Them
+		if wall[WALL_SEGMENT] < 0:
+			continue
+
+		for point in (wall[WALL_POINT_A], wall[WALL_POINT_B]):
+			bounds = sector_bounds[wall[WALL_SEGMENT]]
+			bounds[:2] = numpy.minimum(bounds[:2], point)
+			bounds[2:] = numpy.maximum(bounds[2:], point)
+
+	return sector_bounds
+
+
+#Bins The Lights Into Every Sector Their Radius Reaches, This Is Done Every Frame As Lights Can Move, Appear & Go Away
+#A Sector Then Only Looks At Its Own Lights, So The Cost Follows How Many Lights Are Nearby Instead Of How Many There Are
+#Gives Back The Lights For The Scan Line, Or None Without Any Lights So The Lighting Is Compiled Away
+def bin_lights(lights, sector_bounds, falloff, sprite_list):
+	if len(lights) == 0:
+		return None
+
+	light_data = numpy.array([(light[LIGHT_POSITION][0], light[LIGHT_POSITION][1], light[LIGHT_RADIUS] ** 2) + tuple(light[LIGHT_COLOR]) for light in lights], dtype=numpy.float64)
+
+	#The Closest Point Of Every Sector's Box To Every Light, A Sector Is Reached When That Point Is Inside The Radius
+	closest_x = numpy.clip(light_data[:, None, 0], sector_bounds[None, :, 0], sector_bounds[None, :, 2])
+	closest_y = numpy.clip(light_data[:, None, 1], sector_bounds[None, :, 1], sector_bounds[None, :, 3])
+
+	reached = (closest_x - light_data[:, None, 0]) ** 2 + (closest_y - light_data[:, None, 1]) ** 2 < light_data[:, None, 2]
+
+	sector, light = numpy.nonzero(reached.T)
+
+	sector_start = numpy.zeros(len(sector_bounds) + 1, dtype=numpy.int64)
+	sector_start[1:] = numpy.cumsum(numpy.bincount(sector, minlength=len(sector_bounds)))
+
+	#Sprites Are Lit By Every Light That Reaches Them, Straight From Their Position
+	sprite_position = numpy.array([sprite[SPRITE_POSITION][:2] for sprite in sprite_list], dtype=numpy.float64).reshape(-1, 2)
+	sprite_reach = ((sprite_position[:, None, :] - light_data[None, :, :2]) ** 2).sum(axis=2) / light_data[None, :, 2]
+	sprite_strength = numpy.where(sprite_reach < 1, falloff[(numpy.minimum(sprite_reach, 1) * (len(falloff) - 1)).astype(numpy.int64)], 0)
+
+	return (light_data, sector_start, light.astype(numpy.int64), falloff, sprite_strength @ light_data[:, 3:])
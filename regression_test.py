@@ -0,0 +1,302 @@
+import os
+import sys
+import time
+
+#There Is No Window, So Pygame Is Given The Dummy Driver Before It Starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy
+import pygame
+
+import segment_kernel
+import numpy_kernel
+
+from segment_kernel import jit, build_wall_grid, build_sky, build_gbuffer, build_scratch, scan_gbuffer, shade_gbuffer, NUMBA_AVAILABLE, NO_PALETTE, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, ENTITIES_SPRITES
+from demo_level import load_demo_level, DEMO_LIGHTS
+from texture_palette import palettize_level
+from point_lights import build_falloff, build_sector_bounds, bin_lights
+from light_baker import bake_lightmaps
+from sector_lookup import build_sector_grid
+from entities import EntityStore, FLAG_WANDERING
+
+#Numba Can Count Every Allocation It Makes, Which Is Only Turned On Here
+if NUMBA_AVAILABLE:
+	from numba.core.runtime import rtsys, _nrt_python
+
+	_nrt_python.memsys_enable_stats()
+
+#--------------------------------
+#Settings
+#--------------------------------
+
+
+REFERENCE_PATH = os.path.join("regression", "reference.npz")
+DIFF_DIRECTORY = "regression"
+
+#Every Pose Is (Position, Angle, Offset), They Cover Stepped Floors, Sprites, The Sky & Looking Up And Down
+POSES = (
+	((66.0, 69.0), 0.0, 0.0),
+	((66.0, 69.0), 200.0, 0.0),
+	((67.5, 66.0), 45.0, 0.1),
+	((65.0, 72.0), 300.0, 0.0),
+	((69.5, 70.5), 10.0, 0.05),
+	((65.3, 68.9), 83.5, 0.24),
+	((68.3, 69.5), 135.0, 0.2),
+)
+
+#The Lit Scenes Have A Crowd Of Armor Standing Around The Demo Level, Scattered The Same Way Every Time
+#A Few Of Them Land Outside The Level & Belong To No Sector, Which Has To Leave Them Unlit In Every Backend
+CROWD = 16
+
+#The Baked Scene Gets A Muzzle Flash On Top Of Its Lightmaps, Like The Game Adds When Firing
+FLASH_LIGHT = ((67.0, 69.0), 4.0, (.6, .48, .3))
+
+#A Pixel Only Counts As Changed When One Of Its Channels Moves By More Than This
+CHANNEL_TOLERANCE = 2
+
+REPEATS = 10
+
+#The G-Buffer & Atlas Of Every Scene Rendered By The Deferred Backend
+deferred_scenes = {}
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Renders Through The G-Buffer & The Shading Pass Instead, The G-Buffer Is Only Built Once For Every Scene
+def deferred_scan_line(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch):
+	entity_sprites = () if entities is None else entities[ENTITIES_SPRITES]
+	key = (id(level), id(entity_sprites), buffer.shape)
+
+	if key not in deferred_scenes:
+		deferred_scenes[key] = build_gbuffer(level, sprite_list, sky, palette, buffer.shape, entity_sprites)
+
+	gbuffer, atlas = deferred_scenes[key]
+
+	scan_gbuffer(player, level, wall_grid, sky, gbuffer, sprite_list, entities, lights, lightmaps, scratch)
+	shade_gbuffer(gbuffer, atlas, buffer, 0, buffer.shape[1])
+
+
+def render(scan_line, scene, pose):
+	level, wall_grid, sky, palette, sprite_list, entities, lights, lightmaps, scratch = scene
+	position, angle, offset = pose
+
+	buffer = numpy.zeros((256, 256), dtype=numpy.int32)
+	scan_line((position, angle, 75, 128, offset), level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch)
+
+	return buffer
+
+
+#Renders Every Pose A Few Times & Gives Back The Best Time Per Frame In Milliseconds
+def measure(scan_line, scene):
+	best = numpy.inf
+
+	for i in range(REPEATS):
+		start = time.perf_counter()
+
+		for pose in POSES:
+			render(scan_line, scene, pose)
+
+		best = min(best, time.perf_counter() - start)
+
+	return best * 1000 / len(POSES)
+
+
+#Takes The Same Arguments As The Scan Line But Does Nothing, So Only Passing Them In Is Counted
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def pass_arguments(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch):
+	pass
+
+
+#Counts How Many Times Numba Allocates While Rendering Every Pose, On Average Per Frame
+#Every Array Passed In From Python Gets Wrapped Once Per Call, Those Are Taken Away Again By Passing The Same Arguments To Nothing
+def count_allocations(scan_line, scene):
+	allocations = 0
+
+	for pose in POSES:
+		start = rtsys.get_allocation_stats().alloc
+		render(scan_line, scene, pose)
+		middle = rtsys.get_allocation_stats().alloc
+		render(pass_arguments, scene, pose)
+		end = rtsys.get_allocation_stats().alloc
+
+		allocations += (middle - start) - (end - middle)
+
+	return allocations / len(POSES)
+
+
+#The Largest Difference Of Any Channel, For Every Pixel
+def channel_difference(frame_1, frame_2):
+	difference = numpy.zeros(frame_1.shape, dtype=numpy.int64)
+
+	for shift in (16, 8, 0):
+		difference = numpy.maximum(difference, numpy.abs(((frame_1.astype(numpy.int64) >> shift) & 0xff) - ((frame_2.astype(numpy.int64) >> shift) & 0xff)))
+
+	return difference
+
+
+#Saves The Reference, The Rendered Frame & The Changed Pixels In Red Next To Each Other
+def save_diff_image(path, reference, rendered, changed):
+	diff = (reference >> 2) & 0x3f3f3f
+	diff[changed] = 0xff0000
+
+	surface = pygame.Surface((reference.shape[0] * 3, reference.shape[1]))
+	pygame.surfarray.blit_array(surface, numpy.concatenate((reference, rendered, diff)))
+	pygame.image.save(surface, path)
+
+
+#Records New Reference Frames & Timings, Only Once A Change To The Output Is Known To Be Correct
+def update_reference(scenes):
+	if not NUMBA_AVAILABLE:
+		print("The Reference Frames Come From The Numba Renderer, Which Isn't Installed")
+		return False
+
+	frames = {}
+
+	for scene_name, frames_name in REFERENCE_FRAMES.items():
+		if frames_name not in frames:
+			frames[frames_name] = numpy.array([render(segment_kernel.scan_line, scenes[scene_name], pose) for pose in POSES])
+
+	timings = {name + "_time": measure(scan_line, scenes[scene_name]) for name, scan_line, scene_name, allowed_change, allowed_slowdown in BACKENDS}
+
+	os.makedirs(os.path.dirname(REFERENCE_PATH), exist_ok=True)
+	numpy.savez_compressed(REFERENCE_PATH, **frames, **timings)
+
+	print("Saved " + str(len(frames) * len(POSES)) + " Reference Frames To " + REFERENCE_PATH)
+
+	for name in timings:
+		print(name + ": " + format(timings[name], ".2f") + " ms")
+
+	return True
+
+
+#Compares Every Backend Against The Reference Frames & The Baseline Timings, Gives Back If Everything Passed
+def check_reference(scenes):
+	if not os.path.exists(REFERENCE_PATH):
+		print("There Are No Reference Frames Yet, Run With --update To Record Them")
+		return False
+
+	reference = numpy.load(REFERENCE_PATH)
+	passed = True
+
+	for name, scan_line, scene_name, allowed_change, allowed_slowdown in BACKENDS:
+		scene = scenes[scene_name]
+		frames = reference[REFERENCE_FRAMES[scene_name]]
+
+		if name.startswith("numba") and not NUMBA_AVAILABLE:
+			print(name + ": Skipped, Numba Isn't Installed")
+			continue
+
+		for index in range(len(POSES)):
+			rendered = render(scan_line, scene, POSES[index])
+			changed = channel_difference(frames[index], rendered) > CHANNEL_TOLERANCE
+
+			if changed.sum() > allowed_change * changed.size:
+				path = os.path.join(DIFF_DIRECTORY, "diff_" + name + "_" + str(index) + ".png")
+				save_diff_image(path, frames[index], rendered, changed)
+
+				print(name + " Pose " + str(index) + ": FAILED, " + str(changed.sum()) + " Pixels Changed, See " + path)
+				passed = False
+
+			else:
+				print(name + " Pose " + str(index) + ": " + str(changed.sum()) + " Pixels Changed")
+
+		#The Numba Scan Line Has To Render Without Allocating Anything
+		if hasattr(scan_line, "py_func"):
+			allocations = count_allocations(scan_line, scene)
+
+			if allocations > 0:
+				print(name + ": FAILED, " + format(allocations, "g") + " Allocations Per Frame")
+				passed = False
+
+			else:
+				print(name + ": " + format(allocations, "g") + " Allocations Per Frame")
+
+		frame_time = measure(scan_line, scene)
+		baseline = float(reference[name + "_time"])
+
+		if frame_time > baseline * allowed_slowdown:
+			print(name + ": FAILED, " + format(frame_time, ".2f") + " ms Per Frame Against A Baseline Of " + format(baseline, ".2f") + " ms")
+			passed = False
+
+		else:
+			print(name + ": " + format(frame_time, ".2f") + " ms Per Frame, Baseline " + format(baseline, ".2f") + " ms")
+
+	return passed
+
+
+#--------------------------------
+#Backends
+#--------------------------------
+
+
+#Every Backend Is (Name, Scan Line, Scene, Fraction Of Pixels Allowed To Change, Allowed Slowdown Against The Baseline)
+#The NumPy Renderer Orders Hits Through Vertices Slightly Differently, So It Is Allowed A Few More Changed Pixels
+#The Demo Textures Have Fewer Colors Than A Palette Holds, So Palettized Frames Should Match Exactly As Well
+#The Lit Scene Has The Torches Binned Every Frame & The Baked Scene Has Them In Its Lightmaps, Both Have The Crowd
+BACKENDS = (
+	("numba", segment_kernel.scan_line, "colors", 0.0005, 1.5),
+	("numpy", numpy_kernel.scan_line, "colors", 0.005, 1.5),
+	("numba_palette", segment_kernel.scan_line, "palette", 0.0005, 1.5),
+	("numpy_palette", numpy_kernel.scan_line, "palette", 0.005, 1.5),
+	("numba_deferred", deferred_scan_line, "colors", 0.0005, 1.5),
+	("numba_lit", segment_kernel.scan_line, "lit", 0.0005, 1.5),
+	("numpy_lit", numpy_kernel.scan_line, "lit", 0.005, 1.5),
+	("numba_baked", segment_kernel.scan_line, "baked", 0.0005, 1.5),
+	("numpy_baked", numpy_kernel.scan_line, "baked", 0.005, 1.5),
+	("numba_deferred_baked", deferred_scan_line, "baked", 0.0005, 1.5),
+)
+
+#The Reference Frames Every Scene Is Checked Against, Palettized Frames Have To Match Those In Colors
+REFERENCE_FRAMES = {"colors": "frames", "palette": "frames", "lit": "lit_frames", "baked": "baked_frames"}
+
+
+#--------------------------------
+#Regression Test
+#--------------------------------
+
+
+#The Textures Are Loaded Relative To The Engine, Wherever This Is Run From
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+pygame.display.init()
+pygame.display.set_mode((256, 256))
+
+level, sprite_list, sky_texture = load_demo_level()
+wall_grid, sky = build_wall_grid(level, 2.0), build_sky(sky_texture, 256, 4)
+
+#The Same Scene With Its Textures Stored As Colors & As Palette Indices, Walls Keep Their Places So The Grid Is Shared
+palettized_level, palettized_sprite_list, palette = palettize_level(level, sprite_list)
+
+#The Crowd Never Moves, So It Is Binned For The Renderer Once
+crowd = EntityStore(sprite_list, CROWD)
+crowd.add(build_sector_grid(level, 2.0), numpy.random.default_rng(0).uniform((60, 64), (72, 76), (CROWD, 2)), 2, FLAG_WANDERING)
+entities = crowd.view()
+
+sector_bounds, falloff = build_sector_bounds(level), build_falloff()
+lightmaps = bake_lightmaps(level, sprite_list, DEMO_LIGHTS)
+
+#The Scratch Arrays Are Sized For The Demo Level & The Crowd & Shared By Every Scene, Like Between Frames Of The Game
+scratch = build_scratch(len(level), len(sprite_list) + CROWD, (256, 256))
+
+scenes = {
+	"colors": (level, wall_grid, sky, NO_PALETTE, sprite_list, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch),
+	"palette": (palettized_level, wall_grid, sky, palette, palettized_sprite_list, NO_ENTITIES, NO_LIGHTS, NO_LIGHTMAPS, scratch),
+	"lit": (level, wall_grid, sky, NO_PALETTE, sprite_list, entities, bin_lights(DEMO_LIGHTS, sector_bounds, falloff, sprite_list), NO_LIGHTMAPS, scratch),
+	"baked": (level, wall_grid, sky, NO_PALETTE, sprite_list, entities, bin_lights((FLASH_LIGHT,), sector_bounds, falloff, sprite_list), lightmaps, scratch),
+}
+
+#Compile First, So It Isn't Counted
+for name, scan_line, scene_name, allowed_change, allowed_slowdown in BACKENDS:
+	if not name.startswith("numba") or NUMBA_AVAILABLE:
+		render(scan_line, scenes[scene_name], POSES[0])
+
+if "--update" in sys.argv:
+	passed = update_reference(scenes)
+
+else:
+	passed = check_reference(scenes)
+
+sys.exit(0 if passed else 1)
@@ -0,0 +1,331 @@
+import os
+import selectors
+import socket
+import struct
+import sys
+import tempfile
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy
+
+from segment_kernel import build_wall_grid, build_sky, build_scratch, scan_line, NUMBA_AVAILABLE, NO_ENTITIES, NO_LIGHTMAPS
+from sector_lookup import build_sector_grid
+from point_lights import build_falloff, build_sector_bounds, bin_lights
+from game_logic import World
+
+#Without Numba The Whole Frame Is Rendered With NumPy Instead, Which Is Slower But Needs Nothing Else
+if not NUMBA_AVAILABLE:
+	from numpy_kernel import scan_line
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#Every Command Is (Kind, 4 Values), A Camera Command Is (X, Y, Angle, Offset) & An Input Command Is (Forward, Strafe, Angle, Unused)
+#A Camera Command Also Puts The Client's Player There, So Input Commands Carry On Walking From Wherever The Camera Was Last Put
+COMMAND_CAMERA, COMMAND_INPUT, COMMAND_SHUTDOWN = 0, 1, 2
+COMMAND = struct.Struct("<i4d")
+
+#Sent Once To Every Client That Connects, (Shared Memory Name, Ring Size, Width, Height)
+HELLO = struct.Struct("<64s3i")
+
+#The Answer To Every Command Is The Number Of The Frame It Rendered, Or -1 When Nothing Was Rendered
+FRAME = struct.Struct("<q")
+
+NO_FRAME = -1
+
+#A Frame Stays In The Ring Until This Many Newer Frames Have Been Rendered, Across Every Client
+RING_SIZE = 16
+
+SIZE = (256, 256)
+
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), "segment_engine.sock")
+
+#The Same Vision & Draw Distance As The Game
+VISION, DISTANCE = 75, 128
+
+#Where The Player Of Every New Client Starts
+START_POSITION = (66.0, 69.0)
+
+#A Client That Stops Reading Its Answers For This Long Is Dropped, So It Can't Hold Up Every Other Client
+SEND_TIMEOUT = 1.0
+
+#Whatever A Client Has Sent Is Read Up To This Many Commands At A Time
+RECEIVE_COMMANDS = 64
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#The Ring Starts With The Number Of The Frame Each Slot Holds (-1 While It Is Being Rendered), Followed By The Frames Themselves
+#The Frames Are Laid Out Like The Game's Buffer, So Clients Can Blit Them Straight Away
+def map_ring(memory, ring_size, size):
+	published = numpy.ndarray((ring_size,), dtype=numpy.int64, buffer=memory.buf)
+	frames = numpy.ndarray((ring_size,) + tuple(size), dtype=numpy.int32, buffer=memory.buf, offset=published.nbytes)
+
+	return published, frames
+
+
+#Attaching To Shared Memory Would Otherwise Have It Removed When The Client Exits, Only The Server Removes It
+#Before Python 3.13 It Can't Be Told Not To Track It, So Tracking Is Turned Off While It Is Attached
+def attach_shared_memory(name):
+	if sys.version_info >= (3, 13):
+		return shared_memory.SharedMemory(name, track=False)
+
+	register = resource_tracker.register
+	resource_tracker.register = lambda name, rtype: None
+
+	try:
+		return shared_memory.SharedMemory(name)
+
+	finally:
+		resource_tracker.register = register
+
+
+#Reads A Whole Message, Gives Back None When The Other Side Has Gone Away
+def receive(connection, size):
+	message = connection.recv(size, socket.MSG_WAITALL)
+
+	return message if len(message) == size else None
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Keeps A Level, Its Textures & The Compiled Scan Line Around, So Other Processes Can Have Frames Rendered Without Embedding The Game
+#Every Client Gets Its Own Player In Its Own World, Frames Go Into A Ring In Shared Memory That All Clients Read Without Copying
+#Commands Are Handled One At A Time, In The Order They Come In
+#Commands Can Arrive In Pieces, Each Client Keeps What It Has Sent So Far Until A Whole Command Is There
+#A Client That Goes Away Or Stops Reading Is Only Disconnected, Everyone Else Keeps Being Served
+class RenderServer:
+	def __init__(self, path, level, sprite_list, sky, palette, lights, size=SIZE, ring_size=RING_SIZE):
+		self.path = path
+		self.level = level
+		self.sprite_list = sprite_list
+		self.sky = sky
+		self.palette = palette
+		self.lights = lights
+
+		self.wall_grid = build_wall_grid(level, 2.0)
+		self.sector_grid = build_sector_grid(level, 2.0)
+		self.scratch = build_scratch(len(level), len(sprite_list), size)
+
+		self.memory = shared_memory.SharedMemory(create=True, size=ring_size * 8 + ring_size * size[0] * size[1] * 4)
+		self.published, self.frames = map_ring(self.memory, ring_size, size)
+		self.published[:] = NO_FRAME
+
+		#Compile First, So Not Even The First Client Waits For It, The Frame Is Thrown Away
+		self.frame_count = 0
+		self.render((START_POSITION, 0.0, VISION, DISTANCE, 0.0))
+
+		self.published[:] = NO_FRAME
+		self.frame_count = 0
+
+		#The Socket Only Shows Up Once Everything Is Ready
+		if os.path.exists(path):
+			os.unlink(path)
+
+		self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self.listener.bind(path)
+		self.listener.listen()
+
+		self.selector = selectors.DefaultSelector()
+		self.selector.register(self.listener, selectors.EVENT_READ)
+
+		self.running = True
+
+	#Renders Straight Into The Next Slot Of The Ring, Which Is Marked As Unreadable Until The Frame Is Done
+	def render(self, player):
+		frame = self.frame_count
+		slot = frame % len(self.frames)
+
+		self.published[slot] = NO_FRAME
+		scan_line(player, self.level, self.wall_grid, self.sky, self.palette, self.frames[slot], self.sprite_list, NO_ENTITIES, self.lights, NO_LIGHTMAPS, self.scratch)
+		self.published[slot] = frame
+
+		self.frame_count += 1
+
+		return frame
+
+	#A Client Gone Before It Was Greeted Is Just Dropped
+	def accept(self):
+		try:
+			connection, address = self.listener.accept()
+
+		except OSError:
+			return
+
+		#Reads Only Happen Once The Selector Has Data, So The Timeout Only Ever Holds Up Sending
+		connection.settimeout(SEND_TIMEOUT)
+
+		try:
+			connection.sendall(HELLO.pack(self.memory.name.encode(), len(self.frames), self.frames.shape[1], self.frames.shape[2]))
+
+		except OSError:
+			connection.close()
+			return
+
+		world = World(self.level, self.sector_grid)
+		self.selector.register(connection, selectors.EVENT_READ, (world, world.add_mover(START_POSITION), bytearray()))
+
+	def disconnect(self, connection):
+		self.selector.unregister(connection)
+		connection.close()
+
+	#Reads Whatever The Client Has Sent & Answers Every Whole Command In It, Anything Left Over Waits For The Rest
+	def handle(self, connection, world, mover, pending):
+		try:
+			data = connection.recv(COMMAND.size * RECEIVE_COMMANDS)
+
+		except OSError:
+			data = b""
+
+		if len(data) == 0:
+			self.disconnect(connection)
+			return
+
+		pending += data
+		commands = len(pending) // COMMAND.size
+
+		for command in range(commands):
+			answer = self.run(world, mover, *COMMAND.unpack_from(pending, command * COMMAND.size))
+
+			try:
+				connection.sendall(FRAME.pack(answer))
+
+			except OSError:
+				self.disconnect(connection)
+				return
+
+		del pending[:commands * COMMAND.size]
+
+	#Runs One Command, Gives Back The Number Of The Frame It Rendered Or -1 When Nothing Was Rendered
+	def run(self, world, mover, kind, a, b, c, d):
+		if kind == COMMAND_CAMERA:
+			mover.body.position = (a, b)
+			mover.body.velocity = (0, 0)
+
+			player = ((a, b), c, VISION, DISTANCE, d)
+
+		elif kind == COMMAND_INPUT:
+			world.tick(((a, b, c),))
+
+			player = ((float(mover.body.position[0]), float(mover.body.position[1])), c, VISION, DISTANCE, float(mover.final_bobbing))
+
+		else:
+			#Anything Else Is Answered Without A Frame, Shutting Down Stops The Server Once This Command Is Answered
+			if kind == COMMAND_SHUTDOWN:
+				self.running = False
+
+			return NO_FRAME
+
+		return self.render(player)
+
+	def serve(self):
+		while self.running:
+			for key, events in self.selector.select():
+				if key.fileobj is self.listener:
+					self.accept()
+
+				else:
+					self.handle(key.fileobj, *key.data)
+
+	#The Shared Memory Is Removed Here, Clients Still Attached Keep Their Mapping Until They Close
+	def close(self):
+		for key in list(self.selector.get_map().values()):
+			key.fileobj.close()
+
+		self.selector.close()
+		os.unlink(self.path)
+
+		self.published = self.frames = None
+		self.memory.close()
+		self.memory.unlink()
+
+
+#Connects To A Render Server, Frames Are Views Into The Shared Ring, So Nothing Is Copied & Nothing Has To Be Compiled Here
+#A Frame Is Only Kept Until The Ring Comes Around Again, Check It Is Still Current After Reading It Or Copy It Out
+class RenderClient:
+	def __init__(self, path=SOCKET_PATH):
+		self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self.connection.connect(path)
+
+		name, ring_size, width, height = HELLO.unpack(receive(self.connection, HELLO.size))
+
+		self.memory = attach_shared_memory(name.rstrip(b"\0").decode())
+		self.published, self.frames = map_ring(self.memory, ring_size, (width, height))
+
+	def command(self, kind, a=0.0, b=0.0, c=0.0, d=0.0):
+		self.connection.sendall(COMMAND.pack(kind, a, b, c, d))
+
+		return FRAME.unpack(receive(self.connection, FRAME.size))[0]
+
+	#Renders From Anywhere, The Offset Works Like The Player's, So It Is The Negative Height Of The Floor Stood On
+	def look(self, position, angle, offset=0.0):
+		return self.command(COMMAND_CAMERA, position[0], position[1], angle, offset)
+
+	#Runs One Tick Of The Client's Player With The Input, Then Renders From Where It Ended Up
+	def move(self, forward, strafe, angle):
+		return self.command(COMMAND_INPUT, forward, strafe, angle)
+
+	def frame(self, frame):
+		return self.frames[frame % len(self.frames)]
+
+	def is_current(self, frame):
+		return self.published[frame % len(self.frames)] == frame
+
+	def shutdown(self):
+		self.command(COMMAND_SHUTDOWN)
+
+	#Views From frame() Have To Be Let Go Of First
+	def close(self):
+		self.connection.close()
+
+		self.published = self.frames = None
+		self.memory.close()
+
+
+#Loads The Demo Level Like The Game Draws It, With Its Palette & Torches, Gives Back (Level, Sprite List, Sky, Palette, Lights)
+def load_demo_scene():
+	#There Is No Window, So Pygame Is Given The Dummy Driver Before It Starts
+	os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+	import pygame
+
+	from demo_level import load_demo_level, DEMO_LIGHTS
+	from texture_palette import palettize_level
+
+	#The Textures Are Loaded Relative To The Engine, Wherever This Is Run From
+	os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+	pygame.display.init()
+	pygame.display.set_mode(SIZE)
+
+	level, sprite_list, sky_texture = load_demo_level()
+	level, sprite_list, palette = palettize_level(level, sprite_list)
+
+	#The Torches Never Move, So They Are Only Binned Once
+	lights = bin_lights(DEMO_LIGHTS, build_sector_bounds(level), build_falloff(), sprite_list)
+
+	return level, sprite_list, build_sky(sky_texture, SIZE[1], 4), palette, lights
+
+
+#Serves The Demo Level Until A Client Shuts It Down
+def serve_demo(path=SOCKET_PATH, ring_size=RING_SIZE):
+	server = RenderServer(path, *load_demo_scene(), SIZE, ring_size)
+
+	try:
+		server.serve()
+
+	finally:
+		server.close()
+
+
+if __name__ == "__main__":
+	serve_demo(sys.argv[1] if len(sys.argv) > 1 else SOCKET_PATH)
@@ -0,0 +1,118 @@
+import numpy
+
+from segment_kernel import jit, WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+SECTOR_ORIGIN, SECTOR_CELL_SIZE, SECTOR_SIZE, SECTOR_CELL_START, SECTOR_CELL_SECTORS, SECTOR_WALL_START, SECTOR_WALL_POINTS, SECTOR_SEGMENT, SECTOR_FLOOR_HEIGHT, SECTOR_CEILING_HEIGHT = 0, 1, 2, 3, 4, 5, 6, 7, 8, 9
+
+LOCATED_SEGMENT, LOCATED_FLOOR_HEIGHT, LOCATED_CEILING_HEIGHT = 0, 1, 2
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Builds A Grid Where Every Cell Knows Which Segments Could Be Covering It, So Finding The Segment Under A Point
+#Only Needs A Few Point In Polygon Tests Instead Of Going Through The Whole Level
+def build_sector_grid(level, cell_size):
+	segments = sorted(set(wall[WALL_SEGMENT] for wall in level))
+
+	#The Walls Are Grouped By Segment, Each Segment's Walls Sit Next To Each Other
+	grouped_walls = {segment: [] for segment in segments}
+
+	for wall in level:
+		grouped_walls[wall[WALL_SEGMENT]].append(wall)
+
+	sector_walls = [grouped_walls[segment] for segment in segments]
+
+	wall_start = numpy.zeros(len(segments) + 1, dtype=numpy.int64)
+	wall_start[1:] = numpy.cumsum([len(walls) for walls in sector_walls])
+	wall_points = numpy.array([(wall[WALL_POINT_A][0], wall[WALL_POINT_A][1], wall[WALL_POINT_B][0], wall[WALL_POINT_B][1]) for walls in sector_walls for wall in walls], dtype=numpy.float64)
+
+	floor_height = numpy.array([walls[0][WALL_FLOOR_HEIGHT] for walls in sector_walls], dtype=numpy.float64)
+	ceiling_height = numpy.array([walls[0][WALL_CEILING_HEIGHT] for walls in sector_walls], dtype=numpy.float64)
+
+	origin = wall_points.reshape(-1, 2).min(axis=0)
+	size = numpy.floor((wall_points.reshape(-1, 2).max(axis=0) - origin) / cell_size).astype(numpy.int64) + 1
+
+	cells = [[] for i in range(size[0] * size[1])]
+
+	#Every Segment Is Added To All The Cells Its Bounding Box Touches
+	for sector in range(len(segments)):
+		points = wall_points[wall_start[sector]:wall_start[sector + 1]].reshape(-1, 2)
+
+		minimum = numpy.floor((points.min(axis=0) - origin) / cell_size).astype(numpy.int64)
+		maximum = numpy.floor((points.max(axis=0) - origin) / cell_size).astype(numpy.int64)
+
+		for cell_x in range(minimum[0], maximum[0] + 1):
+			for cell_y in range(minimum[1], maximum[1] + 1):
+				cells[cell_y * size[0] + cell_x].append(sector)
+
+	cell_start = numpy.zeros(len(cells) + 1, dtype=numpy.int64)
+	cell_start[1:] = numpy.cumsum([len(cell) for cell in cells])
+	cell_sectors = numpy.array([sector for cell in cells for sector in cell], dtype=numpy.int64)
+
+	return (
+		(origin[0], origin[1]), float(cell_size), (size[0], size[1]), cell_start, cell_sectors,
+		wall_start, wall_points, numpy.array(segments, dtype=numpy.int64), floor_height, ceiling_height)
+
+
+#Counts How Many Walls Of A Segment Are Crossed Going Right From The Point, An Odd Count Means The Point Is Inside
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def is_inside_sector(sector_grid, sector, x, y):
+	wall_start = sector_grid[SECTOR_WALL_START]
+	wall_points = sector_grid[SECTOR_WALL_POINTS]
+
+	inside = False
+
+	for wall in range(wall_start[sector], wall_start[sector + 1]):
+		x1, y1, x2, y2 = wall_points[wall, 0], wall_points[wall, 1], wall_points[wall, 2], wall_points[wall, 3]
+
+		if (y1 > y) != (y2 > y):
+			if x < x1 + (y - y1) / (y2 - y1) * (x2 - x1):
+				inside = not inside
+
+	return inside
+
+
+#Finds The Segment At A Point & Gives Back Its (Segment, Floor Height, Ceiling Height)
+#The Segment Is -1 With Both Heights At 0 When The Point Isn't Inside Any Segment
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def find_sector(sector_grid, x, y):
+	origin_x, origin_y = sector_grid[SECTOR_ORIGIN]
+	cell_size = sector_grid[SECTOR_CELL_SIZE]
+	columns, rows = sector_grid[SECTOR_SIZE]
+
+	cell_start = sector_grid[SECTOR_CELL_START]
+	cell_sectors = sector_grid[SECTOR_CELL_SECTORS]
+
+	cell_x = int(numpy.floor((x - origin_x) / cell_size))
+	cell_y = int(numpy.floor((y - origin_y) / cell_size))
+
+	if cell_x >= 0 and cell_x < columns and cell_y >= 0 and cell_y < rows:
+		cell = cell_y * columns + cell_x
+
+		for i in range(cell_start[cell], cell_start[cell + 1]):
+			sector = cell_sectors[i]
+
+			if is_inside_sector(sector_grid, sector, x, y):
+				return (sector_grid[SECTOR_SEGMENT][sector], sector_grid[SECTOR_FLOOR_HEIGHT][sector], sector_grid[SECTOR_CEILING_HEIGHT][sector])
+
+	return (-1, 0.0, 0.0)
+
+
+#Finds The Segments For Many Points At Once, Useful For Sprites & Anything Else That Moves
+#Every Row Of The Located Array Is Filled With The (Segment, Floor Height, Ceiling Height) Of The Same Row In Positions
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def find_sectors(sector_grid, positions, located):
+	for i in range(len(positions)):
+		segment, floor_height, ceiling_height = find_sector(sector_grid, positions[i, 0], positions[i, 1])
+
+		located[i, LOCATED_SEGMENT] = segment
+		located[i, LOCATED_FLOOR_HEIGHT] = floor_height
+		located[i, LOCATED_CEILING_HEIGHT] = ceiling_height
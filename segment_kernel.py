@@ -0,0 +1,1496 @@
+import numpy
+
+#Numba Is Optional, Without It These Functions Run As Plain Python & The Game Switches To The NumPy Renderer
+try:
+	from numba import jit
+	NUMBA_AVAILABLE = True
+
+except ImportError:
+	NUMBA_AVAILABLE = False
+
+	def jit(*args, **kwargs):
+		return lambda function: function
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+PLAYER_POSITION, PLAYER_ANGLE, PLAYER_VISION, PLAYER_DISTANCE, PLAYER_OFFSET = 0, 1, 2, 3, 4
+
+WALL_POINT_A, WALL_POINT_B, WALL_FLOOR_HEIGHT, WALL_CEILING_HEIGHT, WALL_SEGMENT, WALL_TEXTURE, WALL_FLOOR_TEXTURE = 0, 1, 2, 3, 4, 5, 6
+
+INTERSECTED_DISTANCE, INTERSECTED_TEXTURE_DISTANCE, INTERSECTED_WALL, INTERSECTED_NEXT_SEGMENT = 0, 1, 2, 3
+
+GRID_ORIGIN, GRID_CELL_SIZE, GRID_SIZE, GRID_CELL_START, GRID_CELL_WALLS, GRID_WALL_POINTS, GRID_WALL_SEGMENT, GRID_WALL_SIDE, GRID_WALL_LENGTH = 0, 1, 2, 3, 4, 5, 6, 7, 8
+
+RAY_CELL_X, RAY_CELL_Y, RAY_NEXT_X, RAY_NEXT_Y, RAY_DELTA_X, RAY_DELTA_Y, RAY_END, RAY_LENGTH, RAY_LIMIT, RAY_PENDING, RAY_LAST_SEGMENT, RAY_DONE = 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11
+
+PENDING_DISTANCE, PENDING_TEXTURE_DISTANCE, PENDING_WALL, PENDING_SEGMENT, PENDING_EXITING = 0, 1, 2, 3, 4
+
+SKY_TEXTURE, SKY_COLUMNS, SKY_ROWS = 0, 1, 2
+
+SPRITE_POSITION, SPRITE_TEXTURE, SPRITE_POST_START, SPRITE_POST_RUNS = 0, 1, 2, 3
+
+GBUFFER_SURFACE, GBUFFER_U, GBUFFER_V, GBUFFER_DEPTH, GBUFFER_SURFACES, GBUFFER_LIGHT = 0, 1, 2, 3, 4, 5
+
+ATLAS_TEXELS, ATLAS_OFFSET, ATLAS_WIDTH, ATLAS_HEIGHT = 0, 1, 2, 3
+
+#Lights Are Binned Into Sectors Every Frame, Every Row Of The Light Data Is (X, Y, Radius Squared, Red, Green, Blue)
+LIGHTS_DATA, LIGHTS_SECTOR_START, LIGHTS_SECTOR_LIGHTS, LIGHTS_FALLOFF, LIGHTS_SPRITE = 0, 1, 2, 3, 4
+
+#Baked Lightmaps Hold The Light Of Static Lights & How Much Nearby Steps Hide The Floors & Ceilings, Worked Out Once By The Light Baker
+#Walls Are Strips Of Samples Along Their Length, Floors & Ceilings Are Grids Over The Box Of Every Segment & Sprites Get One Sample Each
+#Every Wall & Sprite Sample Is (Red, Green, Blue), Every Floor & Ceiling Sample Is (Red, Green, Blue, Ambient) With The Ambient Going From 0 To 1
+LIGHTMAP_WALL_START, LIGHTMAP_WALLS, LIGHTMAP_SECTOR_ORIGIN, LIGHTMAP_SECTOR_SIZE, LIGHTMAP_SECTOR_START, LIGHTMAP_FLOORS, LIGHTMAP_CEILINGS, LIGHTMAP_SPRITES, LIGHTMAP_INVERSE_CELL_SIZE = 0, 1, 2, 3, 4, 5, 6, 7, 8
+
+#Textures Normally Hold Their Colors Directly, Without A Palette Numba Compiles The Look Up Away
+NO_PALETTE = None
+
+#Without Any Lights The Scan Line Only Darkens By Distance
+NO_LIGHTS = None
+
+#The Unpacked Lights Used Without Any Lights, Numba Keeps Them As Constants So Nothing Is Allocated
+UNLIT_SECTORS = (numpy.zeros((0, 6), dtype=numpy.float64), numpy.zeros(1, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64), numpy.zeros(1, dtype=numpy.float64))
+
+#Without Lightmaps Nothing Is Baked In & Only The Lights Given Every Frame Are Added
+NO_LIGHTMAPS = None
+
+#The Lightmaps Used Without Any, Like The Unlit Sectors These Are Empty Constants So Every Look Up Is Compiled Away
+UNBAKED = (
+	numpy.zeros(1, dtype=numpy.int64), numpy.zeros((0, 3), dtype=numpy.float64),
+	numpy.zeros((0, 2), dtype=numpy.float64), numpy.zeros((0, 2), dtype=numpy.int64), numpy.zeros(1, dtype=numpy.int64),
+	numpy.zeros((0, 4), dtype=numpy.float64), numpy.zeros((0, 4), dtype=numpy.float64), numpy.zeros((0, 3), dtype=numpy.float64), 1.0)
+
+#Entities Are Sprites That Move, Kept As One Row Per Entity Instead Of A Tuple Each, Which Would Have To Be Compiled Again As They Come & Go
+#Every Entity Is Drawn With The Sprite Of Its Kind, The Sector Is The Segment It Stands In & Decides Which Lights Reach It
+#The Bins Sort The Entities Into The Cells Of A Grid, So Only Cells The Player Can See Are Looked At
+ENTITIES_POSITION, ENTITIES_SECTOR, ENTITIES_KIND, ENTITIES_SPRITES, ENTITIES_BINS = 0, 1, 2, 3, 4
+
+#The Bins Are Laid Out Like The Wall Grid, Every Cell Lists The Entities Inside It
+BINS_ORIGIN, BINS_CELL_SIZE, BINS_SIZE, BINS_CELL_START, BINS_CELL_ENTITIES = 0, 1, 2, 3, 4
+
+#Without Entities Only The Sprite List Is Drawn & Numba Compiles Everything About Entities Away
+NO_ENTITIES = None
+
+#Without A Sprite List Only Entities Are Drawn, Numba Compiles The Listed Sprites Away The Same Way
+NO_SPRITES = None
+
+#The (Texture, Post Start, Post Runs) Given Back Without Any Sprites At All, Never Drawn As Nothing Can Be Seen But Numba Still Needs Its Types
+UNSEEN_POSTS = (numpy.zeros((1, 1), dtype=numpy.int32), numpy.zeros(2, dtype=numpy.int64), numpy.zeros((0, 2), dtype=numpy.int64))
+
+#Everything The Scan Line Works With Between Columns Lives In Scratch Arrays, Built Once & Reused By Every Frame
+SCRATCH_RAY, SCRATCH_PENDING, SCRATCH_VISITED, SCRATCH_WALL_COLUMNS, SCRATCH_SKY_SPANS, SCRATCH_SPRITE_ORDER, SCRATCH_SPRITE_DISTANCE, SCRATCH_SPRITE_POSITION, SCRATCH_SPRITE_SPANS, SCRATCH_OVERFLOW, SCRATCH_ROWS, SCRATCH_SPRITE_SCREEN, SCRATCH_CROSSINGS, SCRATCH_CROSSING_START, SCRATCH_DEPTH_TILES = 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14
+
+SPRITE_SPAN_TOP, SPRITE_SPAN_BOTTOM, SPRITE_SPAN_HEIGHT, SPRITE_SPAN_X, SPRITE_SPAN_DARKNESS = 0, 1, 2, 3, 4
+
+#Where A Kept Sprite Lands On Screen Is The Same For Every Column, So It Is Worked Out Once Per Frame
+SCREEN_X, SCREEN_HEIGHT, SCREEN_DARKNESS, SCREEN_DISTANCE = 0, 1, 2, 3
+
+#Every Wall A Column Crosses Is Kept As (Distance, Previous Distance, Window Top, Window Bottom), The Window Is What Could Still Be Seen Before The Wall
+#A Sprite Between The Previous Distance & The Distance Is Drawn Within The Window, The Furthest Crossing Of A Column Is As Far As It Can See
+CROSSING_DISTANCE, CROSSING_PREVIOUS_DISTANCE, CROSSING_WINDOW_TOP, CROSSING_WINDOW_BOTTOM = 0, 1, 2, 3
+
+#How Many Columns Share A Depth Tile, A Sprite Is Only Looked At If A Tile It Covers Can See As Far As The Sprite
+DEPTH_TILE = 8
+
+#Sprites Can Stick Out Into The View By Their Width, Cells Of The Bins This Close To The View Are Still Looked At
+SPRITE_CULL_MARGIN = 2.0
+
+#How Many Walls & Sprites Were Left Out Of The Last Frame Because The Scratch Arrays Had No Room For Them
+OVERFLOW_WALLS, OVERFLOW_SPRITES = 0, 1
+
+#Every Row Of The Screen Below Or Above The Horizon Is The Same Distance Ahead Of The Player Along The Floor, Whatever The Column
+#The Horizon Row Is Infinitely Far Away & Keeps A Distance Of 0
+ROW_DISTANCE, ROW_INVERSE_DISTANCE = 0, 1
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Checks The Intersection Between Two Line Segments3
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def check_intersection(wall_1, wall_2):
+	x1, y1 = wall_1[0]
+	x2, y2 = wall_1[1]
+	x3, y3 = wall_2[0]
+	x4, y4 = wall_2[1]
+
+	denominator = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
+
+	if denominator == 0:
+		return (0, 0)
+	
+	ua = ((x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)) / denominator
+	if ua < 0 or ua > 1:
+		return (0, 0)
+
+	ub = ((x2 - x1) * (y1 - y3) - (y2 - y1) * (x1 - x3)) / denominator
+	if ub < 0 or ub > 1:
+		return (0, 0)
+
+	return (x1 + ua * (x2 - x1), y1 + ua * (y2 - y1))
+
+
+#Intersects A Ray With A Wall, This Gives Back How Far Along The Ray (0 - 1) & How Far Along The Wall (0 - 1) The Hit Is, And If There Was One
+#The Distance & Texture Coordinate Can Then Be Found By Multiplying With The Lengths, Without Any Square Roots
+#Nothing Here Branches, So The Same Function Works On Single Values Inside Numba & On Whole NumPy Arrays
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def intersect_ray_wall(origin_x, origin_y, direction_x, direction_y, x1, y1, x2, y2):
+	edge_x = x2 - x1
+	edge_y = y2 - y1
+
+	denominator = edge_y * direction_x - edge_x * direction_y
+
+	#Parallel Lines Divide By One Instead, They Are Never Counted As A Hit Anyway
+	safe_denominator = denominator + (denominator == 0)
+
+	ray_t = (edge_x * (origin_y - y1) - edge_y * (origin_x - x1)) / safe_denominator
+	wall_u = (direction_x * (origin_y - y1) - direction_y * (origin_x - x1)) / safe_denominator
+
+	hit = (denominator != 0) & (ray_t >= 0) & (ray_t <= 1) & (wall_u >= 0) & (wall_u <= 1)
+
+	return ray_t, wall_u, hit
+
+
+#Intersects A Block Of Rays With A Block Of Walls, Every Result Is Written Into The Arrays Given
+#Rays Are Rows Of (X, Y) Origins & Directions, Walls Are Rows Of (X1, Y1, X2, Y2)
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def intersect_walls(ray_origins, ray_directions, wall_points, ray_t, wall_u, hit):
+	for ray in range(len(ray_directions)):
+		for wall in range(len(wall_points)):
+			ray_t[ray, wall], wall_u[ray, wall], hit[ray, wall] = intersect_ray_wall(
+				ray_origins[ray, 0], ray_origins[ray, 1], ray_directions[ray, 0], ray_directions[ray, 1],
+				wall_points[wall, 0], wall_points[wall, 1], wall_points[wall, 2], wall_points[wall, 3])
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def lerp(a, b, t):
+	return a + (b - a) * t
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def normalize(direction):
+	magnitude = numpy.sqrt(direction[0] * direction[0] + direction[1] * direction[1])
+	if magnitude > 0:
+		return (direction[0] / magnitude, direction[1] / magnitude)
+
+	return (0, 0)
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def mix(rgb_1, rgb_2):
+	mixed_r = int(rgb_1[0] * rgb_2[0]) << 16
+	mixed_g = int(rgb_1[1] * rgb_2[1]) << 8
+	mixed_b = int(rgb_1[2] * rgb_2[2])
+
+	return mixed_r + mixed_g + mixed_b
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def convert_int_rgb(code):
+	converted_r = (code >> 16) & 0xff
+	converted_g = (code >> 8) & 0xff
+	converted_b = code & 0xff
+
+	return converted_r, converted_g, converted_b
+
+
+#Reads A Texel, When There Is A Palette The Texture Only Holds Indices & The Color Is Looked Up Here
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def sample_texture(texture, palette, x, y):
+	if palette is None:
+		return texture[x, y]
+
+	return palette[texture[x, y]]
+
+
+#Only Records Where A Pixel Comes From, So The Shading Pass Can Look Up The Texel & Light It Later
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def write_record(gbuffer, x, y, surface, u, v, depth, light):
+	gbuffer[GBUFFER_SURFACE][x, y] = surface
+	gbuffer[GBUFFER_U][x, y] = u
+	gbuffer[GBUFFER_V][x, y] = v
+	gbuffer[GBUFFER_DEPTH][x, y] = depth
+
+	gbuffer[GBUFFER_LIGHT][x, y, 0] = light[0]
+	gbuffer[GBUFFER_LIGHT][x, y, 1] = light[1]
+	gbuffer[GBUFFER_LIGHT][x, y, 2] = light[2]
+
+
+#Shades A Texel Straight Into The Buffer, Or When There Is A G-Buffer Only Records It
+#Without A G-Buffer Numba Compiles The Record Away & The Other Way Around
+#The Light Is Added To The Darkness, But Can Only Bring A Texel Back Up To Its Full Color
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def write_texel(buffer, gbuffer, palette, x, y, texture, surface, u, v, depth, darkness, light):
+	if gbuffer is None:
+		color_value = convert_int_rgb(sample_texture(texture, palette, u, v))
+		buffer[x, y] = mix(color_value, (min(darkness + light[0], 1.0), min(darkness + light[1], 1.0), min(darkness + light[2], 1.0)))
+
+	else:
+		write_record(gbuffer, x, y, surface, u, v, depth, light)
+
+
+#Gives Back The (Light Data, Sector Start, Sector Lights, Falloff), Unpacked Once Per Frame Instead Of Per Pixel
+#Without Lights Every Sector Gets An Empty Range, As These Are Constants Numba Compiles The Gathering Away
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def unpack_lights(lights):
+	if lights is None:
+		return UNLIT_SECTORS
+
+	return (lights[LIGHTS_DATA], lights[LIGHTS_SECTOR_START], lights[LIGHTS_SECTOR_LIGHTS], lights[LIGHTS_FALLOFF])
+
+
+#Adds Up The Lights Binned Into A Sector At A Point, Only Lights Close Enough To Reach The Sector Are Looked At
+#The Falloff Table Is Indexed By The Squared Distance Over The Squared Radius, So No Square Root Is Needed
+#This Runs For Every Floor Pixel, Calling It Would Cost More Than The Lights Themselves So Numba Inlines It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def gather_light(light_data, sector_start, sector_lights, falloff, segment, point_x, point_y):
+	red, green, blue = 0.0, 0.0, 0.0
+
+	if segment < 0 or segment + 1 >= len(sector_start):
+		return (red, green, blue)
+
+	for i in range(sector_start[segment], sector_start[segment + 1]):
+		light = sector_lights[i]
+
+		dx = point_x - light_data[light, 0]
+		dy = point_y - light_data[light, 1]
+		reach = (dx * dx + dy * dy) / light_data[light, 2]
+
+		if reach < 1:
+			strength = falloff[int(reach * (len(falloff) - 1))]
+
+			red += light_data[light, 3] * strength
+			green += light_data[light, 4] * strength
+			blue += light_data[light, 5] * strength
+
+	return (red, green, blue)
+
+
+#Sprites Aren't Part Of A Sector, So Their Light Is Added Up Once Per Frame When The Lights Are Binned
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def get_sprite_light(lights, index):
+	if lights is None:
+		return (0.0, 0.0, 0.0)
+
+	return (lights[LIGHTS_SPRITE][index, 0], lights[LIGHTS_SPRITE][index, 1], lights[LIGHTS_SPRITE][index, 2])
+
+
+#Gives Back The Lightmaps Once Per Frame, Or The Unbaked Constants Without Any
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def unpack_lightmaps(lightmaps):
+	if lightmaps is None:
+		return UNBAKED
+
+	return lightmaps
+
+
+#Looks Up The Baked Light Of A Wall At How Far Along It The Ray Hit, The Whole Span Of A Column Shares It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_baked_wall(wall_start, wall_samples, inverse_cell_size, wall, texture_distance):
+	if wall + 1 >= len(wall_start):
+		return (0.0, 0.0, 0.0)
+
+	sample = wall_start[wall] + clamp_in_order(int(texture_distance * inverse_cell_size), 0, wall_start[wall + 1] - wall_start[wall] - 1)
+
+	return (wall_samples[sample, 0], wall_samples[sample, 1], wall_samples[sample, 2])
+
+
+#Looks Up The Closest Baked Sample Of A Floor Or Ceiling, Points Outside The Box Of The Segment Take The Nearest Edge
+#Like Gathering Lights This Runs For Every Floor Pixel, So Numba Inlines It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_baked_flat(sector_origin, sector_size, sector_start, flat_samples, inverse_cell_size, segment, point_x, point_y):
+	if segment < 0 or segment >= len(sector_size):
+		return (0.0, 0.0, 0.0, 1.0)
+
+	column = clamp_in_order(int((point_x - sector_origin[segment, 0]) * inverse_cell_size), 0, sector_size[segment, 0] - 1)
+	row = clamp_in_order(int((point_y - sector_origin[segment, 1]) * inverse_cell_size), 0, sector_size[segment, 1] - 1)
+
+	sample = sector_start[segment] + column * sector_size[segment, 1] + row
+
+	return (flat_samples[sample, 0], flat_samples[sample, 1], flat_samples[sample, 2], flat_samples[sample, 3])
+
+
+#Sprites Were Baked Where They Stood, Sprites Added After Baking Get Nothing
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def get_baked_sprite(sprite_samples, index):
+	if index >= len(sprite_samples):
+		return (0.0, 0.0, 0.0)
+
+	return (sprite_samples[index, 0], sprite_samples[index, 1], sprite_samples[index, 2])
+
+
+#Baked Light Is Added On Top Of The Light Gathered Every Frame
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def add_light(light, baked):
+	return (light[0] + baked[0], light[1] + baked[1], light[2] + baked[2])
+
+
+#The Surface Of A Wall, Floor, Sprite Or The Sky, Only Needed When There Is A G-Buffer
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def get_surface(gbuffer, index):
+	if gbuffer is None:
+		return 0
+
+	return gbuffer[GBUFFER_SURFACES][index]
+
+
+#This Is Very Useful For Ceiling Casts & Making Functions More Generalized
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def clamp_in_order(value, minimum, maximum):
+	return max(minimum, min(value, maximum))
+
+
+#Builds A Uniform Grid Over The Level, So That Rays Only Check The Walls In The Cells They Pass Through
+def build_wall_grid(level, cell_size):
+	wall_points = numpy.array([(wall[WALL_POINT_A][0], wall[WALL_POINT_A][1], wall[WALL_POINT_B][0], wall[WALL_POINT_B][1]) for wall in level], dtype=numpy.float64)
+	wall_segment = numpy.array([wall[WALL_SEGMENT] for wall in level], dtype=numpy.int64)
+
+	origin = wall_points.reshape(-1, 2).min(axis=0)
+	size = numpy.floor((wall_points.reshape(-1, 2).max(axis=0) - origin) / cell_size).astype(numpy.int64) + 1
+
+	cells = [[] for i in range(size[0] * size[1])]
+
+	#Every Wall Is Added To All The Cells Its Bounding Box Touches
+	for index in range(len(wall_points)):
+		minimum = numpy.floor((wall_points[index].reshape(2, 2).min(axis=0) - origin) / cell_size).astype(numpy.int64)
+		maximum = numpy.floor((wall_points[index].reshape(2, 2).max(axis=0) - origin) / cell_size).astype(numpy.int64)
+
+		for cell_x in range(minimum[0], maximum[0] + 1):
+			for cell_y in range(minimum[1], maximum[1] + 1):
+				cells[cell_y * size[0] + cell_x].append(index)
+
+	cell_start = numpy.zeros(len(cells) + 1, dtype=numpy.int64)
+	cell_start[1:] = numpy.cumsum([len(cell) for cell in cells])
+	cell_walls = numpy.array([index for cell in cells for index in cell], dtype=numpy.int64)
+
+	#We Also Store Which Side Of Every Wall Faces The Inside Of Its Segment,
+	#This Lets Us Tell If A Ray Is Leaving Or Entering A Segment When Two Walls Are Hit At The Same Spot
+	wall_side = numpy.zeros(len(level), dtype=numpy.float64)
+
+	for index in range(len(level)):
+		center = wall_points[wall_segment == wall_segment[index]].reshape(-1, 2).mean(axis=0)
+		x1, y1, x2, y2 = wall_points[index]
+
+		wall_side[index] = numpy.sign((center[0] - x1) * (y1 - y2) + (center[1] - y1) * (x2 - x1))
+
+	#The Lengths Turn The Position Along A Wall Into A Texture Coordinate
+	wall_length = numpy.hypot(wall_points[:, 2] - wall_points[:, 0], wall_points[:, 3] - wall_points[:, 1])
+
+	return ((origin[0], origin[1]), float(cell_size), (size[0], size[1]), cell_start, cell_walls, wall_points, wall_segment, wall_side, wall_length)
+
+
+#Splits Every Column Of A Sprite Texture Into Runs Of Opaque Rows, Like The Posts Of A Doom Patch
+#Gives Back Where The Runs Of Each Column Start & The [Top, Bottom) Rows Of Every Run
+def build_sprite_posts(texture, colorkey):
+	post_start = [0]
+	post_runs = []
+
+	for column in texture != colorkey:
+		edges = numpy.flatnonzero(numpy.diff(numpy.concatenate(((0,), column.astype(numpy.int8), (0,)))))
+
+		post_runs.extend(edges.reshape(-1, 2))
+		post_start.append(len(post_runs))
+
+	return numpy.array(post_start, dtype=numpy.int64), numpy.array(post_runs, dtype=numpy.int64).reshape(-1, 2)
+
+
+#A Sprite Is (Position, Texture, Post Start, Post Runs), The Colorkey Is Only Needed Here As The Runs Already Say What Is See-Through
+def build_sprite(position, texture, colorkey):
+	post_start, post_runs = build_sprite_posts(texture, colorkey)
+
+	return (position, texture, post_start, post_runs)
+
+
+#Builds The Lookup Tables For A Panoramic Sky, The Texture Wraps Around The Player A Few Times
+#Columns Are Looked Up By Angle In Tenths Of A Degree & Rows By Screen Row, So Drawing The Sky Is Only Array Reads
+def build_sky(sky_texture, buffer_height, repeats):
+	sky_columns = (numpy.arange(3600) / 3600 * sky_texture.shape[0] * repeats).astype(numpy.int64) % sky_texture.shape[0]
+	sky_rows = numpy.arange(buffer_height) * sky_texture.shape[1] // buffer_height
+
+	return (sky_texture, sky_columns, sky_rows)
+
+
+#Builds The G-Buffer For Deferred Shading, The Traversal Fills In The (Surface, U, V, Depth, Light) Of Every Pixel
+#Every Texture Of The Level, The Sprites & The Sky Becomes A Surface Of The Atlas, With Any Palette Already Looked Up
+#The Surfaces Of The Walls Come First, Then Their Floors, Then The Sprites, Then The Sprites Of Every Kind Of Entity & Lastly The Sky
+#Gives Back The (G-Buffer, Atlas)
+def build_gbuffer(level, sprite_list, sky, palette, size, entity_sprites=()):
+	textures = []
+	texture_index = {}
+	surfaces = []
+
+	for texture in [wall[WALL_TEXTURE] for wall in level] + [wall[WALL_FLOOR_TEXTURE] for wall in level] + [sprite[SPRITE_TEXTURE] for sprite in (() if sprite_list is None else sprite_list)] + [sprite[SPRITE_TEXTURE] for sprite in entity_sprites] + [sky[SKY_TEXTURE]]:
+		if id(texture) not in texture_index:
+			texture_index[id(texture)] = len(textures)
+			textures.append(texture)
+
+		surfaces.append(texture_index[id(texture)])
+
+	#The Sky Is Never Palettized, Only The Level & Sprites Are
+	colors = [texture if palette is None or texture is sky[SKY_TEXTURE] else palette[texture] for texture in textures]
+
+	atlas = (
+		numpy.concatenate([color.ravel() for color in colors]).astype(numpy.int32),
+		numpy.cumsum([0] + [color.size for color in colors[:-1]]).astype(numpy.int64),
+		numpy.array([color.shape[0] for color in colors], dtype=numpy.int64),
+		numpy.array([color.shape[1] for color in colors], dtype=numpy.int64))
+
+	gbuffer = (
+		numpy.zeros(size, dtype=numpy.int32),
+		numpy.zeros(size, dtype=numpy.int32),
+		numpy.zeros(size, dtype=numpy.int32),
+		numpy.zeros(size, dtype=numpy.float64),
+		numpy.array(surfaces, dtype=numpy.int64),
+		numpy.zeros((size[0], size[1], 3), dtype=numpy.float64))
+
+	return gbuffer, atlas
+
+
+#Builds The Scratch Arrays Of The Scan Line For Up To Wall Capacity Walls & Sprite Capacity Sprites, Every Frame Reuses Them
+#Nothing Grows While Rendering, Walls That Don't Fit Are Never Drawn & Sprites That Don't Fit Are Left Out Furthest First
+#Either Way They Are Counted In The Overflow, Which Always Holds How Many Were Left Out Of The Last Frame
+#The Rows Are Made For A Buffer Of The Given Size, Rows Of A Taller Buffer Work Out Their Distance As They Are Drawn
+#Every Column Keeps The Walls It Crossed For The Sprites, So Sprites Are Only Drawn In The Columns Of The Given Size
+def build_scratch(wall_capacity, sprite_capacity, size):
+	return (
+		numpy.zeros(RAY_DONE + 1, dtype=numpy.float64),
+		numpy.zeros((wall_capacity, PENDING_EXITING + 1), dtype=numpy.float64),
+		numpy.zeros(wall_capacity, dtype=numpy.int64),
+		numpy.zeros((wall_capacity, 2), dtype=numpy.int64),
+		numpy.zeros((8, 2), dtype=numpy.int64),
+		numpy.zeros(sprite_capacity, dtype=numpy.int64),
+		numpy.zeros(sprite_capacity, dtype=numpy.float64),
+		numpy.zeros((sprite_capacity, 3), dtype=numpy.float64),
+		numpy.zeros((sprite_capacity, SPRITE_SPAN_DARKNESS + 1), dtype=numpy.float64),
+		numpy.zeros(OVERFLOW_SPRITES + 1, dtype=numpy.int64),
+		numpy.zeros((size[1], ROW_INVERSE_DISTANCE + 1), dtype=numpy.float64),
+		numpy.zeros((sprite_capacity, SCREEN_DISTANCE + 1), dtype=numpy.float64),
+		numpy.zeros((wall_capacity * size[0], CROSSING_WINDOW_BOTTOM + 1), dtype=numpy.float64),
+		numpy.zeros(size[0] + 1, dtype=numpy.int64),
+		numpy.zeros(-(-size[0] // DEPTH_TILE), dtype=numpy.float64))
+
+
+#Adds A Span Of Rows That Nothing Was Drawn Over To The Sky Spans Of A Column
+#If There Is No Room Left, The Spans So Far Are Drawn Straight Away To Make Space
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def add_sky_span(sky, sky_spans, sky_count, top, bottom, x, sky_column, buffer, gbuffer):
+	if int(bottom) <= int(top):
+		return sky_count
+
+	if sky_count == len(sky_spans):
+		draw_sky_spans(sky, sky_spans, sky_count, x, sky_column, buffer, gbuffer)
+		sky_count = 0
+
+	sky_spans[sky_count, 0] = int(top)
+	sky_spans[sky_count, 1] = int(bottom)
+
+	return sky_count + 1
+
+
+#The Sky Isn't Shaded, It Is Infinitely Far Away
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def draw_sky_spans(sky, sky_spans, sky_count, x, sky_column, buffer, gbuffer):
+	sky_texture = sky[SKY_TEXTURE]
+	sky_rows = sky[SKY_ROWS]
+
+	for i in range(sky_count):
+		for y in range(sky_spans[i, 0], sky_spans[i, 1]):
+			if gbuffer is None:
+				buffer[x, y] = sky_texture[sky_column, sky_rows[y]]
+
+			#The Sky Is The Last Surface, A Depth Of 0 Leaves It Unshaded
+			else:
+				write_record(gbuffer, x, y, gbuffer[GBUFFER_SURFACES][-1], sky_column, sky_rows[y], 0.0, (0.0, 0.0, 0.0))
+
+
+#Prepares A Ray To Be Walked Through The Grid, Everything Needed To Continue Later On Is Kept In The Ray Array
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def start_ray(translated_point, wall_grid, ray):
+	origin_x, origin_y = wall_grid[GRID_ORIGIN]
+	cell_size = wall_grid[GRID_CELL_SIZE]
+	columns, rows = wall_grid[GRID_SIZE]
+
+	x1, y1 = translated_point[0]
+	x2, y2 = translated_point[1]
+
+	direction_x = x2 - x1
+	direction_y = y2 - y1
+
+	#Clip The Ray To The Bounds Of The Grid
+	ray_start = 0.0
+	ray_end = 1.0
+
+	if direction_x != 0:
+		t1 = (origin_x - x1) / direction_x
+		t2 = (origin_x + columns * cell_size - x1) / direction_x
+
+		ray_start = max(ray_start, min(t1, t2))
+		ray_end = min(ray_end, max(t1, t2))
+
+	elif x1 < origin_x or x1 > origin_x + columns * cell_size:
+		ray_end = -1.0
+
+	if direction_y != 0:
+		t1 = (origin_y - y1) / direction_y
+		t2 = (origin_y + rows * cell_size - y1) / direction_y
+
+		ray_start = max(ray_start, min(t1, t2))
+		ray_end = min(ray_end, max(t1, t2))
+
+	elif y1 < origin_y or y1 > origin_y + rows * cell_size:
+		ray_end = -1.0
+
+	cell_x = clamp_in_order(int(numpy.floor((x1 + direction_x * ray_start - origin_x) / cell_size)), 0, columns - 1)
+	cell_y = clamp_in_order(int(numpy.floor((y1 + direction_y * ray_start - origin_y) / cell_size)), 0, rows - 1)
+
+	ray[RAY_CELL_X] = cell_x
+	ray[RAY_CELL_Y] = cell_y
+
+	#These Are The Distances Along The Ray To The Next Vertical & Horizontal Cell Borders
+	ray[RAY_NEXT_X] = numpy.inf
+	ray[RAY_NEXT_Y] = numpy.inf
+	ray[RAY_DELTA_X] = numpy.inf
+	ray[RAY_DELTA_Y] = numpy.inf
+
+	if direction_x != 0:
+		ray[RAY_NEXT_X] = (origin_x + (cell_x + (direction_x > 0)) * cell_size - x1) / direction_x
+		ray[RAY_DELTA_X] = cell_size / abs(direction_x)
+
+	if direction_y != 0:
+		ray[RAY_NEXT_Y] = (origin_y + (cell_y + (direction_y > 0)) * cell_size - y1) / direction_y
+		ray[RAY_DELTA_Y] = cell_size / abs(direction_y)
+
+	ray[RAY_END] = ray_end
+	ray[RAY_LENGTH] = numpy.sqrt(direction_x * direction_x + direction_y * direction_y)
+	ray[RAY_LIMIT] = -1.0
+	ray[RAY_PENDING] = 0
+	ray[RAY_LAST_SEGMENT] = -1
+	ray[RAY_DONE] = ray_start > ray_end
+
+
+#Projects Every Wall Into The Player's View Once Per Frame & Works Out The Range Of Columns It Can Appear In
+#Walls Behind The Player, Outside The Field Of View Or Beyond The View Distance Get An Empty Range
+#There Is No Back-Face Culling, As Rays Need Both The Wall Entering A Segment & The Wall Leaving It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def cull_walls(player, wall_grid, columns, wall_columns):
+	wall_points = wall_grid[GRID_WALL_POINTS]
+
+	angle = numpy.radians(player[PLAYER_ANGLE])
+	half_vision = numpy.radians(player[PLAYER_VISION]) / 2
+	interval_angle = numpy.radians(player[PLAYER_VISION]) / columns
+
+	visible_walls = 0
+
+	for index in range(min(len(wall_points), len(wall_columns))):
+		wall_columns[index, 0] = 1
+		wall_columns[index, 1] = 0
+
+		#Move The Wall So That The Player Is At The Origin
+		x1 = wall_points[index, 0] - player[PLAYER_POSITION][0]
+		y1 = wall_points[index, 1] - player[PLAYER_POSITION][1]
+		x2 = wall_points[index, 2] - player[PLAYER_POSITION][0]
+		y2 = wall_points[index, 3] - player[PLAYER_POSITION][1]
+
+		#The Closest Point Of The Wall Has To Be Within Reach Of The Rays
+		edge_x = x2 - x1
+		edge_y = y2 - y1
+		edge_length = edge_x * edge_x + edge_y * edge_y
+
+		closest = 0.0
+
+		if edge_length > 0:
+			closest = clamp_in_order(-(x1 * edge_x + y1 * edge_y) / edge_length, 0.0, 1.0)
+
+		closest_x = x1 + edge_x * closest
+		closest_y = y1 + edge_y * closest
+
+		if closest_x * closest_x + closest_y * closest_y > player[PLAYER_DISTANCE] * player[PLAYER_DISTANCE]:
+			continue
+
+		#Get The Angles Of Both Points Relative To Where The Player Is Looking, A Wall Always Covers Less Than Half A Turn
+		#So We Take The Middle Of Both Angles & Spread Out From There, This Avoids Any Wrapping Around Behind The Player
+		angle_a = numpy.arctan2(y1, x1) - angle
+		spread = numpy.arctan2(y2, x2) - numpy.arctan2(y1, x1)
+		spread = numpy.arctan2(numpy.sin(spread), numpy.cos(spread))
+
+		middle = angle_a + spread / 2
+		middle = numpy.arctan2(numpy.sin(middle), numpy.cos(middle))
+
+		#The Player Is Standing On The Wall's Line, So It Could Be Anywhere On Screen
+		if abs(spread) > numpy.pi - 1e-6:
+			first_column = 0
+			last_column = columns - 1
+
+		else:
+			#The Columns Are Widened By One On Each Side To Account For Rounding
+			first_column = int(numpy.floor((middle - abs(spread) / 2 + half_vision) / interval_angle)) - 1
+			last_column = int(numpy.ceil((middle + abs(spread) / 2 + half_vision) / interval_angle)) + 1
+
+		if last_column < 0 or first_column > columns - 1:
+			continue
+
+		wall_columns[index, 0] = max(first_column, 0)
+		wall_columns[index, 1] = min(last_column, columns - 1)
+
+		visible_walls += 1
+
+	return visible_walls
+
+
+#Decides If The First Pending Hit Comes Before The Second One Along The Ray
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def is_hit_before(hit, other, last_segment):
+	if hit[PENDING_DISTANCE] < other[PENDING_DISTANCE] - 1e-9:
+		return True
+
+	if hit[PENDING_DISTANCE] > other[PENDING_DISTANCE] + 1e-9:
+		return False
+
+	#Both Walls Were Hit At The Same Spot, So We Leave The Current Segment Before Entering The Next One
+	if hit[PENDING_EXITING] != other[PENDING_EXITING]:
+		return hit[PENDING_EXITING] > other[PENDING_EXITING]
+
+	return hit[PENDING_SEGMENT] == last_segment
+
+
+#Gets The Next Closest Wall That Has Been Intersected With, The Wall Index Is -1 Once There Are No More
+#The Grid Is Walked Cell By Cell Along The Ray, So When The Caller Stops Early The Walls Further Away Are Never Intersected Or Sorted
+#Walls That Can't Be Seen In This Column After Culling Are Skipped Before Being Intersected, Like Walls That Didn't Fit In The Scratch Arrays
+#Sectors Are Convex, So The Hits Of A Segment Always Come In An Entry & Exit Pair
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def get_closest_wall(translated_point, wall_grid, wall_columns, ray, pending, visited, column):
+	cell_size = wall_grid[GRID_CELL_SIZE]
+	columns, rows = wall_grid[GRID_SIZE]
+
+	cell_start = wall_grid[GRID_CELL_START]
+	cell_walls = wall_grid[GRID_CELL_WALLS]
+	wall_points = wall_grid[GRID_WALL_POINTS]
+	wall_segment = wall_grid[GRID_WALL_SEGMENT]
+	wall_side = wall_grid[GRID_WALL_SIDE]
+	wall_length = wall_grid[GRID_WALL_LENGTH]
+
+	origin_x, origin_y = translated_point[0]
+	direction_x = translated_point[1][0] - origin_x
+	direction_y = translated_point[1][1] - origin_y
+
+	while True:
+		#Hits Are Only Given Out Once No Wall In A Further Cell Can Be Closer
+		closest = -1
+
+		for i in range(int(ray[RAY_PENDING])):
+			if pending[i, PENDING_DISTANCE] <= ray[RAY_LIMIT]:
+				if closest == -1 or is_hit_before(pending[i], pending[closest], ray[RAY_LAST_SEGMENT]):
+					closest = i
+
+		if closest != -1:
+			hit = (pending[closest, PENDING_DISTANCE], pending[closest, PENDING_TEXTURE_DISTANCE], int(pending[closest, PENDING_WALL]), int(pending[closest, PENDING_SEGMENT]))
+
+			#Fill The Gap With The Last Pending Hit, One Field At A Time As Copying The Whole Row Would Allocate
+			ray[RAY_PENDING] -= 1
+
+			for field in range(PENDING_EXITING + 1):
+				pending[closest, field] = pending[int(ray[RAY_PENDING]), field]
+
+			ray[RAY_LAST_SEGMENT] = hit[3]
+
+			return hit
+
+		if ray[RAY_DONE]:
+			return (0.0, 0.0, -1, -1)
+
+		cell_x = int(ray[RAY_CELL_X])
+		cell_y = int(ray[RAY_CELL_Y])
+		cell = cell_y * columns + cell_x
+
+		for i in range(cell_start[cell], cell_start[cell + 1]):
+			index = cell_walls[i]
+
+			if index >= len(wall_columns) or column < wall_columns[index, 0] or column > wall_columns[index, 1]:
+				continue
+
+			#A Wall Can Be In Many Cells, So We Mark It With The Column To Only Intersect It Once Per Ray
+			if visited[index] != column + 1:
+				visited[index] = column + 1
+				ray_t, wall_u, hit = intersect_ray_wall(
+					origin_x, origin_y, direction_x, direction_y,
+					wall_points[index, 0], wall_points[index, 1], wall_points[index, 2], wall_points[index, 3])
+
+				if hit:
+					count = int(ray[RAY_PENDING])
+
+					pending[count, PENDING_DISTANCE] = ray_t * ray[RAY_LENGTH]
+					pending[count, PENDING_TEXTURE_DISTANCE] = wall_u * wall_length[index]
+					pending[count, PENDING_WALL] = index
+					pending[count, PENDING_SEGMENT] = wall_segment[index]
+					pending[count, PENDING_EXITING] = (direction_x * (wall_points[index, 1] - wall_points[index, 3]) + direction_y * (wall_points[index, 2] - wall_points[index, 0])) * wall_side[index] < 0
+
+					ray[RAY_PENDING] += 1
+
+		#Everything Up To The End Of This Cell Can Now Be Given Out, Then We Step Into The Next Cell
+		cell_exit = min(ray[RAY_NEXT_X], ray[RAY_NEXT_Y], ray[RAY_END])
+		ray[RAY_LIMIT] = cell_exit * ray[RAY_LENGTH]
+
+		if ray[RAY_NEXT_X] < ray[RAY_NEXT_Y]:
+			cell_x += 1 if direction_x > 0 else -1
+			ray[RAY_NEXT_X] += ray[RAY_DELTA_X]
+
+		else:
+			cell_y += 1 if direction_y > 0 else -1
+			ray[RAY_NEXT_Y] += ray[RAY_DELTA_Y]
+
+		ray[RAY_CELL_X] = cell_x
+		ray[RAY_CELL_Y] = cell_y
+
+		#Anything Left Over Was Hit Right On The Edge Of The Grid
+		if cell_exit >= ray[RAY_END] or cell_x < 0 or cell_x >= columns or cell_y < 0 or cell_y >= rows:
+			ray[RAY_DONE] = True
+			ray[RAY_LIMIT] = numpy.inf
+
+#Where A Sprite Lands On Screen As (Middle Column, Half Width), Worked Out The Same Way The Columns Do
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def find_sprite_columns(player, dx, dy, dist, buffer_width, half_height):
+	theta = numpy.degrees(numpy.arctan2(-dy, dx))
+	fixed_rotation = player[PLAYER_ANGLE] % 360
+
+	y = (-fixed_rotation + (player[PLAYER_VISION] / 2) - theta)
+
+	if y < -180:
+		y += 360
+
+	return y * (buffer_width / player[PLAYER_VISION]), half_height / dist
+
+
+#Whether Sprite A Is Drawn Before Sprite B, Further Sprites Come First & Sprites At The Same Distance Keep Their Order
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def is_drawn_before(distance_a, index_a, distance_b, index_b):
+	return distance_a > distance_b or (distance_a == distance_b and index_a < index_b)
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def swap_sprites(sprite_order, sprite_distance, a, b):
+	sprite_order[a], sprite_order[b] = sprite_order[b], sprite_order[a]
+	sprite_distance[a], sprite_distance[b] = sprite_distance[b], sprite_distance[a]
+
+
+#Moves A Sprite Down The Heap Until The Sprites Below It Are Drawn After It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def sift_down(sprite_order, sprite_distance, slot, count):
+	while 2 * slot + 1 < count:
+		child = 2 * slot + 1
+
+		if child + 1 < count and is_drawn_before(sprite_distance[child + 1], sprite_order[child + 1], sprite_distance[child], sprite_order[child]):
+			child += 1
+
+		if not is_drawn_before(sprite_distance[child], sprite_order[child], sprite_distance[slot], sprite_order[slot]):
+			return
+
+		swap_sprites(sprite_order, sprite_distance, slot, child)
+		slot = child
+
+
+#Moves A Sprite Up The Heap Until The Sprite Above It Is Drawn Before It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def sift_up(sprite_order, sprite_distance, slot):
+	while slot > 0:
+		parent = (slot - 1) // 2
+
+		if not is_drawn_before(sprite_distance[slot], sprite_order[slot], sprite_distance[parent], sprite_order[parent]):
+			return
+
+		swap_sprites(sprite_order, sprite_distance, slot, parent)
+		slot = parent
+
+
+#The Kept Sprites Are A Heap With The First One Drawn On Top, When There Is No Room Left A Closer Sprite Takes Its Place
+#Keeping A Sprite Only Costs The Log Of How Many Are Kept, However Many Are Looked At
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def keep_sprite(sprite_order, sprite_distance, count, index, dist):
+	if count < len(sprite_order):
+		sprite_order[count] = index
+		sprite_distance[count] = dist
+		sift_up(sprite_order, sprite_distance, count)
+
+		return count + 1
+
+	if count == 0 or not is_drawn_before(sprite_distance[0], sprite_order[0], dist, index):
+		return count
+
+	sprite_order[0] = index
+	sprite_distance[0] = dist
+	sift_down(sprite_order, sprite_distance, 0, count)
+
+	return count
+
+
+#Heapsorts The Kept Sprites & Turns Them Around, So They Go From First Drawn To Last Drawn
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def sort_sprites(sprite_order, sprite_distance, count):
+	for end in range(count - 1, 0, -1):
+		swap_sprites(sprite_order, sprite_distance, 0, end)
+		sift_down(sprite_order, sprite_distance, 0, end)
+
+	for i in range(count // 2):
+		swap_sprites(sprite_order, sprite_distance, i, count - 1 - i)
+
+
+#Fills Every Depth Tile With The Furthest Crossing Of Its Columns, Which Is As Far As Those Columns Can See
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def fill_depth_tiles(crossings, crossing_start, columns, depth_tiles):
+	for tile in range(len(depth_tiles)):
+		depth_tiles[tile] = 0
+
+	for x in range(min(columns, len(crossing_start) - 1)):
+		if crossing_start[x + 1] > crossing_start[x]:
+			tile = x // DEPTH_TILE
+			depth_tiles[tile] = max(depth_tiles[tile], crossings[crossing_start[x + 1] - 1, CROSSING_DISTANCE])
+
+
+#Whether Any Column A Sprite Covers Can See As Far As The Sprite, Otherwise The Walls Hide All Of It
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def is_sprite_seen(depth_tiles, x_pos, sprite_height, dist, buffer_width):
+	first_tile = max(int(x_pos - sprite_height), 0) // DEPTH_TILE
+	last_tile = min(int(x_pos + sprite_height), buffer_width - 1) // DEPTH_TILE
+
+	for tile in range(first_tile, min(last_tile + 1, len(depth_tiles))):
+		if depth_tiles[tile] > dist:
+			return True
+
+	return False
+
+
+#Keeps A Sprite If It Reaches Any Column & Isn't Hidden Behind The Walls Of Every Column It Covers
+#Gives Back The (Kept Count, Seen Count)
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def look_at_sprite(player, x, y, index, sprite_order, sprite_distance, depth_tiles, count, seen, buffer_width, half_height):
+	dx = x - player[PLAYER_POSITION][0]
+	dy = y - player[PLAYER_POSITION][1]
+
+	dist = numpy.sqrt(dx * dx + dy * dy)
+	x_pos, sprite_height = find_sprite_columns(player, dx, dy, dist, buffer_width, half_height)
+
+	if x_pos + sprite_height > 0 and x_pos - sprite_height < buffer_width and is_sprite_seen(depth_tiles, x_pos, sprite_height, dist, buffer_width):
+		return keep_sprite(sprite_order, sprite_distance, count, index, dist), seen + 1
+
+	return count, seen
+
+
+#Whether Anything Within The Radius Of A Point Could Be Seen, Sprites There Can Also Stick Out Into The View By Their Width
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def is_area_seen(player, x, y, radius, buffer_width, half_height):
+	dx = x - player[PLAYER_POSITION][0]
+	dy = y - player[PLAYER_POSITION][1]
+
+	dist = numpy.sqrt(dx * dx + dy * dy)
+
+	if dist <= radius:
+		return True
+
+	if dist - radius > player[PLAYER_DISTANCE]:
+		return False
+
+	angle_difference = abs((numpy.degrees(numpy.arctan2(dy, dx)) - player[PLAYER_ANGLE] + 180) % 360 - 180)
+	spread = numpy.degrees(numpy.arcsin(radius / dist)) + half_height / (dist - radius) * player[PLAYER_VISION] / buffer_width
+
+	return angle_difference <= player[PLAYER_VISION] / 2 + spread
+
+
+#Looks At The Entities In The Cells Of Their Bins The Player Can See, So Entities Anywhere Else Cost Nothing
+#Only Cells Within The Box Of The View Are Tested, The View Being A Triangle From The Player Out To The Edges Of The Vision
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def gather_entities(player, sprite_list, entities, sprite_order, sprite_distance, depth_tiles, count, seen, buffer_width, half_height):
+	if entities is None:
+		return count, seen
+
+	bins = entities[ENTITIES_BINS]
+	positions = entities[ENTITIES_POSITION]
+
+	origin_x, origin_y = bins[BINS_ORIGIN]
+	cell_size = bins[BINS_CELL_SIZE]
+	columns, rows = bins[BINS_SIZE]
+
+	cell_start = bins[BINS_CELL_START]
+	cell_entities = bins[BINS_CELL_ENTITIES]
+
+	player_x, player_y = player[PLAYER_POSITION][0], player[PLAYER_POSITION][1]
+
+	#A Vision Of Half A Turn Or More Can't Be Covered By A Triangle, So The Whole Reach Around The Player Is Looked At Instead
+	minimum_x, minimum_y = player_x - player[PLAYER_DISTANCE], player_y - player[PLAYER_DISTANCE]
+	maximum_x, maximum_y = player_x + player[PLAYER_DISTANCE], player_y + player[PLAYER_DISTANCE]
+
+	if player[PLAYER_VISION] < 180:
+		angle = numpy.radians(player[PLAYER_ANGLE])
+		half_vision = numpy.radians(player[PLAYER_VISION] / 2)
+		reach = player[PLAYER_DISTANCE] / numpy.cos(half_vision)
+
+		left_x, left_y = player_x + reach * numpy.cos(angle - half_vision), player_y + reach * numpy.sin(angle - half_vision)
+		right_x, right_y = player_x + reach * numpy.cos(angle + half_vision), player_y + reach * numpy.sin(angle + half_vision)
+
+		minimum_x, minimum_y = min(player_x, left_x, right_x), min(player_y, left_y, right_y)
+		maximum_x, maximum_y = max(player_x, left_x, right_x), max(player_y, left_y, right_y)
+
+	first_x = max(int(numpy.floor((minimum_x - SPRITE_CULL_MARGIN - origin_x) / cell_size)), 0)
+	first_y = max(int(numpy.floor((minimum_y - SPRITE_CULL_MARGIN - origin_y) / cell_size)), 0)
+	last_x = min(int(numpy.floor((maximum_x + SPRITE_CULL_MARGIN - origin_x) / cell_size)), columns - 1)
+	last_y = min(int(numpy.floor((maximum_y + SPRITE_CULL_MARGIN - origin_y) / cell_size)), rows - 1)
+
+	#Every Entity In A Cell Is Within Half Its Diagonal Of The Middle
+	radius = cell_size * .7072
+
+	for cell_y in range(first_y, last_y + 1):
+		for cell_x in range(first_x, last_x + 1):
+			cell = cell_y * columns + cell_x
+
+			if cell_start[cell] == cell_start[cell + 1]:
+				continue
+
+			if not is_area_seen(player, origin_x + (cell_x + .5) * cell_size, origin_y + (cell_y + .5) * cell_size, radius, buffer_width, half_height):
+				continue
+
+			for i in range(cell_start[cell], cell_start[cell + 1]):
+				entity = cell_entities[i]
+				count, seen = look_at_sprite(player, positions[entity, 0], positions[entity, 1], get_listed_count(sprite_list) + entity, sprite_order, sprite_distance, depth_tiles, count, seen, buffer_width, half_height)
+
+	return count, seen
+
+
+#Puts The Indices Of The Sprites That Can Be Seen In Sprite Order From Furthest To Closest, The Closest Is Drawn Last
+#The Sprite List Is Looked At Whole, Entities Only Where The Player Can See & Either Way Sprites Hidden By The Walls Are Skipped
+#Entities Come After The Sprite List, Sprites At The Same Distance Keep Their Order
+#Gives Back How Many Sprites Were Kept & How Many Could Be Seen
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def get_sprite_order(player, sprite_list, entities, sprite_order, sprite_distance, depth_tiles, buffer_width, half_height):
+	count = 0
+	seen = 0
+
+	for i in range(get_listed_count(sprite_list)):
+		x, y, z = get_listed_position(sprite_list, i)
+		count, seen = look_at_sprite(player, x, y, i, sprite_order, sprite_distance, depth_tiles, count, seen, buffer_width, half_height)
+
+	count, seen = gather_entities(player, sprite_list, entities, sprite_order, sprite_distance, depth_tiles, count, seen, buffer_width, half_height)
+	sort_sprites(sprite_order, sprite_distance, count)
+
+	return count, seen
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_entity_count(entities):
+	if entities is None:
+		return 0
+
+	return len(entities[ENTITIES_POSITION])
+
+
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_listed_count(sprite_list):
+	if sprite_list is None:
+		return 0
+
+	return len(sprite_list)
+
+
+#The Positions Of The Sprite List Can Be Written With Whole Numbers, Entities Always Use Floats
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_listed_position(sprite_list, index):
+	if sprite_list is None:
+		return (0.0, 0.0, 0.0)
+
+	position = sprite_list[index][SPRITE_POSITION]
+
+	return (float(position[0]), float(position[1]), float(position[2]))
+
+
+#Indices Past The Sprite List Are Entities, Every Entity Is Drawn With The Sprite Of Its Kind
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_sprite_position(sprite_list, entities, index):
+	if entities is None:
+		return get_listed_position(sprite_list, index)
+
+	if index < get_listed_count(sprite_list):
+		return get_listed_position(sprite_list, index)
+
+	positions = entities[ENTITIES_POSITION]
+	entity = index - get_listed_count(sprite_list)
+
+	return (positions[entity, 0], positions[entity, 1], positions[entity, 2])
+
+
+#The (Texture, Post Start, Post Runs) An Entity Is Drawn With, Counted From The First Entity
+#Unlike Is None, Isinstance Is Answered While Compiling Whatever The Type, So The Posts Of Nothing Never Have To Match A Palettized Texture
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_entity_posts(entities, entity):
+	if isinstance(entities, tuple):
+		sprite = entities[ENTITIES_SPRITES][entities[ENTITIES_KIND][entity]]
+
+		return sprite[SPRITE_TEXTURE], sprite[SPRITE_POST_START], sprite[SPRITE_POST_RUNS]
+
+	return UNSEEN_POSTS
+
+
+#The (Texture, Post Start, Post Runs) A Sprite Is Drawn With
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_sprite_posts(sprite_list, entities, index):
+	if isinstance(sprite_list, tuple):
+		if entities is None:
+			return sprite_list[index][SPRITE_TEXTURE], sprite_list[index][SPRITE_POST_START], sprite_list[index][SPRITE_POST_RUNS]
+
+		if index < len(sprite_list):
+			return sprite_list[index][SPRITE_TEXTURE], sprite_list[index][SPRITE_POST_START], sprite_list[index][SPRITE_POST_RUNS]
+
+	return get_entity_posts(entities, index - get_listed_count(sprite_list))
+
+
+#The Surfaces Of The Kinds Of Entities Come Right After Those Of The Sprite List
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_sprite_surface(sprite_list, entities, index):
+	if entities is None:
+		return index
+
+	if index < get_listed_count(sprite_list):
+		return index
+
+	return get_listed_count(sprite_list) + entities[ENTITIES_KIND][index - get_listed_count(sprite_list)]
+
+
+#Entities Move, So Instead Of Being Lit When The Lights Are Binned They Gather The Lights Of Their Sector Where They Stand
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_sprite_lighting(lights, baked_sprites, light_data, sector_start, sector_lights, falloff, sprite_list, entities, index, x, y):
+	if entities is None:
+		return add_light(get_sprite_light(lights, index), get_baked_sprite(baked_sprites, index))
+
+	if index < get_listed_count(sprite_list):
+		return add_light(get_sprite_light(lights, index), get_baked_sprite(baked_sprites, index))
+
+	return gather_light(light_data, sector_start, sector_lights, falloff, entities[ENTITIES_SECTOR][index - get_listed_count(sprite_list)], x, y)
+
+
+#The (Distance, Inverse Distance) Of A Row, The Horizon Row Gives Back 0 For Both
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def work_out_row(y, buffer_height):
+	interpolation = 2 * y - buffer_height
+
+	if interpolation == 0:
+		return 0.0, 0.0
+
+	return buffer_height / interpolation, interpolation / buffer_height
+
+
+#Works Out Every Row Once Per Frame, So Floors & Ceilings Look Their Distance Up Instead Of Dividing For Every Pixel
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def fill_rows(rows, buffer_height):
+	for y in range(min(len(rows), buffer_height)):
+		rows[y, ROW_DISTANCE], rows[y, ROW_INVERSE_DISTANCE] = work_out_row(y, buffer_height)
+
+
+#Rows Past The End Of The Table Are Worked Out On The Spot
+@jit(nopython=True, nogil=True, cache=True, fastmath=True, inline="always")
+def get_row(rows, y, buffer_height):
+	if y < len(rows):
+		return rows[y, ROW_DISTANCE], rows[y, ROW_INVERSE_DISTANCE]
+
+	return work_out_row(y, buffer_height)
+
+
+#Keeps Where A Sprite Is Drawn In A Column, The Rows, Height & Screen Position Are Whole Pixels
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def set_sprite_span(sprite_spans, index, top, bottom, height, x, darkness):
+	sprite_spans[index, SPRITE_SPAN_TOP] = int(top)
+	sprite_spans[index, SPRITE_SPAN_BOTTOM] = int(bottom)
+	sprite_spans[index, SPRITE_SPAN_HEIGHT] = int(height)
+	sprite_spans[index, SPRITE_SPAN_X] = int(x)
+	sprite_spans[index, SPRITE_SPAN_DARKNESS] = darkness
+
+
+#Scan The Entire Screen From Left To Right & Render The Walls & Floors
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def scan_line(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch):
+	render_columns(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch, None)
+
+
+#Walks The Same Columns As The Scan Line, But Only Fills The G-Buffer, Shade G-Buffer Turns It Into Colors Afterwards
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def scan_gbuffer(player, level, wall_grid, sky, gbuffer, sprite_list, entities, lights, lightmaps, scratch):
+	render_columns(player, level, wall_grid, sky, None, gbuffer[GBUFFER_SURFACE], sprite_list, entities, lights, lightmaps, scratch, gbuffer)
+
+
+#Everything Drawn Goes Through Write Texel, So The Same Traversal Either Shades Straight Away Or Fills A G-Buffer
+#The Buffer Is Only Written To Without A G-Buffer, Otherwise It Just Gives The Size Of The Screen
+#Nothing Is Allocated Here, Everything That Changes From Column To Column Is Kept In The Scratch Arrays
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def render_columns(player, level, wall_grid, sky, palette, buffer, sprite_list, entities, lights, lightmaps, scratch, gbuffer):
+	#Obtain The Interval Angle To Rotate Correctly
+	interval_angle = player[2] / buffer.shape[0]
+	half_height = buffer.shape[1] / 2
+
+	#The Ray State & Pending Hits Are Reused By Every Column
+	ray = scratch[SCRATCH_RAY]
+	pending = scratch[SCRATCH_PENDING]
+	visited = scratch[SCRATCH_VISITED]
+
+	#Walls Are Marked With The Column That Last Intersected Them, So The Marks Of The Last Frame Have To Go
+	for index in range(len(visited)):
+		visited[index] = 0
+
+	#Find Out Once Which Columns Every Wall Can Be Seen In, So Each Column Only Tests The Walls That Cover It
+	wall_columns = scratch[SCRATCH_WALL_COLUMNS]
+	cull_walls(player, wall_grid, buffer.shape[0], wall_columns)
+
+	#The Rows Of A Column That Nothing Was Drawn Over, These Get The Sky Instead Of Clearing The Whole Buffer
+	sky_spans = scratch[SCRATCH_SKY_SPANS]
+	sky_columns = sky[SKY_COLUMNS]
+
+	#Every Wall Crossed Is Kept For The Sprites, Which Are Drawn Once All The Walls Are
+	crossings = scratch[SCRATCH_CROSSINGS]
+	crossing_start = scratch[SCRATCH_CROSSING_START]
+	crossing_count = 0
+
+	overflow = scratch[SCRATCH_OVERFLOW]
+	overflow[OVERFLOW_WALLS] = max(len(level) - len(visited), 0)
+
+	light_data, sector_start, sector_lights, falloff = unpack_lights(lights)
+
+	baked = unpack_lightmaps(lightmaps)
+	inverse_cell_size = baked[LIGHTMAP_INVERSE_CELL_SIZE]
+
+	rows = scratch[SCRATCH_ROWS]
+	fill_rows(rows, buffer.shape[1])
+
+	for x in range(buffer.shape[0]):
+		final_position = (0, 0, 0, 0)
+
+		#Translate All Points According To Angle
+		translated_angle = numpy.radians((player[PLAYER_ANGLE] - player[PLAYER_VISION] / 2) + interval_angle * x)
+
+		translated_point = (
+			(player[PLAYER_POSITION][0], player[PLAYER_POSITION][1]),
+			(player[PLAYER_POSITION][0] + player[PLAYER_DISTANCE] * numpy.cos(translated_angle), player[PLAYER_POSITION][1] + player[PLAYER_DISTANCE] * numpy.sin(translated_angle)))
+
+		#A Row Of The Floor Is Further Away Along The Ray Than Straight Ahead, The Fish-Eye Correction Of The Column Gives How Much
+		fish_eye = numpy.cos(translated_angle - numpy.radians(player[PLAYER_ANGLE]))
+		inverse_fish_eye = 1 / fish_eye
+
+		floor_direction = (numpy.cos(translated_angle) * inverse_fish_eye, numpy.sin(translated_angle) * inverse_fish_eye)
+
+		#We Get The Intersected Walls From Closest To Furthest, But Only As Many As We Need
+		start_ray(translated_point, wall_grid, ray)
+		intersected_wall = get_closest_wall(translated_point, wall_grid, wall_columns, ray, pending, visited, x)
+
+		#Previous Wall Information For Comparision
+		previous_floor_height = (0, 0)
+		previous_ceiling_height = (0, 0)
+		previous_distance = 0.0
+		previous_segment = -1
+
+		#Columns Past The Size Of The Scratch Arrays Have Nowhere To Keep Their Crossings
+		crossing_column = x + 1 < len(crossing_start)
+
+		if crossing_column:
+			crossing_start[x] = crossing_count
+
+		wall = 0
+		column_closed = False
+
+		sky_column = sky_columns[int(numpy.degrees(translated_angle) % 360 / 360 * len(sky_columns)) % len(sky_columns)]
+		sky_count = 0
+
+		#The Rows That Can Still Be Seen Through Everything Drawn So Far
+		window_top = 0
+		window_bottom = buffer.shape[1]
+
+		while intersected_wall[INTERSECTED_WALL] != -1:
+			#We Look One Wall Ahead, As The First Wall Needs To Know The Segment After It
+			#Hits Come Back As (Distance, Texture Distance, Wall Index, Segment)
+			next_intersected_wall = get_closest_wall(translated_point, wall_grid, wall_columns, ray, pending, visited, x)
+
+			wall_reference = (intersected_wall[INTERSECTED_DISTANCE], intersected_wall[INTERSECTED_TEXTURE_DISTANCE], level[intersected_wall[INTERSECTED_WALL]], next_intersected_wall[3])
+
+			if wall_reference[INTERSECTED_DISTANCE] != 0:
+
+				#Fix The Distance To Remove The Fish-Eye Distortion
+				fixed_distance = wall_reference[INTERSECTED_DISTANCE] * numpy.cos(translated_angle - numpy.radians(player[PLAYER_ANGLE]))
+				segment = wall_reference[INTERSECTED_WALL][WALL_SEGMENT]
+
+				wall_height = (half_height / fixed_distance)
+
+				#Get The Repeated Texture Coordinate
+				texture_distance = wall_reference[INTERSECTED_TEXTURE_DISTANCE] % 1
+
+				#We Get All The Wall Heights To Be Drawn Later
+				floor_height = (
+					clamp_in_order((half_height + wall_height) - 2 * wall_height * (wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT] + player[PLAYER_OFFSET]), 0, buffer.shape[1]),
+					clamp_in_order((half_height + wall_height) - 2 * wall_height * (player[PLAYER_OFFSET]), 0, buffer.shape[1]))
+					
+				
+				ceiling_height = (
+					clamp_in_order((half_height - wall_height) + 2 * wall_height * (-player[PLAYER_OFFSET]), 0, buffer.shape[1]), 
+					clamp_in_order((half_height - wall_height) + 2 * wall_height * (wall_reference[INTERSECTED_WALL][WALL_CEILING_HEIGHT] - player[PLAYER_OFFSET]), 0, buffer.shape[1]))
+				
+				cull_wall = False
+
+				#If There Was A Previous Wall Already Rendered, We Clamp The Values To Avoid Overdraw
+				if wall > 0:
+					floor_height = (
+						clamp_in_order(floor_height[0], previous_ceiling_height[1], previous_floor_height[0]),
+						clamp_in_order(floor_height[1], previous_ceiling_height[1], previous_floor_height[0]))
+
+					ceiling_height = (
+						clamp_in_order(ceiling_height[0], previous_ceiling_height[1], previous_floor_height[0]),
+						clamp_in_order(ceiling_height[1], previous_ceiling_height[1], previous_floor_height[0]))
+
+					#If The Previous Wall Segment Was The Same, We Are Going To Draw The Floor Instead
+					if wall_reference[INTERSECTED_WALL][WALL_SEGMENT] == previous_segment:
+						cull_wall = True
+
+				floor_length = previous_floor_height[0]
+				ceiling_length = previous_ceiling_height[1]
+
+				#This Will Only Apply For The First Wall
+				#Every Segment Requires 3 Or 4 Points, If There Is Not Another Point Detected Then It Is Guranteed That The Player Is Stepping On Top Of The Segment
+				if wall == 0:
+					#The Next Segment Is -1 When This Is The Last Wall Intersected
+					if wall_reference[INTERSECTED_WALL][WALL_SEGMENT] != wall_reference[INTERSECTED_NEXT_SEGMENT]:
+						cull_wall = True
+						floor_length = buffer.shape[1]
+						ceiling_length = 0
+
+				wall_surface = get_surface(gbuffer, intersected_wall[INTERSECTED_WALL])
+				floor_surface = get_surface(gbuffer, len(level) + intersected_wall[INTERSECTED_WALL])
+
+				#Lights Only Depend On Where Along The Floor A Wall Is Hit, So The Whole Wall Span Shares One Value
+				wall_light = gather_light(light_data, sector_start, sector_lights, falloff, segment,
+					player[PLAYER_POSITION][0] + wall_reference[INTERSECTED_DISTANCE] * numpy.cos(translated_angle),
+					player[PLAYER_POSITION][1] + wall_reference[INTERSECTED_DISTANCE] * numpy.sin(translated_angle))
+
+				wall_light = add_light(wall_light, get_baked_wall(baked[LIGHTMAP_WALL_START], baked[LIGHTMAP_WALLS], inverse_cell_size, intersected_wall[INTERSECTED_WALL], wall_reference[INTERSECTED_TEXTURE_DISTANCE]))
+
+				#Here We Will Draw The Walls
+				#Rows Are Counted Up From The Bottom Of The Wall, So The Texture Rows Above It Are Negative & Have To Be Wrapped Around, Numba Only Does So Once
+				if cull_wall == False:
+					for y in range(floor_height[0], floor_height[1]):
+						darkness = clamp_in_order(lerp(0, 1, 1 / fixed_distance), 0, 1)
+						write_texel(buffer, gbuffer, palette, x, y, wall_reference[INTERSECTED_WALL][WALL_TEXTURE], wall_surface, int(texture_distance * 64), int((y - ((half_height + wall_height) - 2 * wall_height * player[PLAYER_OFFSET])) / wall_height * 32) % wall_reference[INTERSECTED_WALL][WALL_TEXTURE].shape[1], fixed_distance, darkness, wall_light)
+
+					for y in range(ceiling_height[0], ceiling_height[1]):
+						darkness = clamp_in_order(lerp(0, 1, 1 / fixed_distance), 0, 1)
+						write_texel(buffer, gbuffer, palette, x, y, wall_reference[INTERSECTED_WALL][WALL_TEXTURE], wall_surface, int(texture_distance * 64), int((y - ((half_height + wall_height) - 2 * wall_height * player[PLAYER_OFFSET])) / wall_height * 32) % wall_reference[INTERSECTED_WALL][WALL_TEXTURE].shape[1], fixed_distance, darkness, wall_light)
+
+				else:
+					#We Render The Floor, Every Row Looks Up Its Distance & Steps Along The Ray Of This Column
+					floor_scale = 1 - (wall_reference[INTERSECTED_WALL][WALL_FLOOR_HEIGHT] + player[PLAYER_OFFSET]) * 2
+
+					for y in range(floor_height[0], floor_length):
+						row_distance, row_inverse_distance = get_row(rows, y, buffer.shape[1])
+
+						if row_distance != 0:
+							floor_distance = row_distance * inverse_fish_eye
+
+							translated_floor_point = (
+								player[PLAYER_POSITION][0] + row_distance * floor_scale * floor_direction[0],
+								player[PLAYER_POSITION][1] + row_distance * floor_scale * floor_direction[1])
+
+							#Floors Hidden By Nearby Steps Are Darkened As If They Were Further Away, So The Shading Pass Darkens Them The Same
+							baked_floor = get_baked_flat(baked[LIGHTMAP_SECTOR_ORIGIN], baked[LIGHTMAP_SECTOR_SIZE], baked[LIGHTMAP_SECTOR_START], baked[LIGHTMAP_FLOORS], inverse_cell_size, segment, translated_floor_point[0], translated_floor_point[1])
+							floor_light = add_light(gather_light(light_data, sector_start, sector_lights, falloff, segment, translated_floor_point[0], translated_floor_point[1]), baked_floor)
+
+							darkness = clamp_in_order(lerp(0, 1, row_inverse_distance * fish_eye * baked_floor[3]), 0, 1)
+							write_texel(buffer, gbuffer, palette, x, y, wall_reference[INTERSECTED_WALL][WALL_FLOOR_TEXTURE], floor_surface, int((translated_floor_point[0] * 64) % 64), int((translated_floor_point[1] * 64) % 64), floor_distance / baked_floor[3], darkness, floor_light)
+
+					#And We Finally Draw The Ceiling, Rows Above The Horizon Come Out With Negative Distances
+					ceiling_scale = -(1 - (wall_reference[INTERSECTED_WALL][WALL_CEILING_HEIGHT] - player[PLAYER_OFFSET]) * 2)
+
+					for y in range(ceiling_length, ceiling_height[1]):
+						row_distance, row_inverse_distance = get_row(rows, y, buffer.shape[1])
+
+						if row_distance != 0:
+							floor_distance = row_distance * inverse_fish_eye
+
+							translated_floor_point = (
+								player[PLAYER_POSITION][0] + row_distance * ceiling_scale * floor_direction[0],
+								player[PLAYER_POSITION][1] + row_distance * ceiling_scale * floor_direction[1])
+
+							baked_ceiling = get_baked_flat(baked[LIGHTMAP_SECTOR_ORIGIN], baked[LIGHTMAP_SECTOR_SIZE], baked[LIGHTMAP_SECTOR_START], baked[LIGHTMAP_CEILINGS], inverse_cell_size, segment, translated_floor_point[0], translated_floor_point[1])
+							ceiling_light = add_light(gather_light(light_data, sector_start, sector_lights, falloff, segment, translated_floor_point[0], translated_floor_point[1]), baked_ceiling)
+
+							darkness = clamp_in_order(lerp(0, 1, -row_inverse_distance * fish_eye * baked_ceiling[3]), 0, 1)
+							write_texel(buffer, gbuffer, palette, x, y, wall_reference[INTERSECTED_WALL][WALL_FLOOR_TEXTURE], floor_surface, int((translated_floor_point[0] * 64) % 64), int((translated_floor_point[1] * 64) % 64), -floor_distance / baked_ceiling[3], darkness, ceiling_light)
+				
+				#Sprites In Front Of The First Wall Can Use The Whole Column, Those Further Away Only What Was Left Open By The Walls Before
+				if crossing_column and crossing_count < len(crossings):
+					crossings[crossing_count, CROSSING_DISTANCE] = wall_reference[INTERSECTED_DISTANCE]
+
+					if wall == 0:
+						crossings[crossing_count, CROSSING_PREVIOUS_DISTANCE] = -1
+						crossings[crossing_count, CROSSING_WINDOW_TOP] = 0
+						crossings[crossing_count, CROSSING_WINDOW_BOTTOM] = buffer.shape[1]
+
+					else:
+						crossings[crossing_count, CROSSING_PREVIOUS_DISTANCE] = previous_distance
+						crossings[crossing_count, CROSSING_WINDOW_TOP] = previous_ceiling_height[1]
+						crossings[crossing_count, CROSSING_WINDOW_BOTTOM] = previous_floor_height[0]
+
+					crossing_count += 1
+
+				#Any Part Of The Window That Was Closed Without Being Drawn Over Is Left For The Sky
+				if cull_wall == False:
+					sky_count = add_sky_span(sky, sky_spans, sky_count, window_top, ceiling_height[0], x, sky_column, buffer, gbuffer)
+					sky_count = add_sky_span(sky, sky_spans, sky_count, floor_height[1], window_bottom, x, sky_column, buffer, gbuffer)
+
+				#The Floors Are Drawn Up To The Previous Wall, Which Only Leaves A Gap When Every Wall Before Was Hit Right At The Player
+				#They Also Skip The Horizon Row, As It Is Infinitely Far Away
+				else:
+					sky_count = add_sky_span(sky, sky_spans, sky_count, window_top, ceiling_length, x, sky_column, buffer, gbuffer)
+					sky_count = add_sky_span(sky, sky_spans, sky_count, floor_length, window_bottom, x, sky_column, buffer, gbuffer)
+
+					if half_height == int(half_height):
+						if (int(floor_height[0]) <= half_height and half_height < int(floor_length)) or (int(ceiling_length) <= half_height and half_height < int(ceiling_height[1])):
+							sky_count = add_sky_span(sky, sky_spans, sky_count, half_height, half_height + 1, x, sky_column, buffer, gbuffer)
+
+				#These Are Stored For Later Comparisions
+				previous_floor_height = floor_height
+				previous_ceiling_height = ceiling_height
+
+				window_top = previous_ceiling_height[1]
+				window_bottom = previous_floor_height[0]
+
+				#Once The Ceiling Reaches The Floor The Column Is Closed, Nothing Further Away Can Be Seen
+				column_closed = previous_ceiling_height[1] >= previous_floor_height[0]
+
+			previous_distance = wall_reference[INTERSECTED_DISTANCE]
+			previous_segment = wall_reference[INTERSECTED_WALL][WALL_SEGMENT]
+
+			if column_closed:
+				break
+
+			intersected_wall = next_intersected_wall
+			wall += 1
+
+		#Whatever Is Still Open Sees Past Every Wall, The Sky Is Drawn Before The Sprites So They Stay On Top
+		sky_count = add_sky_span(sky, sky_spans, sky_count, window_top, window_bottom, x, sky_column, buffer, gbuffer)
+		draw_sky_spans(sky, sky_spans, sky_count, x, sky_column, buffer, gbuffer)
+
+		if crossing_column:
+			crossing_start[x + 1] = crossing_count
+
+	#With Every Column Done It Is Known How Far Each Can See, So Sprites Hidden By The Walls Are Left Out Before Being Sorted
+	depth_tiles = scratch[SCRATCH_DEPTH_TILES]
+	fill_depth_tiles(crossings, crossing_start, buffer.shape[0], depth_tiles)
+
+	sprite_order = scratch[SCRATCH_SPRITE_ORDER]
+	sprite_spans = scratch[SCRATCH_SPRITE_SPANS]
+	sprite_count, sprites_seen = get_sprite_order(player, sprite_list, entities, sprite_order, scratch[SCRATCH_SPRITE_DISTANCE], depth_tiles, buffer.shape[0], half_height)
+
+	overflow[OVERFLOW_SPRITES] = sprites_seen - sprite_count
+
+	#Every Column Looks At Where The Sprites Are, Which Is Quicker To Read From An Array Than From The Sprite List
+	sprite_position = scratch[SCRATCH_SPRITE_POSITION]
+
+	sprite_screen = scratch[SCRATCH_SPRITE_SCREEN]
+
+	for i in range(sprite_count):
+		sprite_position[i, 0], sprite_position[i, 1], sprite_position[i, 2] = get_sprite_position(sprite_list, entities, sprite_order[i])
+
+		dx = sprite_position[i, 0] - player[PLAYER_POSITION][0]
+		dy = sprite_position[i, 1] - player[PLAYER_POSITION][1]
+
+		dist = numpy.sqrt(dx * dx + dy * dy)
+
+		sprite_screen[i, SCREEN_X], sprite_screen[i, SCREEN_HEIGHT] = find_sprite_columns(player, dx, dy, dist, buffer.shape[0], half_height)
+		sprite_screen[i, SCREEN_DARKNESS] = clamp_in_order(lerp(0, 1, 1 / dist), 0, 1)
+		sprite_screen[i, SCREEN_DISTANCE] = dist
+
+	for x in range(min(buffer.shape[0], len(crossing_start) - 1)):
+		#A Sprite Is Drawn Within The Window Of The First Wall Crossed Behind It
+		for i in range(sprite_count):
+			for field in range(SPRITE_SPAN_DARKNESS + 1):
+				sprite_spans[i, field] = 0
+
+			x_pos = sprite_screen[i, SCREEN_X]
+			sprite_height = sprite_screen[i, SCREEN_HEIGHT]
+			darkness = sprite_screen[i, SCREEN_DARKNESS]
+			dist = sprite_screen[i, SCREEN_DISTANCE]
+
+			if x > x_pos - sprite_height and x < x_pos + sprite_height:
+				for crossing in range(crossing_start[x], crossing_start[x + 1]):
+					if dist < crossings[crossing, CROSSING_DISTANCE] and dist > crossings[crossing, CROSSING_PREVIOUS_DISTANCE]:
+						crossing_top = crossings[crossing, CROSSING_WINDOW_TOP]
+						crossing_bottom = crossings[crossing, CROSSING_WINDOW_BOTTOM]
+
+						set_sprite_span(sprite_spans, i, clamp_in_order((half_height - sprite_height) + 2 * sprite_height * (-player[PLAYER_OFFSET] + sprite_position[i, 2]), crossing_top, crossing_bottom), clamp_in_order((half_height + sprite_height) - 2 * sprite_height * (player[PLAYER_OFFSET] + sprite_position[i, 2]), crossing_top, crossing_bottom), sprite_height, x_pos, darkness)
+						break
+
+		#We Will Draw The Sprites Here As Overlays, Only The Opaque Runs Of The Texture Column Are Visited
+		for i in range(sprite_count):
+			sprite_top = int(sprite_spans[i, SPRITE_SPAN_TOP])
+			sprite_bottom = int(sprite_spans[i, SPRITE_SPAN_BOTTOM])
+			sprite_height = int(sprite_spans[i, SPRITE_SPAN_HEIGHT])
+			sprite_x = int(sprite_spans[i, SPRITE_SPAN_X])
+			sprite_darkness = sprite_spans[i, SPRITE_SPAN_DARKNESS]
+
+			if sprite_top >= sprite_bottom or sprite_height == 0:
+				continue
+
+			sprite_texture, post_start, post_runs = get_sprite_posts(sprite_list, entities, sprite_order[i])
+
+			sprite_surface = get_surface(gbuffer, 2 * len(level) + get_sprite_surface(sprite_list, entities, sprite_order[i]))
+			sprite_light = get_sprite_lighting(lights, baked[LIGHTMAP_SPRITES], light_data, sector_start, sector_lights, falloff, sprite_list, entities, sprite_order[i], sprite_position[i, 0], sprite_position[i, 1])
+			sprite_distance = sprite_screen[i, SCREEN_DISTANCE]
+
+			sprite_floor = (half_height + sprite_height) - 2 * sprite_height * (player[PLAYER_OFFSET] + sprite_position[i, 2])
+			texture_x = int((x - (sprite_x + sprite_height)) / sprite_height * 32) % sprite_texture.shape[0]
+
+			for run in range(post_start[texture_x], post_start[texture_x + 1]):
+				run_top, run_bottom = post_runs[run, 0], post_runs[run, 1]
+
+				#The Rows Of A Run Are Turned Back Into Screen Rows With A Pixel To Spare, Each Pixel Then Checks Its Own Row
+				#Rows Below The Bottom Of The Sprite Wrap Around To The Top Of The Texture, So Every Run Is Also Checked Once More There
+				for wrap in range(2):
+					span_top = max(sprite_top, int(sprite_floor + (run_top - 65 + 64 * wrap) * sprite_height / 32) - 1)
+					span_bottom = min(sprite_bottom, int(sprite_floor + (run_bottom - 65 + 64 * wrap) * sprite_height / 32) + 2)
+
+					for y_loop in range(span_top, span_bottom):
+						texture_y = int((y_loop - sprite_floor) / sprite_height * 32) % sprite_texture.shape[1]
+
+						if texture_y >= run_top and texture_y < run_bottom:
+							write_texel(buffer, gbuffer, palette, x, y_loop, sprite_texture, sprite_surface, texture_x, texture_y, sprite_distance, sprite_darkness, sprite_light)
+
+
+#Turns The Records Of The G-Buffer Into Colors, Only For The Rows From First Row Up To Last Row
+#Nothing Here Depends On Any Other Pixel, So Bands Of Rows Can Be Shaded On Different Threads
+@jit(nopython=True, nogil=True, cache=True, fastmath=True)
+def shade_gbuffer(gbuffer, atlas, buffer, first_row, last_row):
+	texels = atlas[ATLAS_TEXELS]
+
+	for x in range(buffer.shape[0]):
+		for y in range(first_row, last_row):
+			surface = gbuffer[GBUFFER_SURFACE][x, y]
+			width = atlas[ATLAS_WIDTH][surface]
+			height = atlas[ATLAS_HEIGHT][surface]
+
+			color_value = texels[atlas[ATLAS_OFFSET][surface] + (gbuffer[GBUFFER_U][x, y] % width) * height + gbuffer[GBUFFER_V][x, y] % height]
+
+			#The Same Darkening As The Scan Line, Anything Closer Than 1 Isn't Darkened At All
+			darkness = 1.0
+
+			if gbuffer[GBUFFER_DEPTH][x, y] > 1:
+				darkness = 1 / gbuffer[GBUFFER_DEPTH][x, y]
+
+			red = min(darkness + gbuffer[GBUFFER_LIGHT][x, y, 0], 1.0)
+			green = min(darkness + gbuffer[GBUFFER_LIGHT][x, y, 1], 1.0)
+			blue = min(darkness + gbuffer[GBUFFER_LIGHT][x, y, 2], 1.0)
+
+			buffer[x, y] = mix(convert_int_rgb(color_value), (red, green, blue))
+
+
+#Shades A Whole Frame, With A Thread Pool The Rows Are Split Into Bands That Are Shaded At The Same Time
+def shade_frame(gbuffer, atlas, buffer, pool=None, bands=4):
+	if pool is None:
+		shade_gbuffer(gbuffer, atlas, buffer, 0, buffer.shape[1])
+		return
+
+	edges = numpy.linspace(0, buffer.shape[1], bands + 1).astype(numpy.int64)
+
+	for future in [pool.submit(shade_gbuffer, gbuffer, atlas, buffer, edges[i], edges[i + 1]) for i in range(bands)]:
+		future.result()
@@ -0,0 +1,118 @@
+import time
+
+import numpy
+import pygame
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+STAGE_EVENTS, STAGE_PHYSICS, STAGE_RENDER, STAGE_PRESENT, STAGE_FRAME, STAGE_LATENCY, STAGE_SHADE, STAGE_STREAM, STAGE_LEFT_OUT = 0, 1, 2, 3, 4, 5, 6, 7, 8
+
+#With Deferred Shading The Render Stage Only Covers Walking The Level, Shading The G-Buffer Is Timed On Its Own
+#Left Out Isn't A Time, It Is How Many Wanted Chunks The Streamer Had No Room For, So Missing Geometry Shows Up In The Timings
+STAGE_NAMES = ("Events", "Physics", "Render", "Present", "Frame", "Latency", "Shade", "Stream", "Left Out")
+
+
+#--------------------------------
+#Classes
+#--------------------------------
+
+
+#Keeps The Timings Of The Last Few Frames In A Ring Buffer, Every Row Is One Frame & Every Column Is One Stage In Milliseconds
+#Nothing Is Allocated While Recording, So It Can Stay On All The Time
+#The Latency Is From The Input Being Read To The Frame Showing It Being Flipped, Frames Without Any Input Leave It Empty (NaN)
+class Telemetry:
+	def __init__(self, capacity):
+		self.timings = numpy.zeros((capacity, len(STAGE_NAMES)), dtype=numpy.float64)
+		self.timings[:, STAGE_LATENCY] = numpy.nan
+		self.frame_count = 0
+
+		self.frame_start = time.perf_counter_ns()
+		self.stage_start = self.frame_start
+
+	#The Row That The Current Frame Is Written Into
+	def row(self):
+		return self.frame_count % len(self.timings)
+
+	def begin_stage(self):
+		self.stage_start = time.perf_counter_ns()
+
+	#Stages Can Be Ended More Than Once In A Frame, The Time Is Added Up
+	def end_stage(self, stage):
+		self.timings[self.row(), stage] += (time.perf_counter_ns() - self.stage_start) / 1e6
+
+	#Sets A Value That Isn't Timed As A Stage, Like The Latency
+	def record(self, stage, milliseconds):
+		self.timings[self.row(), stage] = milliseconds
+
+	def end_frame(self):
+		now = time.perf_counter_ns()
+
+		self.timings[self.row(), STAGE_FRAME] = (now - self.frame_start) / 1e6
+		self.frame_start = now
+		self.frame_count += 1
+
+		#Clear The Next Row, As It May Still Hold A Frame From The Last Time Around
+		self.timings[self.row()] = 0
+		self.timings[self.row(), STAGE_LATENCY] = numpy.nan
+
+	#Only The Frames That Were Finished, From Oldest To Newest, The Row Of The Current Frame Is Left Out
+	def recorded(self):
+		if self.frame_count < len(self.timings):
+			return self.timings[:self.frame_count]
+
+		return numpy.roll(self.timings, -(self.row() + 1), axis=0)[:-1]
+
+	#Gives Back The Percentiles Of Every Stage Over The Frames In The Buffer, One Row Per Percentile
+	#Empty Values Are Left Out, A Stage Without Any Values Gives Back NaN
+	def percentiles(self, percentiles):
+		if self.frame_count == 0:
+			return numpy.zeros((len(percentiles), len(STAGE_NAMES)))
+
+		return numpy.nanpercentile(self.recorded(), percentiles, axis=0)
+
+	#The Frame Rate Is Averaged Over The Last Few Frames, So It Doesn't Jump Around Every Frame
+	def frame_rate(self, frames):
+		recent = self.recorded()[-frames:, STAGE_FRAME]
+
+		if len(recent) == 0 or recent.sum() == 0:
+			return 0
+
+		return 1000 * len(recent) / recent.sum()
+
+	def dump_csv(self, path):
+		numpy.savetxt(path, self.recorded(), fmt="%.4f", delimiter=",", header=",".join(STAGE_NAMES), comments="")
+
+
+#Draws A Label Followed By A Number, Every Glyph Is Only Rendered Once When Created
+#Only The Digits That Changed Since The Last Frame Get Redrawn On The Cached Surface
+class CachedCounter:
+	def __init__(self, font, label, digits, color):
+		self.glyphs = {character: font.render(character, False, color) for character in "0123456789-"}
+		self.glyph_width = max(glyph.get_width() for glyph in self.glyphs.values())
+
+		label_surface = font.render(label, False, color)
+		self.label_width = label_surface.get_width()
+
+		self.surface = pygame.Surface((self.label_width + self.glyph_width * digits, font.get_height()), pygame.SRCALPHA)
+		self.surface.blit(label_surface, (0, 0))
+
+		self.shown = [" "] * digits
+
+	def draw(self, target, position, value):
+		text = str(int(value)).ljust(len(self.shown))[:len(self.shown)]
+
+		for i in range(len(self.shown)):
+			if text[i] != self.shown[i]:
+				digit_position = (self.label_width + i * self.glyph_width, 0)
+
+				self.surface.fill((0, 0, 0, 0), (digit_position, (self.glyph_width, self.surface.get_height())))
+
+				if text[i] != " ":
+					self.surface.blit(self.glyphs[text[i]], digit_position)
+
+				self.shown[i] = text[i]
+
+		target.blit(self.surface, position)
@@ -0,0 +1,73 @@
+import hashlib
+import io
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import pygame
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+CACHE_DIRECTORY = "texture_cache"
+
+#Changed Whenever Textures Are Decoded Differently, So Arrays Cached Before Aren't Used Any More
+CACHE_VERSION = b"1"
+
+#Decoding Waits On Pygame With The GIL Let Go, So More Threads Than Cores Still Help With Slow Disks
+WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Converted To 32 Bits Instead Of To The Display, Which Gives The Same Colors As On The Game's Display Without Needing A Display Mode
+#So It Is Safe From Any Thread, Every Pixel Is 0xRRGGBB
+def decode_texture(data, name):
+	return pygame.surfarray.array2d(pygame.image.load(io.BytesIO(data), name).convert(32, 0))
+
+
+#Textures Are Cached By What Is In The File, So A Changed File Is Decoded Again Even If It Keeps Its Name & Date
+def get_cache_path(data, directory):
+	return os.path.join(directory, hashlib.sha1(CACHE_VERSION + data).hexdigest() + ".npy")
+
+
+#Cached Textures Are Mapped Instead Of Read, Copy On Write Keeps The File As It Is If The Texture Is Ever Changed
+#The Map Is Handed Out As A Plain Array, So The Scan Line Is Given The Same Type As With A Decoded Texture
+def load_cached_texture(path, directory):
+	with open(path, "rb") as file:
+		data = file.read()
+
+	cache_path = get_cache_path(data, directory)
+
+	if os.path.exists(cache_path):
+		return numpy.load(cache_path, mmap_mode="c").view(numpy.ndarray)
+
+	texture = decode_texture(data, path)
+
+	#It Is Written Under Another Name First, So Another Start Running At The Same Time Never Maps Half Of It
+	temporary_path = cache_path + "." + str(os.getpid()) + ".tmp"
+
+	with open(temporary_path, "wb") as file:
+		numpy.save(file, texture)
+
+	os.replace(temporary_path, cache_path)
+
+	return texture
+
+
+#Loads Every Texture In The Same Order As The Paths, Decoding Only Those That Aren't Cached Yet
+#Without A Pool The Textures Are Loaded Over A Pool Of Their Own
+def load_textures(paths, directory=CACHE_DIRECTORY, pool=None):
+	os.makedirs(directory, exist_ok=True)
+
+	if pool is None:
+		with ThreadPoolExecutor(WORKERS) as pool:
+			return load_textures(paths, directory, pool)
+
+	return list(pool.map(load_cached_texture, paths, [directory] * len(paths)))
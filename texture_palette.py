@@ -0,0 +1,106 @@
+import numpy
+
+from segment_kernel import WALL_TEXTURE, WALL_FLOOR_TEXTURE, SPRITE_TEXTURE
+
+#--------------------------------
+#Enumerations
+#--------------------------------
+
+
+#Indices Are Stored As Bytes, So A Palette Can Never Be Bigger Than This
+PALETTE_SIZE = 256
+
+
+#--------------------------------
+#Functions
+#--------------------------------
+
+
+#Splits Colors Into Their Red, Green & Blue Channels, One Row Per Color
+def split_channels(colors):
+	return numpy.stack(((colors >> 16) & 0xff, (colors >> 8) & 0xff, colors & 0xff), axis=1).astype(numpy.float64)
+
+
+#Median Cut, The Box With The Widest Channel Is Split In Half By Pixel Count Until There Are Enough Boxes
+#Every Box Then Becomes One Color, The Average Of The Pixels Inside It
+def median_cut(colors, counts, size):
+	channels = split_channels(colors)
+	boxes = [numpy.arange(len(colors))]
+
+	while len(boxes) < size:
+		widths = [(channels[box].max(axis=0) - channels[box].min(axis=0)).max() if len(box) > 1 else -1 for box in boxes]
+		widest = int(numpy.argmax(widths))
+
+		if widths[widest] <= 0:
+			break
+
+		box = boxes.pop(widest)
+		channel = numpy.argmax(channels[box].max(axis=0) - channels[box].min(axis=0))
+
+		box = box[numpy.argsort(channels[box, channel], kind="stable")]
+		middle = numpy.searchsorted(numpy.cumsum(counts[box]), counts[box].sum() / 2)
+		middle = min(max(middle, 1), len(box) - 1)
+
+		boxes.extend((box[:middle], box[middle:]))
+
+	palette = []
+
+	for box in boxes:
+		average = (channels[box] * counts[box, None]).sum(axis=0) / counts[box].sum()
+		red, green, blue = numpy.round(average).astype(numpy.int64)
+
+		palette.append((red << 16) + (green << 8) + blue)
+
+	return numpy.array(palette, dtype=numpy.int64)
+
+
+#Builds One Palette For Every Texture Given, It Is Exact When They Use Few Enough Colors
+#The Colors To Keep Are Always Given Exact Entries
+def build_palette(textures, size=PALETTE_SIZE, keep=()):
+	colors, counts = numpy.unique(numpy.concatenate([texture.ravel() for texture in textures]).astype(numpy.int64), return_counts=True)
+
+	kept = numpy.isin(colors, keep)
+	colors, counts = colors[~kept], counts[~kept]
+
+	if len(colors) > size - len(keep):
+		colors = median_cut(colors, counts, size - len(keep))
+
+	return numpy.concatenate((colors, numpy.array(keep, dtype=numpy.int64))).astype(numpy.int32)
+
+
+#Turns A Texture Into Indices Of The Closest Colors In The Palette
+#A Color That Isn't Kept Never Becomes A Kept One
+def quantize_texture(texture, palette, keep=()):
+	colors, inverse = numpy.unique(texture.astype(numpy.int64), return_inverse=True)
+
+	distance = ((split_channels(colors)[:, None, :] - split_channels(palette.astype(numpy.int64))[None, :, :]) ** 2).sum(axis=2)
+	distance[:, numpy.isin(palette, keep)] = numpy.inf
+
+	closest = numpy.argmin(distance, axis=1)
+
+	for color in keep:
+		closest[colors == color] = numpy.nonzero(palette == color)[0][0]
+
+	return closest[inverse].reshape(texture.shape).astype(numpy.uint8)
+
+
+#Stores Every Texture Of The Level & Sprites As 8-Bit Indices Into One Shared Palette, A Quarter Of The Memory
+#Gives Back The (Level, Sprite List, Palette), Textures Shared Between Walls Stay Shared
+#Sprites Already Know Which Texels Are See-Through From Their Runs, So No Colorkey Has To Survive
+def palettize_level(level, sprite_list, size=PALETTE_SIZE, keep=()):
+	textures = {}
+
+	for wall in level:
+		textures[id(wall[WALL_TEXTURE])] = wall[WALL_TEXTURE]
+		textures[id(wall[WALL_FLOOR_TEXTURE])] = wall[WALL_FLOOR_TEXTURE]
+
+	for sprite in sprite_list:
+		textures[id(sprite[SPRITE_TEXTURE])] = sprite[SPRITE_TEXTURE]
+
+	palette = build_palette(list(textures.values()), size, keep)
+	indexed = {key: quantize_texture(textures[key], palette, keep) for key in textures}
+
+	level = tuple(wall[:WALL_TEXTURE] + (indexed[id(wall[WALL_TEXTURE])], indexed[id(wall[WALL_FLOOR_TEXTURE])]) + wall[WALL_FLOOR_TEXTURE + 1:] for wall in level)
+	sprite_list = tuple(sprite[:SPRITE_TEXTURE] + (indexed[id(sprite[SPRITE_TEXTURE])],) + sprite[SPRITE_TEXTURE + 1:] for sprite in sprite_list)
+
+	return level, sprite_list, palette